@@ -3,23 +3,45 @@ Subpackage for AI Diplomacy agent implementations.
 
 This package includes base classes for agents, specific implementations like
 LLM-based agents and scripted agents, as well as factories for creating agents.
+
+Exports are resolved lazily (PEP 562): ``import ai_diplomacy.agents`` loads no
+agent module, and ``from ai_diplomacy.agents import LLMAgent`` imports only what
+that agent needs. Worker processes that run scripted agents therefore never pay
+for the prompt machinery.
 """
 
-from .base import BaseAgent
-from ..core.order import Order
-from ..core.message import Message
-from .llm_agent import LLMAgent
-from .scripted_agent import ScriptedAgent
-from .neutral_agent import NeutralAgent
-from .bloc_llm_agent import BlocLLMAgent
-
-# from .human_agent import HumanAgent # Removed due to missing file
-from .null_agent import NullAgent
-from .factory import AgentFactory
-from .agent_state import DiplomacyAgentState
-from .llm.prompt.strategy import (
-    JinjaPromptStrategy as LLMPromptStrategy,
-)  # Import and alias
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+if TYPE_CHECKING:
+    from ..domain.message import Message
+    from ..domain.order import Order
+    from .agent_state import DiplomacyAgentState
+    from .base import BaseAgent
+    from .bloc_llm_agent import BlocLLMAgent
+    from .factory import AgentFactory
+    from .llm.prompt.strategy import JinjaPromptStrategy as LLMPromptStrategy
+    from .llm_agent import LLMAgent
+    from .neutral_agent import NeutralAgent
+    from .null_agent import NullAgent
+    from .scripted_agent import ScriptedAgent
+
+# name -> (module relative to this package, attribute in that module)
+_LAZY_EXPORTS: Dict[str, Tuple[str, str]] = {
+    "BaseAgent": (".base", "BaseAgent"),
+    "Order": ("..domain.order", "Order"),
+    "Message": ("..domain.message", "Message"),
+    "LLMAgent": (".llm_agent", "LLMAgent"),
+    "ScriptedAgent": (".scripted_agent", "ScriptedAgent"),
+    "NeutralAgent": (".neutral_agent", "NeutralAgent"),
+    "BlocLLMAgent": (".bloc_llm_agent", "BlocLLMAgent"),
+    "NullAgent": (".null_agent", "NullAgent"),
+    "AgentFactory": (".factory", "AgentFactory"),
+    "DiplomacyAgentState": (".agent_state", "DiplomacyAgentState"),
+    "LLMPromptStrategy": (".llm.prompt.strategy", "JinjaPromptStrategy"),
+}
 
 __all__ = [
     "BaseAgent",
@@ -35,3 +57,17 @@ __all__ = [
     "DiplomacyAgentState",
     "LLMPromptStrategy",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
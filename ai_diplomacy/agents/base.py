@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, TYPE_CHECKING, Protocol, Optional
+from typing import Dict, List, TYPE_CHECKING, Protocol, Optional
 
 if TYPE_CHECKING:
     from ai_diplomacy.domain import DiploMessage, Order, PhaseState
@@ -36,6 +36,14 @@ class BaseAgent(ABC):
     async def update_state(self, phase: "PhaseState", events: list) -> None:
         pass
 
+    async def repair_orders(self, phase: "PhaseState", rejected: Dict[str, Optional[str]]) -> List["Order"]:
+        """
+        New orders for the units whose orders were rejected. ``rejected`` maps each
+        unit's location to its rejected order (None if it had none). Agents that
+        cannot repair return no orders, and those units hold.
+        """
+        return []
+
     def get_agent_info(self) -> dict:
         return {
             "agent_id": self.agent_id,
@@ -63,10 +63,11 @@ class BlocLLMAgent(BaseAgent):
 
     def get_all_bloc_orders_for_phase(
         self,
-        phase_key_tuple: tuple,  # This argument might need re-evaluation if phase state representation changes.
+        position_hash: int,
     ) -> Dict[str, List[Order]]:
         """
-        Returns all cached orders for the bloc for a given phase.
+        Returns all cached orders for the bloc for a given phase, keyed by
+        ``PhaseKey.position_hash``.
         This is a placeholder and would need to be properly implemented.
         """
         logger.warning("get_all_bloc_orders_for_phase is a placeholder and not fully implemented.")
@@ -55,7 +55,13 @@ class AgentFactory:
         )
 
         if config.type == "llm":
-            return self._create_llm_agent(agent_id, country)
+            return self._create_llm_agent(
+                agent_id,
+                country,
+                _model_id_of(config),
+                getattr(config, "temperature", None),
+                conversation_mode=bool(getattr(config, "conversation_mode", False)),
+            )
         if config.type == "scripted":
             return self._create_scripted_agent(agent_id, country, config)
         if config.type in ("neutral", "null"):
@@ -67,10 +73,24 @@ class AgentFactory:
 
         raise ValueError(f"Unsupported agent type: {config.type}")
 
-    def _create_llm_agent(self, agent_id: str, country: str) -> LLMAgent:
+    def _create_llm_agent(
+        self,
+        agent_id: str,
+        country: str,
+        model_id: Optional[str] = None,
+        temperature: Optional[float] = None,
+        *,
+        conversation_mode: bool = False,
+    ) -> LLMAgent:
         """Create an LLM-based agent."""
-        logger.debug(f"Creating LLMAgent for {country}")
-        return LLMAgent(agent_id=agent_id, country=country)
+        logger.debug(f"Creating LLMAgent for {country} using model '{model_id}'")
+        return LLMAgent(
+            agent_id=agent_id,
+            country=country,
+            model_id=model_id,
+            temperature=temperature,
+            conversation_mode=conversation_mode,
+        )
 
     def _create_scripted_agent(self, agent_id: str, country: str, config: AgentConfig) -> ScriptedAgent:
         """Create a scripted agent."""
@@ -96,3 +116,8 @@ class AgentFactory:
             bloc_name=bloc_name,
             controlled_powers=controlled_powers,
         )
+
+
+def _model_id_of(config: AgentConfig) -> Optional[str]:
+    """The configured model, accepting both ``model_id`` and the TOML files' ``model`` key."""
+    return getattr(config, "model_id", None) or getattr(config, "model", None)
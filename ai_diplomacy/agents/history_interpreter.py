@@ -2,14 +2,13 @@
 Functions to interpret and format game history for consumption by AI agents.
 """
 
-from __future__ in annotations
+from __future__ import annotations
 
 import logging
-from collections import defaultdict
 from typing import TYPE_CHECKING, Dict, List, Optional
 
 if TYPE_CHECKING:
-    from ai_diplomacy.domain.history import GameHistory, Message, Phase
+    from ai_diplomacy.domain.history import GameHistory, Phase
 
 logger = logging.getLogger(__name__)
 
@@ -17,11 +16,7 @@ logger = logging.getLogger(__name__)
 def get_messages_this_round(
     history: GameHistory, power_name: str, current_phase_name: str
 ) -> str:
-    current_phase: Optional[Phase] = None
-    for phase_obj in history.phases:
-        if phase_obj.name == current_phase_name:
-            current_phase = phase_obj
-            break
+    current_phase: Optional[Phase] = history.get_phase_by_name(current_phase_name)
 
     if not current_phase:
         return f"\n(No messages found for current phase: {current_phase_name})\n"
@@ -30,9 +25,8 @@ def get_messages_this_round(
 
     # Helper to get global messages from a phase
     global_msgs_content = ""
-    for msg in current_phase.messages:
-        if msg.recipient == "GLOBAL":
-            global_msgs_content += f" {msg.sender}: {msg.content}\n"
+    for msg in current_phase.global_messages():
+        global_msgs_content += f" {msg.sender}: {msg.content}\n"
 
     if global_msgs_content:
         messages_str += "**GLOBAL MESSAGES THIS ROUND:**\n"
@@ -41,12 +35,10 @@ def get_messages_this_round(
         messages_str += "**GLOBAL MESSAGES THIS ROUND:**\n (No global messages this round)\n"
 
     # Helper to get private messages from a phase
-    conversations = defaultdict(str)
-    for msg in current_phase.messages:
-        if msg.sender == power_name and msg.recipient != "GLOBAL":
-            conversations[msg.recipient] += f"  {power_name}: {msg.content}\n"
-        elif msg.recipient == power_name:
-            conversations[msg.sender] += f"  {msg.sender}: {msg.content}\n"
+    conversations = {
+        other_power: "".join(f"  {msg.sender}: {msg.content}\n" for msg in msgs)
+        for other_power, msgs in current_phase.conversations(power_name).items()
+    }
 
     if conversations:
         messages_str += "\n**PRIVATE MESSAGES TO/FROM YOU THIS ROUND:**\n"
@@ -70,31 +62,14 @@ def get_recent_messages_to_power(history: GameHistory, power_name: str, limit: i
     Gets the most recent messages sent TO this power, useful for tracking messages that need replies.
     Returns a list of dictionaries with 'sender', 'content', and 'phase' keys.
     """
-    if not history.phases:
-        return []
-
-    recent_phases = history.phases[-2:] if len(history.phases) >= 2 else history.phases[-1:]
-
-    messages_to_power = []
-    for phase in recent_phases:
-        for msg in phase.messages:
-            if msg.recipient == power_name or (msg.recipient == "GLOBAL" and msg.sender != power_name):
-                if msg.sender != power_name:
-                    messages_to_power.append(
-                        {
-                            "sender": msg.sender,
-                            "content": msg.content,
-                            "phase": phase.name,
-                        }
-                    )
-
+    messages_to_power = history.get_recent_messages_to(power_name, limit)
     logger.debug(
-        f"Found {len(messages_to_power)} messages to {power_name} across {len(recent_phases)} phases"
+        f"Found {len(messages_to_power)} messages to {power_name} across {history.inbox_phase_window} phases"
     )
     if not messages_to_power:
         logger.debug(f"No messages found for {power_name} to respond to")
 
-    return messages_to_power[-limit:] if messages_to_power else []
+    return messages_to_power
 
 
 def get_ignored_messages_by_power(
@@ -109,66 +84,13 @@ def get_ignored_messages_by_power(
     2. No response from that power was received in the same or next phase
     """
     ignored_by_power = {}
+    for recipient, pending in history.get_ignored_messages(sender_name, num_phases).items():
+        ignored_by_power[recipient] = [{"phase": msg.phase, "content": msg.content} for msg in pending]
+    return ignored_by_power
 
-    recent_phases = history.phases[-num_phases:] if history.phases else []
-    if not recent_phases:
-        return ignored_by_power
-
-    for i, phase in enumerate(recent_phases):
-        sender_messages = []
-        for msg in phase.messages:
-            if isinstance(msg, Message):
-                if msg.sender == sender_name and msg.recipient not in [
-                    "GLOBAL",
-                    "ALL",
-                ]:
-                    sender_messages.append(msg)
-            else:
-                if msg["sender"] == sender_name and msg["recipient"] not in [
-                    "GLOBAL",
-                    "ALL",
-                ]:
-                    sender_messages.append(msg)
-
-        for msg in sender_messages:
-            if isinstance(msg, Message):
-                recipient = msg.recipient
-                msg_content = msg.content
-            else:
-                recipient = msg["recipient"]
-                msg_content = msg["content"]
-
-            found_response = False
-
-            for check_phase in recent_phases[i : min(i + 2, len(recent_phases))]:
-                response_msgs = []
-                for m in check_phase.messages:
-                    if isinstance(m, Message):
-                        if m.sender == recipient and (
-                            m.recipient == sender_name
-                            or (m.recipient in ["GLOBAL", "ALL"] and sender_name in m.content)
-                        ):
-                            response_msgs.append(m)
-                    else:
-                        if m["sender"] == recipient and (
-                            m["recipient"] == sender_name
-                            or (
-                                m["recipient"] in ["GLOBAL", "ALL"]
-                                and sender_name in m.get("content", "")
-                            )
-                        ):
-                            response_msgs.append(m)
-
-                if response_msgs:
-                    found_response = True
-                    break
-
-            if not found_response:
-                if recipient not in ignored_by_power:
-                    ignored_by_power[recipient] = []
-                ignored_by_power[recipient].append({"phase": phase.name, "content": msg_content})
 
-    return ignored_by_power
+PREVIOUS_HISTORY_HEADER = "**PREVIOUS GAME HISTORY (Messages, Orders, & Plans from older rounds & phases)**\n"
+PHASE_SEPARATOR = "  " + "-" * 48 + "\n"
 
 
 def get_previous_phases_history(
@@ -191,80 +113,77 @@ def get_previous_phases_history(
     if not phases_to_report:
         return "\n(No previous game history available within the lookback window)\n"
 
-    game_history_str = ""
-
+    # Each phase's block is cached on the phase per power and re-rendered only
+    # when the phase changes; separators depend on position and stay outside.
+    parts: List[str] = []
     for phase_idx, phase in enumerate(phases_to_report):
-        phase_content_str = f"\nPHASE: {phase.name}\n"
-        current_phase_has_content = False
-
-        # Helper to get global messages
-        global_msgs = ""
-        for msg in phase.messages:
-            if msg.recipient == "GLOBAL":
-                global_msgs += f" {msg.sender}: {msg.content}\n"
-
-        if global_msgs:
-            phase_content_str += "\n  GLOBAL MESSAGES:\n"
-            phase_content_str += "".join([f"    {line}\n" for line in global_msgs.strip().split("\n")])
-            current_phase_has_content = True
-
-        # Helper to get private messages
-        private_msgs = defaultdict(str)
-        for msg in phase.messages:
-            if msg.sender == power_name and msg.recipient != "GLOBAL":
-                private_msgs[msg.recipient] += f"  {power_name}: {msg.content}\n"
-            elif msg.recipient == power_name:
-                private_msgs[msg.sender] += f"  {msg.sender}: {msg.content}\n"
-
-        if private_msgs:
-            phase_content_str += "\n  PRIVATE MESSAGES:\n"
-            for other_power, messages in private_msgs.items():
-                phase_content_str += f"    Conversation with {other_power}:\n"
-                phase_content_str += "".join([f"      {line}\n" for line in messages.strip().split("\n")])
-            current_phase_has_content = True
-
-        if phase.orders_by_power:
-            phase_content_str += "\n  ORDERS:\n"
-            for power, orders in phase.orders_by_power.items():
-                indicator = " (your power)" if power == power_name else ""
-                phase_content_str += f"    {power}{indicator}:\n"
-                results = phase.results_by_power.get(power, [])
-                for i, order in enumerate(orders):
-                    result_str = " (successful)"
-                    if i < len(results) and results[i] and not all(r == "" for r in results[i]):
-                        result_str = f" ({', '.join(results[i])})"
-                    phase_content_str += f"      {order}{result_str}\n"
-                phase_content_str += "\n"
-            current_phase_has_content = True
-
-        if current_phase_has_content:
-            if not game_history_str:
-                game_history_str = (
-                    "**PREVIOUS GAME HISTORY (Messages, Orders, & Plans from older rounds & phases)**\n"
-                )
-            game_history_str += phase_content_str
+        block = phase.cached_render(
+            ("previous_phases_history", power_name),
+            lambda p: _render_previous_phase(p, power_name),
+        )
+        if block:
+            if not parts:
+                parts.append(PREVIOUS_HISTORY_HEADER)
+            parts.append(block)
             if phase_idx < len(phases_to_report) - 1:
-                game_history_str += "  " + "-" * 48 + "\n"
+                parts.append(PHASE_SEPARATOR)
 
     if include_plans and phases_to_report:
         last_reported_previous_phase = phases_to_report[-1]
         if last_reported_previous_phase.plans:
-            if not game_history_str:
-                game_history_str = (
-                    "**PREVIOUS GAME HISTORY (Messages, Orders, & Plans from older rounds & phases)**\n"
-                )
-            game_history_str += f"\n  PLANS SUBMITTED FOR PHASE {last_reported_previous_phase.name}:\n"
+            if not parts:
+                parts.append(PREVIOUS_HISTORY_HEADER)
+            parts.append(f"\n  PLANS SUBMITTED FOR PHASE {last_reported_previous_phase.name}:\n")
             if power_name in last_reported_previous_phase.plans:
-                game_history_str += f"    Your Plan: {last_reported_previous_phase.plans[power_name]}\n"
+                parts.append(f"    Your Plan: {last_reported_previous_phase.plans[power_name]}\n")
             for p_other, plan_other in last_reported_previous_phase.plans.items():
                 if p_other != power_name:
-                    game_history_str += f"    {p_other}'s Plan: {plan_other}\n"
-            game_history_str += "\n"
+                    parts.append(f"    {p_other}'s Plan: {plan_other}\n")
+            parts.append("\n")
 
-    if not game_history_str.replace(
-        "**PREVIOUS GAME HISTORY (Messages, Orders, & Plans from older rounds & phases)**\n",
-        "",
-    ).strip():
+    game_history_str = "".join(parts)
+    if not game_history_str.replace(PREVIOUS_HISTORY_HEADER, "").strip():
         return "\n(No relevant previous game history to display)\n"
 
-    return game_history_str.strip() 
\ No newline at end of file
+    return game_history_str.strip()
+
+
+def _render_previous_phase(phase: Phase, power_name: str) -> str:
+    """One phase's section of the previous-history prompt block, or "" if it has nothing to show."""
+    parts = [f"\nPHASE: {phase.name}\n"]
+    current_phase_has_content = False
+
+    global_msgs = "".join(f" {msg.sender}: {msg.content}\n" for msg in phase.global_messages())
+
+    if global_msgs:
+        parts.append("\n  GLOBAL MESSAGES:\n")
+        parts.extend(f"    {line}\n" for line in global_msgs.strip().split("\n"))
+        current_phase_has_content = True
+
+    private_msgs = {
+        other_power: "".join(f"  {msg.sender}: {msg.content}\n" for msg in msgs)
+        for other_power, msgs in phase.conversations(power_name).items()
+    }
+
+    if private_msgs:
+        parts.append("\n  PRIVATE MESSAGES:\n")
+        for other_power, messages in private_msgs.items():
+            parts.append(f"    Conversation with {other_power}:\n")
+            parts.extend(f"      {line}\n" for line in messages.strip().split("\n"))
+        current_phase_has_content = True
+
+    if phase.orders_by_power:
+        parts.append("\n  ORDERS:\n")
+        for power, orders in phase.orders_by_power.items():
+            indicator = " (your power)" if power == power_name else ""
+            parts.append(f"    {power}{indicator}:\n")
+            results = phase.results_by_power.get(power, [])
+            for i, order in enumerate(orders):
+                result_str = " (successful)"
+                if i < len(results) and results[i] and not all(r == "" for r in results[i]):
+                    result_str = f" ({', '.join(results[i])})"
+                parts.append(f"      {order}{result_str}\n")
+            parts.append("\n")
+        current_phase_has_content = True
+
+    return "".join(parts) if current_phase_has_content else ""
@@ -0,0 +1,5 @@
+"""
+LLM plumbing shared by the LLM-backed agents: prompt construction
+(``prompt``), the pooled async backend client (``client``) and its HTTP
+transport (``transport``).
+"""
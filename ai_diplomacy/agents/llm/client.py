@@ -0,0 +1,631 @@
+"""
+Shared async client for the LLM backends agents talk to.
+
+One ``LLMClient`` serves every agent in a process (see ``get_llm_client``). It
+keeps a keep-alive ``ConnectionPool`` (an ``httpx.AsyncClient``) per backend
+origin and an ``asyncio.Semaphore`` per model, so a local Ollama model answers
+one request at a time while remote APIs fan out. Every call is bounded by a client-side
+timeout; a call that times out closes its connection rather than leaving the
+backend's answer to arrive on a pooled one.
+
+Model ids select the backend by prefix:
+
+* ``ollama/<model>`` or any other name, such as ``gemma3:12b`` -- Ollama's chat API at
+  ``$OLLAMA_HOST`` (default ``http://localhost:11434``), one request at a time.
+  Requests ask Ollama to keep the model loaded (``$OLLAMA_KEEP_ALIVE``, default
+  ``30m``) so its KV cache survives between calls. A request's ``json_schema``
+  is sent as Ollama's ``format``.
+* ``llamacpp/<model>`` -- a llama.cpp server's OpenAI-compatible API at
+  ``$LLAMACPP_BASE_URL`` (default ``http://localhost:8080/v1``), one at a time,
+  with ``cache_prompt`` on and every request pinned to slot
+  ``$LLAMACPP_SLOT`` (default 0) so consecutive prompts reuse its KV cache.
+  A request's ``grammar`` (GBNF) constrains decoding.
+* ``openai/<model>`` -- an OpenAI-compatible API at ``$OPENAI_BASE_URL``
+  (default ``https://api.openai.com/v1``) using ``$OPENAI_API_KEY``.
+
+``LLMClient.register_model`` overrides the endpoint for a model id. With a
+``ResponseCache`` attached (``$AI_DIPLOMACY_LLM_CACHE`` for the shared client),
+cacheable requests are answered from disk when the same request was seen before.
+
+``complete(request, stop=...)`` streams the reply and hands each text delta to
+``stop``; once it returns True the stream is closed, which makes the backend
+stop generating. A streamed call that times out reports the text received so
+far as ``LLMTimeoutError.partial_text``.
+
+``register_hedge`` gives a model a ``HedgePolicy`` (see ``agents.llm.hedging``):
+a call still unanswered after the policy's percentile of the model's observed
+latency (``ModelStats.latency``) is duplicated to the fallback model, the first
+usable reply wins and the other call is cancelled. A reply is usable when it is
+non-empty and passes the caller's ``accept`` check (e.g. "contains a JSON
+object"); only usable replies are written to the response cache. The shared client takes its
+policies from ``$AI_DIPLOMACY_LLM_HEDGE``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import dataclasses
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import ujson
+
+from .conversation import approx_tokens
+from .hedging import HedgePolicy, LatencyHistogram, hedges_from_env
+from .response_cache import ResponseCache
+from .transport import ConnectionPool, TransportError
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "LLMClient",
+    "LLMRequest",
+    "LLMResponse",
+    "ModelEndpoint",
+    "ModelStats",
+    "LLMClientError",
+    "LLMTimeoutError",
+    "LLMHTTPError",
+    "resolve_model",
+    "get_llm_client",
+    "set_llm_client",
+]
+
+BACKEND_OLLAMA = "ollama"
+BACKEND_OPENAI = "openai"
+
+# How an endpoint constrains replies to a request's json_schema or grammar.
+STRUCTURED_JSON_SCHEMA = "json_schema"
+STRUCTURED_GRAMMAR = "grammar"
+
+DEFAULT_TIMEOUT_SECONDS = 180.0
+LOCAL_MAX_CONCURRENCY = 1
+REMOTE_MAX_CONCURRENCY = 8
+
+
+class LLMClientError(Exception):
+    """A model call failed (transport error, HTTP error, or unusable payload)."""
+
+
+class LLMTimeoutError(LLMClientError):
+    """A model call did not finish within its timeout."""
+
+    def __init__(self, message: str, partial_text: str = ""):
+        super().__init__(message)
+        self.partial_text = partial_text  # streamed calls: the reply text received before the timeout
+
+
+class LLMHTTPError(LLMClientError):
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"HTTP {status}: {detail}")
+        self.status = status
+
+
+@dataclass(frozen=True)
+class ModelEndpoint:
+    """Where and how to reach one model."""
+
+    backend: str  # BACKEND_OLLAMA or BACKEND_OPENAI (any OpenAI-compatible server)
+    base_url: str
+    model: str  # the name the backend knows the model by
+    max_concurrency: Optional[int] = LOCAL_MAX_CONCURRENCY  # None: unlimited
+    api_key: Optional[str] = None
+    timeout: float = DEFAULT_TIMEOUT_SECONDS
+    # KV-cache affinity hints for local servers.
+    keep_alive: Optional[str] = None  # Ollama: how long to keep the model loaded
+    cache_prompt: bool = False  # llama.cpp: reuse the slot's cached prompt prefix
+    slot: Optional[int] = None  # llama.cpp: always use this slot
+    # STRUCTURED_JSON_SCHEMA, STRUCTURED_GRAMMAR, or None when the backend cannot constrain replies.
+    structured_output: Optional[str] = None
+
+
+@dataclass
+class LLMRequest:
+    model_id: str
+    messages: List[Dict[str, str]]
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    timeout: Optional[float] = None  # overrides the endpoint's timeout
+    options: Dict[str, Any] = field(default_factory=dict)  # extra backend-specific fields
+    # Constraints on the reply, used by endpoints with matching structured output.
+    json_schema: Optional[Dict[str, Any]] = None
+    grammar: Optional[str] = None  # GBNF
+
+    @classmethod
+    def from_prompt(
+        cls, model_id: str, prompt: str, *, system: Optional[str] = None, **kwargs
+    ) -> "LLMRequest":
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        return cls(model_id=model_id, messages=messages, **kwargs)
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    model_id: str
+    latency: float  # seconds spent on the HTTP exchange, excluding the queue
+    queued: float = 0.0  # seconds spent waiting for the model's semaphore
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cached_prompt_tokens: Optional[int] = None  # prompt tokens the backend served from its KV cache
+    cached: bool = False  # served from the response cache without calling the model
+    stopped_early: bool = False  # the stream was closed once ``stop`` returned True
+
+
+@dataclass
+class ModelStats:
+    requests: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    stopped_early: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    total_latency: float = 0.0
+    total_queued: float = 0.0
+    hedges: int = 0  # calls duplicated to the model's fallback
+    hedge_wins: int = 0  # of those, calls the fallback answered first
+    # Seconds from queueing to the reply, for successful calls; drives the hedge delay.
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+def resolve_model(model_id: str) -> ModelEndpoint:
+    """The default endpoint for ``model_id`` (see the module docstring)."""
+    prefix, sep, name = model_id.partition("/")
+    prefix = prefix.lower()
+    if not sep or prefix not in ("ollama", "llamacpp", "openai"):
+        prefix, name = "ollama", model_id  # Ollama names may contain "/" (e.g. hf.co/...)
+    if prefix == "ollama":
+        base_url = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+        if "://" not in base_url:
+            base_url = f"http://{base_url}"
+        return ModelEndpoint(
+            BACKEND_OLLAMA,
+            base_url,
+            name,
+            keep_alive=os.environ.get("OLLAMA_KEEP_ALIVE", "30m"),
+            structured_output=STRUCTURED_JSON_SCHEMA,
+        )
+    if prefix == "llamacpp":
+        base_url = os.environ.get("LLAMACPP_BASE_URL", "http://localhost:8080/v1")
+        slot = os.environ.get("LLAMACPP_SLOT", "0")
+        return ModelEndpoint(
+            BACKEND_OPENAI,
+            base_url,
+            name,
+            cache_prompt=True,
+            slot=int(slot) if slot else None,
+            structured_output=STRUCTURED_GRAMMAR,
+        )
+    return ModelEndpoint(
+        BACKEND_OPENAI,
+        os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+        name,
+        max_concurrency=REMOTE_MAX_CONCURRENCY,
+        api_key=os.environ.get("OPENAI_API_KEY"),
+    )
+
+
+class LLMClient:
+    """Pooled, concurrency-limited access to the configured LLM backends."""
+
+    def __init__(
+        self,
+        *,
+        max_idle_per_origin: int = 8,
+        idle_timeout: float = 60.0,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        self.max_idle_per_origin = max_idle_per_origin
+        self.idle_timeout = idle_timeout
+        self.response_cache = response_cache
+        self.stats: Dict[str, ModelStats] = {}
+        self._endpoints: Dict[str, ModelEndpoint] = {}
+        self._pools: Dict[Tuple[str, str, int], ConnectionPool] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._hedges: Dict[str, HedgePolicy] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register_model(self, model_id: str, endpoint: ModelEndpoint) -> None:
+        self._endpoints[model_id] = endpoint
+        self._semaphores.pop(model_id, None)
+
+    def register_hedge(self, model_id: str, policy: Optional[HedgePolicy]) -> None:
+        """Hedges ``model_id``'s slow calls to ``policy.fallback``; ``None`` removes the policy."""
+        if policy is None:
+            self._hedges.pop(model_id, None)
+        else:
+            self._hedges[model_id] = policy
+
+    def hedge_delay(self, model_id: str) -> Optional[float]:
+        """Seconds a call to ``model_id`` may take before it is hedged, or None if it is not."""
+        policy = self._hedges.get(model_id)
+        if policy is None:
+            return None
+        return policy.delay(self.stats.setdefault(model_id, ModelStats()).latency)
+
+    def endpoint_for(self, model_id: str) -> ModelEndpoint:
+        endpoint = self._endpoints.get(model_id)
+        if endpoint is None:
+            endpoint = self._endpoints[model_id] = resolve_model(model_id)
+        return endpoint
+
+    def pool_for(self, endpoint: ModelEndpoint) -> ConnectionPool:
+        """The connection pool for the endpoint's origin, shared by every model served there."""
+        parts = urlsplit(endpoint.base_url)
+        key = (parts.scheme, parts.hostname or "localhost", parts.port or 0)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = ConnectionPool(
+                endpoint.base_url, max_idle=self.max_idle_per_origin, idle_timeout=self.idle_timeout
+            )
+        return pool
+
+    async def generate(
+        self, model_id: str, prompt: str, *, system: Optional[str] = None, **kwargs
+    ) -> LLMResponse:
+        return await self.complete(LLMRequest.from_prompt(model_id, prompt, system=system, **kwargs))
+
+    async def complete(
+        self,
+        request: LLMRequest,
+        *,
+        stop: Optional[Callable[[str], bool]] = None,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> LLMResponse:
+        """
+        Sends ``request`` and returns the model's reply.
+
+        With ``stop`` the reply is streamed: every text delta is passed to it, and
+        the stream is closed as soon as it returns True. A hedged call hands the
+        duplicate stream its own copy of ``stop``. ``accept`` tells whether a
+        reply's text is valid; a hedged call treats a reply that fails it like an error.
+        """
+        if self.response_cache is not None:
+            # SQLite blocks, so cache reads and writes run off the event loop.
+            hit = await asyncio.to_thread(self.response_cache.get, request)
+            if hit is not None and _valid(hit.text, accept):
+                return LLMResponse(
+                    text=hit.text,
+                    model_id=request.model_id,
+                    latency=0.0,
+                    prompt_tokens=hit.prompt_tokens,
+                    completion_tokens=hit.completion_tokens,
+                    cached=True,
+                )
+        return await self._complete(request, stop, accept, (request.model_id,))
+
+    async def _complete(
+        self,
+        request: LLMRequest,
+        stop: Optional[Callable[[str], bool]],
+        accept: Optional[Callable[[str], bool]],
+        chain: Tuple[str, ...],
+    ) -> LLMResponse:
+        """One call, hedged per the model's policy; ``chain`` holds the models already tried."""
+        policy = self._hedges.get(request.model_id)
+        if policy is None or policy.fallback in chain:
+            return await self._attempt(request, stop, accept)
+
+        delay = self.hedge_delay(request.model_id)
+        fallback_stop = copy.deepcopy(stop)  # before the primary stream feeds ``stop``
+        primary = asyncio.create_task(self._attempt(request, stop, accept))
+        secondary: Optional[asyncio.Task] = None
+        try:
+            await asyncio.wait({primary}, timeout=delay)
+            if primary.done() and _usable(primary, accept):
+                return primary.result()
+
+            stats = self.stats[request.model_id]
+            stats.hedges += 1
+            logger.info(
+                f"{request.model_id} has not answered within {delay:.2f}s"
+                f"{' (failed)' if primary.done() else ''}; hedging to {policy.fallback}"
+            )
+            fallback = dataclasses.replace(request, model_id=policy.fallback)
+            secondary = asyncio.create_task(
+                self._complete(fallback, fallback_stop, accept, chain + (policy.fallback,))
+            )
+            pending = {secondary} if primary.done() else {primary, secondary}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (primary, secondary):
+                    if task in done and _usable(task, accept):
+                        stats.hedge_wins += task is secondary
+                        return task.result()
+            # Neither reply is usable: an invalid reply beats an error, and the primary's error wins.
+            for task in (primary, secondary):
+                if not task.cancelled() and task.exception() is None:
+                    return task.result()
+            for task in (primary, secondary):
+                if not task.cancelled():
+                    raise task.exception()
+            raise LLMClientError(f"{request.model_id} and its fallback {policy.fallback} were both cancelled")
+        finally:
+            losers = [t for t in (primary, secondary) if t is not None and not t.done()]
+            for task in losers:
+                task.cancel()  # closes its connection, so the backend stops generating
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    async def _attempt(
+        self,
+        request: LLMRequest,
+        stop: Optional[Callable[[str], bool]],
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> LLMResponse:
+        """One call to ``request.model_id``'s endpoint, bounded by its timeout."""
+        endpoint = self.endpoint_for(request.model_id)
+        stats = self.stats.setdefault(request.model_id, ModelStats())
+        timeout = request.timeout if request.timeout is not None else endpoint.timeout
+
+        queued_at = time.perf_counter()
+        async with self._semaphore(request.model_id, endpoint):
+            started = time.perf_counter()
+            stats.requests += 1
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+            received: List[str] = []
+            stopped = False
+            try:
+                async with asyncio.timeout(timeout):
+                    if stop is None:
+                        text, usage = await self._call(endpoint, request)
+                    else:
+                        text, usage, stopped = await self._stream(endpoint, request, stop, received)
+            except TimeoutError:
+                stats.timeouts += 1
+                raise LLMTimeoutError(
+                    f"{request.model_id} did not answer within {timeout:.1f}s", partial_text="".join(received)
+                ) from None
+            except LLMClientError:
+                stats.failures += 1
+                raise
+            except (OSError, TransportError, ValueError) as e:
+                stats.failures += 1
+                raise LLMClientError(f"{request.model_id}: {e.__class__.__name__}: {e}") from e
+            finally:
+                stats.in_flight -= 1
+
+        finished = time.perf_counter()
+        stats.stopped_early += stopped
+        stats.total_latency += finished - started
+        stats.total_queued += started - queued_at
+        stats.latency.record(finished - queued_at)
+        # Written after the semaphore is released; an unusable reply is never stored, so it cannot
+        # be replayed ahead of the hedge and fallback (see ``_usable``).
+        if self.response_cache is not None and _valid(text, accept):
+            await asyncio.to_thread(
+                self.response_cache.put, request, text, usage.prompt_tokens, usage.completion_tokens
+            )
+        return LLMResponse(
+            text=text,
+            model_id=request.model_id,
+            latency=finished - started,
+            queued=started - queued_at,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cached_prompt_tokens=usage.cached_prompt_tokens,
+            stopped_early=stopped,
+        )
+
+    def close(self) -> None:
+        """Closes the pooled connections; called from a running loop, the close is only scheduled."""
+        for pool in self._pools.values():
+            pool.close()
+        self._pools.clear()
+
+    async def aclose(self) -> None:
+        """Closes the pooled connections and waits until they are shut."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.aclose()
+
+    def _semaphore(self, model_id: str, endpoint: ModelEndpoint):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._semaphores.clear()  # semaphores bind to the loop that first waits on them
+            self._loop = loop
+        if endpoint.max_concurrency is None:
+            return _NO_LIMIT
+        semaphore = self._semaphores.get(model_id)
+        if semaphore is None:
+            semaphore = self._semaphores[model_id] = asyncio.Semaphore(endpoint.max_concurrency)
+        return semaphore
+
+    async def _call(self, endpoint: ModelEndpoint, request: LLMRequest) -> Tuple[str, "_Usage"]:
+        path, payload, headers = _BACKENDS[endpoint.backend].build(endpoint, request)
+        response = await self.pool_for(endpoint).request(
+            "POST", path, ujson.dumps(payload, ensure_ascii=False).encode("utf-8"), headers
+        )
+        if response.status_code != 200:
+            raise LLMHTTPError(response.status_code, response.text[:500])
+        return _BACKENDS[endpoint.backend].parse(ujson.loads(response.content))
+
+    async def _stream(
+        self, endpoint: ModelEndpoint, request: LLMRequest, stop: Callable[[str], bool], received: List[str]
+    ) -> Tuple[str, "_Usage", bool]:
+        """Streams the reply into ``received``; returns (text, usage, whether ``stop`` ended it)."""
+        backend = _BACKENDS[endpoint.backend]
+        path, payload, headers = backend.build(endpoint, request, stream=True)
+        usage = _Usage()
+        body = ujson.dumps(payload, ensure_ascii=False).encode("utf-8")
+        async with self.pool_for(endpoint).stream("POST", path, body, headers) as response:
+            if response.status_code != 200:
+                detail = (await response.aread()).decode("utf-8", errors="replace")
+                raise LLMHTTPError(response.status_code, detail[:500])
+            async for line in response.aiter_lines():
+                delta, event_usage = backend.parse_event(line)
+                if event_usage is not None:
+                    usage = event_usage
+                if delta:
+                    received.append(delta)
+                    if stop(delta):
+                        # Leaving the block unread closes the connection, so the backend stops generating.
+                        # It never sends its usage then, so the completion is estimated from the text.
+                        text = "".join(received)
+                        return text, _Usage(completion_tokens=approx_tokens(text)), True
+        return "".join(received), usage, False
+
+
+@dataclass(frozen=True)
+class _Usage:
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cached_prompt_tokens: Optional[int] = None
+
+
+def _valid(text: str, accept: Optional[Callable[[str], bool]]) -> bool:
+    """Whether a reply's text is non-empty and passes the caller's ``accept`` check."""
+    return bool(text.strip()) and (accept is None or accept(text))
+
+
+def _usable(task: asyncio.Task, accept: Optional[Callable[[str], bool]] = None) -> bool:
+    """Whether a finished call produced a reply worth returning."""
+    return not task.cancelled() and task.exception() is None and _valid(task.result().text, accept)
+
+
+class _NoLimit:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+_NO_LIMIT = _NoLimit()
+
+
+class _OllamaBackend:
+    @staticmethod
+    def build(endpoint: ModelEndpoint, request: LLMRequest, stream: bool = False):
+        options: Dict[str, Any] = {}
+        if request.temperature is not None:
+            options["temperature"] = request.temperature
+        if request.max_tokens is not None:
+            options["num_predict"] = request.max_tokens
+        payload: Dict[str, Any] = {"model": endpoint.model, "messages": request.messages, "stream": stream}
+        if options:
+            payload["options"] = options
+        if endpoint.keep_alive is not None:
+            payload["keep_alive"] = endpoint.keep_alive
+        if endpoint.structured_output == STRUCTURED_JSON_SCHEMA and request.json_schema is not None:
+            payload["format"] = request.json_schema
+        payload.update(request.options)
+        return _join_path(endpoint.base_url, "/api/chat"), payload, _json_headers(endpoint)
+
+    @staticmethod
+    def parse(data: Dict[str, Any]) -> Tuple[str, _Usage]:
+        try:
+            text = data["message"]["content"]
+        except (KeyError, TypeError):
+            raise LLMClientError(f"Unexpected Ollama response: {str(data)[:200]}") from None
+        # Ollama counts only the prompt tokens it had to evaluate, i.e. those not in its KV cache.
+        return text, _Usage(data.get("prompt_eval_count"), data.get("eval_count"))
+
+    @staticmethod
+    def parse_event(line: str) -> Tuple[str, Optional[_Usage]]:
+        """One NDJSON line of a streamed reply: (text delta, usage from the final line)."""
+        if not line.strip():
+            return "", None
+        data = ujson.loads(line)
+        if "error" in data:
+            raise LLMClientError(f"Ollama stream error: {str(data['error'])[:200]}")
+        delta = (data.get("message") or {}).get("content") or ""
+        if data.get("done"):
+            return delta, _Usage(data.get("prompt_eval_count"), data.get("eval_count"))
+        return delta, None
+
+
+class _OpenAIBackend:
+    @staticmethod
+    def build(endpoint: ModelEndpoint, request: LLMRequest, stream: bool = False):
+        payload: Dict[str, Any] = {"model": endpoint.model, "messages": request.messages, "stream": stream}
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
+        if request.temperature is not None:
+            payload["temperature"] = request.temperature
+        if request.max_tokens is not None:
+            payload["max_tokens"] = request.max_tokens
+        if endpoint.cache_prompt:
+            payload["cache_prompt"] = True
+        if endpoint.slot is not None:
+            payload["id_slot"] = endpoint.slot
+        # llama.cpp's extensions; OpenAI's strict response_format cannot express tuple enums.
+        if endpoint.structured_output == STRUCTURED_GRAMMAR and request.grammar is not None:
+            payload["grammar"] = request.grammar
+        elif endpoint.structured_output == STRUCTURED_JSON_SCHEMA and request.json_schema is not None:
+            payload["json_schema"] = request.json_schema
+        payload.update(request.options)
+        return _join_path(endpoint.base_url, "/chat/completions"), payload, _json_headers(endpoint)
+
+    @staticmethod
+    def parse(data: Dict[str, Any]) -> Tuple[str, _Usage]:
+        try:
+            text = data["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError):
+            raise LLMClientError(f"Unexpected chat completion response: {str(data)[:200]}") from None
+        return text, _usage_from_openai(data.get("usage"))
+
+    @staticmethod
+    def parse_event(line: str) -> Tuple[str, Optional[_Usage]]:
+        """One server-sent-events line of a streamed reply: (text delta, usage from the final event)."""
+        if not line.startswith("data:"):
+            return "", None
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return "", None
+        event = ujson.loads(data)
+        if "error" in event:
+            raise LLMClientError(f"Chat completion stream error: {str(event['error'])[:200]}")
+        choices = event.get("choices") or []
+        delta = ((choices[0].get("delta") or {}).get("content") or "") if choices else ""
+        return delta, _usage_from_openai(event["usage"]) if event.get("usage") else None
+
+
+_BACKENDS = {BACKEND_OLLAMA: _OllamaBackend, BACKEND_OPENAI: _OpenAIBackend}
+
+
+def _usage_from_openai(usage: Optional[Dict[str, Any]]) -> _Usage:
+    usage = usage or {}
+    details = usage.get("prompt_tokens_details") or {}
+    return _Usage(usage.get("prompt_tokens"), usage.get("completion_tokens"), details.get("cached_tokens"))
+
+
+def _join_path(base_url: str, path: str) -> str:
+    prefix = base_url.split("://", 1)[-1].partition("/")[2].rstrip("/")
+    return f"/{prefix}{path}" if prefix else path
+
+
+def _json_headers(endpoint: ModelEndpoint) -> Dict[str, str]:
+    headers = {"Content-Type": "application/json", "Accept": "application/json"}
+    if endpoint.api_key:
+        headers["Authorization"] = f"Bearer {endpoint.api_key}"
+    return headers
+
+
+_SHARED_CLIENT: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    """The process-wide client shared by all agents."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        _SHARED_CLIENT = LLMClient(response_cache=ResponseCache.from_env())
+        for model_id, policy in hedges_from_env().items():
+            _SHARED_CLIENT.register_hedge(model_id, policy)
+    return _SHARED_CLIENT
+
+
+def set_llm_client(client: Optional[LLMClient]) -> None:
+    """Replaces the shared client (``None`` resets it); the previous one is closed."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is not None and _SHARED_CLIENT is not client:
+        _SHARED_CLIENT.close()
+    _SHARED_CLIENT = client
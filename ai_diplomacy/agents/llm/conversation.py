@@ -0,0 +1,180 @@
+"""
+Stateful chat sessions that send the model only what changed each phase.
+
+In the default (stateless) mode every prompt re-sends the instructions, the
+board and the power's situation, so over a long game prompt tokens grow with
+every phase the prompts carry. A ``Conversation`` instead keeps one running
+chat per power: the first turn carries the full board, and every later turn
+appends only the board changes since the previous turn, the messages received
+and the adjudication results, followed by the request for this phase.
+
+When the conversation grows past its token budget, the agent runs a compaction
+turn: the model summarizes the older turns, which are then replaced by the
+summary while the most recent turns are kept verbatim.
+
+``TokenLedger`` records per-phase token usage for both modes so the two can be
+compared.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from ai_diplomacy.domain.board import BoardState
+
+__all__ = [
+    "Conversation",
+    "TokenLedger",
+    "LedgerEntry",
+    "approx_tokens",
+    "describe_board_changes",
+    "describe_inbound_messages",
+    "describe_results",
+]
+
+SUMMARY_HEADER = "Summary of the game so far (earlier turns were compacted):"
+SUMMARY_ACK = "Understood."
+COMPACTION_REQUEST = (
+    "Summarize the conversation so far for your own future reference: the key board developments, "
+    "agreements, promises and betrayals, and your current plans. Use at most {words} words and plain text."
+)
+
+
+def approx_tokens(text: str) -> int:
+    """A backend-independent token estimate (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def describe_board_changes(previous: "BoardState", current: "BoardState") -> str:
+    """The unit and supply-center changes between two boards, one per line."""
+    lost, gained = previous.diff_units(current)
+    lines: List[str] = []
+    for power in sorted({p for p, _ in lost} | {p for p, _ in gained}):
+        removed = [u for p, u in lost if p == power]
+        added = [u for p, u in gained if p == power]
+        parts = []
+        if removed:
+            parts.append(f"no longer {', '.join(removed)}")
+        if added:
+            parts.append(f"now {', '.join(added)}")
+        lines.append(f"- {power}: {'; '.join(parts)}")
+    for center, old, new in previous.center_changes(current):
+        lines.append(f"- {center}: {old or 'neutral'} -> {new or 'neutral'}")
+    return "\n".join(lines) if lines else "No units moved and no supply centers changed hands."
+
+
+def describe_inbound_messages(messages: Iterable[Any]) -> str:
+    lines = []
+    for message in messages:
+        if isinstance(message, dict):
+            sender, content = message.get("sender"), message.get("content", "")
+            recipient = message.get("recipient")
+        else:
+            sender, content = getattr(message, "sender", None), getattr(message, "content", "")
+            recipient = getattr(message, "recipient", None)
+        scope = " (to all)" if recipient in ("GLOBAL", "ALL") else ""
+        lines.append(f"- {sender or 'Unknown'}{scope}: {content}")
+    return "\n".join(lines)
+
+
+def describe_results(events: Iterable[Any]) -> str:
+    lines = []
+    for event in events:
+        if isinstance(event, (list, tuple)):
+            lines.append("- " + ": ".join(str(part) for part in event if part not in (None, "")))
+        else:
+            lines.append(f"- {event}")
+    return "\n".join(lines)
+
+
+class Conversation:
+    """
+    One power's running chat with its model.
+
+    Args:
+        system: The system message (stable for the whole game).
+        token_budget: Estimated tokens above which ``needs_compaction`` is true.
+        keep_recent_turns: User/assistant exchanges kept verbatim by ``compact``.
+    """
+
+    def __init__(self, system: str, *, token_budget: int = 6000, keep_recent_turns: int = 2):
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+        self.messages: List[Dict[str, str]] = [{"role": "system", "content": system}]
+        self.last_board: Optional["BoardState"] = None
+        self.compactions = 0
+
+    @property
+    def tokens(self) -> int:
+        return sum(approx_tokens(m["content"]) for m in self.messages)
+
+    def needs_compaction(self) -> bool:
+        return self.tokens > self.token_budget and len(self._turns()) > self.keep_recent_turns
+
+    def with_user_turn(self, content: str) -> List[Dict[str, str]]:
+        """The messages to send for a new user turn (the conversation itself is not changed)."""
+        return self.messages + [{"role": "user", "content": content}]
+
+    def record_exchange(self, user: str, assistant: str) -> None:
+        self.messages.append({"role": "user", "content": user})
+        self.messages.append({"role": "assistant", "content": assistant})
+
+    def compaction_messages(self, words: int = 250) -> List[Dict[str, str]]:
+        return self.with_user_turn(COMPACTION_REQUEST.format(words=words))
+
+    def compact(self, summary: str) -> None:
+        """
+        Replaces all but the most recent exchanges with ``summary``. The next turn
+        carries the full board again, so the model need not reconstruct it.
+        """
+        turns = self._turns()
+        recent = turns[len(turns) - self.keep_recent_turns :] if self.keep_recent_turns else []
+        self.messages = [
+            self.messages[0],
+            {"role": "user", "content": f"{SUMMARY_HEADER}\n{summary.strip()}"},
+            {"role": "assistant", "content": SUMMARY_ACK},
+        ]
+        for user, assistant in recent:
+            self.messages.extend((user, assistant))
+        self.last_board = None
+        self.compactions += 1
+
+    def _turns(self) -> List[tuple]:
+        body = self.messages[1:]
+        return [(body[i], body[i + 1]) for i in range(0, len(body) - 1, 2)]
+
+
+@dataclass
+class LedgerEntry:
+    phase: str
+    purpose: str  # "orders", "messages", "repair" or "compaction"
+    mode: str  # "stateless" or "conversation"
+    sent_tokens: int  # estimated tokens of everything sent
+    new_tokens: int  # estimated tokens not sent before in this conversation
+    prompt_tokens: Optional[int] = None  # as reported by the backend
+    completion_tokens: Optional[int] = None
+
+
+@dataclass
+class TokenLedger:
+    entries: List[LedgerEntry] = field(default_factory=list)
+
+    def record(self, entry: LedgerEntry) -> None:
+        self.entries.append(entry)
+
+    def by_phase(self) -> Dict[str, Dict[str, int]]:
+        """phase -> {"sent": ..., "new": ..., "prompt": ..., "completion": ...} totals."""
+        totals: Dict[str, Dict[str, int]] = {}
+        for entry in self.entries:
+            row = totals.setdefault(entry.phase, {"sent": 0, "new": 0, "prompt": 0, "completion": 0})
+            row["sent"] += entry.sent_tokens
+            row["new"] += entry.new_tokens
+            row["prompt"] += entry.prompt_tokens or 0
+            row["completion"] += entry.completion_tokens or 0
+        return totals
+
+    @property
+    def total_sent(self) -> int:
+        return sum(entry.sent_tokens for entry in self.entries)
@@ -0,0 +1,125 @@
+"""
+Latency histograms and hedge policies for ``LLMClient``.
+
+Every model's successful calls are recorded in a ``LatencyHistogram`` (in
+``ModelStats.latency``). A model with a ``HedgePolicy`` gets a duplicate
+request sent to its ``fallback`` model once a call has been waiting longer
+than the policy's percentile of that histogram; the first usable reply wins
+and the other request is cancelled. Fallback models may have policies of
+their own, so policies chain into a cascade.
+
+The histogram ages its counts, so the threshold follows the model's recent
+latency rather than its whole history.
+
+``hedges_from_env()`` reads ``$AI_DIPLOMACY_LLM_HEDGE``, comma-separated
+``model=fallback`` pairs (e.g. ``openai/gpt-4o=openai/gpt-4o-mini``), and
+``$AI_DIPLOMACY_LLM_HEDGE_PERCENTILE`` (default 95).
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["HedgePolicy", "LatencyHistogram", "hedges_from_env"]
+
+HEDGE_ENV = "AI_DIPLOMACY_LLM_HEDGE"
+HEDGE_PERCENTILE_ENV = "AI_DIPLOMACY_LLM_HEDGE_PERCENTILE"
+
+
+class LatencyHistogram:
+    """
+    Call latencies in log-spaced buckets from ``low`` to ``high`` seconds.
+
+    Quantiles are exact to one bucket (``2 ** (1 / buckets_per_doubling)``, about
+    19% by default). Every ``half_life`` samples all counts are halved, so old
+    samples fade out.
+    """
+
+    def __init__(
+        self,
+        low: float = 0.01,
+        high: float = 600.0,
+        buckets_per_doubling: int = 4,
+        half_life: int = 200,
+    ):
+        steps = math.ceil(math.log2(high / low) * buckets_per_doubling)
+        # Upper bounds; the last bucket also takes everything above ``high``.
+        self.bounds: List[float] = [low * 2 ** (i / buckets_per_doubling) for i in range(steps + 1)]
+        self.counts: List[float] = [0.0] * len(self.bounds)
+        self.half_life = half_life
+        self.samples = 0  # recorded over the histogram's lifetime
+
+    @property
+    def count(self) -> float:
+        """The weight of the samples still counted (aged samples count fractionally)."""
+        return sum(self.counts)
+
+    def record(self, seconds: float) -> None:
+        index = min(bisect.bisect_left(self.bounds, seconds), len(self.bounds) - 1)
+        self.counts[index] += 1
+        self.samples += 1
+        if self.half_life and self.samples % self.half_life == 0:
+            self.counts = [c / 2 for c in self.counts]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The upper bound of the bucket holding the ``q`` quantile (0 < q <= 1), or None if empty."""
+        total = self.count
+        if total <= 0:
+            return None
+        target, seen = q * total, 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.bounds[-1]
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    When to send a duplicate of a slow call to another model.
+
+    Attributes:
+        fallback: The model id the duplicate goes to (register it with its own
+            endpoint to hedge to a different server).
+        percentile: The hedge fires once a call has waited this percentile of the
+            model's observed latency.
+        min_samples: Until this many calls have been observed, ``initial_delay``
+            is used instead.
+        initial_delay: Seconds before hedging while the histogram is too sparse.
+        min_delay: Never hedge sooner than this, so fast models are not doubled.
+    """
+
+    fallback: str
+    percentile: float = 0.95
+    min_samples: int = 20
+    initial_delay: float = 30.0
+    min_delay: float = 0.5
+
+    def delay(self, histogram: LatencyHistogram) -> float:
+        """Seconds to wait for the primary before hedging."""
+        threshold = histogram.quantile(self.percentile) if histogram.count >= self.min_samples else None
+        return max(self.min_delay, self.initial_delay if threshold is None else threshold)
+
+
+def hedges_from_env() -> Dict[str, HedgePolicy]:
+    """model id -> HedgePolicy, as configured by environment variables."""
+    spec = os.environ.get(HEDGE_ENV, "").strip()
+    if not spec:
+        return {}
+    percentile = float(os.environ.get(HEDGE_PERCENTILE_ENV, "95")) / 100
+    policies: Dict[str, HedgePolicy] = {}
+    for pair in spec.split(","):
+        model_id, sep, fallback = pair.partition("=")
+        if not sep or not model_id.strip() or not fallback.strip():
+            logger.warning(f"Ignoring malformed {HEDGE_ENV} entry: {pair!r}")
+            continue
+        policies[model_id.strip()] = HedgePolicy(fallback.strip(), percentile=percentile)
+    return policies
@@ -0,0 +1,137 @@
+"""
+Incremental scanning of a JSON object as a model streams it.
+
+Agents ask for a single JSON object (``{"orders": [...]}`` or
+``{"messages": [...]}``), yet local models often keep writing prose after it.
+``JSONObjectScanner`` is fed the streamed text chunk by chunk and reports the
+moment the top-level object closes, so the client can stop the stream there
+(see ``LLMClient.complete(stop=...)``).
+
+When a stream ends before the object closes (a timeout or the token limit),
+``partial()`` still returns the object cut back to its last complete value,
+e.g. ``{"orders": ["A PAR - BUR", "F BRE - M`` becomes
+``{"orders": ["A PAR - BUR"]}``. Only whole list items and top-level fields
+count as complete values, so a half-written message object is dropped rather
+than returned without its content.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import ujson
+
+__all__ = ["JSONObjectScanner", "partial_json_object"]
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONObjectScanner:
+    """
+    Tracks string, escape and nesting state across chunks of a JSON object.
+
+    Text before the first ``{`` is skipped, so a reply may open with prose or
+    a Markdown fence.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[str] = []
+        self._length = 0
+        self._start = -1
+        self.end = -1  # index just past the closing brace, once seen
+        self._stack: List[str] = []
+        self._expect_key: List[bool] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._cut: Optional[Tuple[int, str]] = None  # (end of the last complete value, closers)
+
+    @property
+    def complete(self) -> bool:
+        return self.end >= 0
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> bool:
+        """Consumes the next chunk; True once the top-level object has closed."""
+        if self.end >= 0:
+            return True
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        stack, expect_key = self._stack, self._expect_key
+        for i, ch in enumerate(chunk, offset):
+            if self._start < 0:
+                if ch == "{":
+                    self._start = i
+                    stack.append(ch)
+                    expect_key.append(True)
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if not self._string_is_key:
+                        self._value_done(i + 1)
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_is_key = stack[-1] == "{" and expect_key[-1]
+            elif ch in "{[":
+                stack.append(ch)
+                expect_key.append(ch == "{")
+            elif ch in "}]":
+                stack.pop()
+                expect_key.pop()
+                if not stack:
+                    self.end = i + 1
+                    return True
+                self._value_done(i + 1)
+            elif ch == ":":
+                expect_key[-1] = False
+            elif ch == "," and stack[-1] == "{":
+                expect_key[-1] = True
+        return False
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """The complete object, parsed, or None while it is still open (or if it is invalid)."""
+        if self.end < 0:
+            return None
+        return _loads_object(self.text[self._start : self.end])
+
+    def partial(self) -> Optional[Dict[str, Any]]:
+        """The complete object, or else the object truncated after its last complete value."""
+        if self.end >= 0:
+            return self.result()
+        if self._cut is None:
+            return None
+        end, closers = self._cut
+        return _loads_object(self.text[self._start : end] + closers)
+
+    def _value_done(self, end: int) -> None:
+        if len(self._stack) > 1 and self._stack[-1] != "[":
+            return  # a field of a nested object that is itself still incomplete
+        self._cut = (end, "".join(_CLOSERS[opener] for opener in reversed(self._stack)))
+
+
+def partial_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """The first JSON object in ``text``, truncated to its last complete value if it never closes."""
+    scanner = JSONObjectScanner()
+    scanner.feed(text)
+    return scanner.partial()
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        value = ujson.loads(text)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
@@ -0,0 +1,170 @@
+"""
+Structured-output constraints built from the legal orders of one power in one phase.
+
+``order_constraint(phase, power)`` turns the phase's ``PossibleOrdersIndex``
+into an ``OrderConstraint`` that describes the only replies the agent accepts,
+``{"orders": [...]}`` with legal orders, in three forms:
+
+* ``json_schema`` -- for backends with JSON-schema structured output (Ollama's
+  ``format``, llama.cpp's ``json_schema``). In movement and retreat phases the
+  list is a tuple with one enum per orderable unit, in the order the prompt
+  lists them, so every unit gets exactly one legal order.
+* ``gbnf`` -- the same constraint as a llama.cpp GBNF grammar.
+* ``validator`` -- a pydantic v2 model, compiled once per constraint, that
+  checks replies from backends that cannot constrain decoding.
+
+Adjustment phases let a power build fewer units than it could, so there the
+list may hold any subset of the legal orders, one per location.
+"""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError, create_model, field_validator
+
+if TYPE_CHECKING:
+    from ai_diplomacy.domain import PhaseState
+
+__all__ = ["OrderConstraint", "ValidatedOrders", "order_constraint"]
+
+
+@dataclass(frozen=True)
+class ValidatedOrders:
+    orders: List[str]  # legal orders, at most one per location
+    rejected: List[Any] = field(default_factory=list)  # entries of the reply that were dropped
+
+
+@dataclass(frozen=True)
+class OrderConstraint:
+    """
+    The legal replies for ``power`` in one phase.
+
+    Attributes:
+        locations: (location, legal orders) for every location the power may
+            order, in prompt order.
+        optional: True in adjustment phases, where not every location needs an order.
+    """
+
+    power: str
+    locations: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    optional: bool = False
+
+    @functools.cached_property
+    def location_of(self) -> Dict[str, str]:
+        """order -> the location it commands."""
+        return {order: location for location, orders in self.locations for order in orders}
+
+    @functools.cached_property
+    def json_schema(self) -> Dict[str, Any]:
+        if self.optional:
+            orders: Dict[str, Any] = {
+                "type": "array",
+                "items": {"type": "string", "enum": list(self.location_of)},
+                "maxItems": len(self.locations),
+            }
+        else:
+            orders = {
+                "type": "array",
+                "prefixItems": [{"type": "string", "enum": list(legal)} for _, legal in self.locations],
+                "items": False,
+                "minItems": len(self.locations),
+                "maxItems": len(self.locations),
+            }
+        return {
+            "type": "object",
+            "properties": {"orders": orders},
+            "required": ["orders"],
+            "additionalProperties": False,
+        }
+
+    @functools.cached_property
+    def gbnf(self) -> str:
+        rules = []
+        if self.optional:
+            body = '(order (ws "," ws order)*)?'
+            rules.append("order ::= " + " | ".join(_gbnf_string(o) for o in self.location_of))
+        else:
+            names = [f"unit{i}" for i in range(len(self.locations))]
+            body = ' ws "," ws '.join(names)
+            for name, (_, legal) in zip(names, self.locations):
+                rules.append(f"{name} ::= " + " | ".join(_gbnf_string(o) for o in legal))
+        root = f'root ::= "{{" ws "\\"orders\\"" ws ":" ws "[" ws {body} ws "]" ws "}}"'
+        return "\n".join([root, *rules, 'ws ::= | " " | "\\n" [ \\t]{0,20}']) + "\n"
+
+    @functools.cached_property
+    def validator(self) -> Type[BaseModel]:
+        """A pydantic model accepting ``{"orders": [...]}`` with legal orders, one per location."""
+        legal = tuple(self.location_of)
+        location_of = self.location_of
+        order_type = Literal[legal] if legal else Literal[""]
+
+        def one_order_per_location(cls, orders: List[str]) -> List[str]:
+            seen = set()
+            for order in orders:
+                if location_of[order] in seen:
+                    raise ValueError(f"more than one order for {location_of[order]}")
+                seen.add(location_of[order])
+            return orders
+
+        return create_model(
+            f"{self.power.title()}Orders",
+            orders=(List[order_type], ...),
+            __validators__={"one_order_per_location": field_validator("orders")(one_order_per_location)},
+        )
+
+    def validate(self, payload: Optional[Dict[str, Any]]) -> ValidatedOrders:
+        """
+        The legal orders in a parsed reply. Illegal entries and second orders for
+        an already ordered location are dropped and reported as ``rejected``.
+        """
+        raw = payload.get("orders") if isinstance(payload, dict) else None
+        if not isinstance(raw, list):
+            return ValidatedOrders([], [] if raw is None else [raw])
+        entries = [entry.strip() if isinstance(entry, str) else entry for entry in raw]
+        try:
+            return ValidatedOrders(list(self.validator.model_validate({"orders": entries}).orders))
+        except ValidationError:
+            pass
+        kept, rejected, seen = [], [], set()
+        for entry in entries:
+            location = self.location_of.get(entry) if isinstance(entry, str) else None
+            if location is None or location in seen:
+                rejected.append(entry)
+            else:
+                seen.add(location)
+                kept.append(entry)
+        return ValidatedOrders(list(self.validator.model_validate({"orders": kept}).orders), rejected)
+
+
+def order_constraint(
+    phase: "PhaseState", power: str, locations: Optional[Iterable[str]] = None
+) -> Optional[OrderConstraint]:
+    """
+    The constraint for ``power``'s orders this phase, or None without a legal-order
+    index. ``locations`` restricts it to some of the power's units (in that order),
+    e.g. the ones whose orders are being repaired.
+    """
+    index = phase.possible_orders
+    if index is None:
+        return None
+    if locations is None:
+        locations = index.orderable_locations.get(power, ())
+    legal = tuple((location, index.orders_for_location(location)) for location in locations)
+    return _constraint(power, tuple(loc for loc in legal if loc[1]), phase.key.name.endswith("A"))
+
+
+@functools.lru_cache(maxsize=64)
+def _constraint(
+    power: str, locations: Tuple[Tuple[str, Tuple[str, ...]], ...], optional: bool
+) -> OrderConstraint:
+    # Shared per position, so every agent and retry in a phase reuses the compiled validator.
+    return OrderConstraint(power, locations, optional)
+
+
+def _gbnf_string(text: str) -> str:
+    """A GBNF literal matching ``text`` as a JSON string."""
+    escaped = text.replace("\\", "\\\\\\\\").replace('"', '\\\\\\"')
+    return f'"\\"{escaped}\\""'
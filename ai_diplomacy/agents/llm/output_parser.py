@@ -0,0 +1,197 @@
+"""
+The one parsing stage for JSON objects in model replies.
+
+Replies are parsed by increasingly forgiving (and increasingly slow) tiers, and
+the first tier that yields a JSON object wins:
+
+1. ``strict`` -- the whole reply is JSON (``ujson``, microseconds).
+2. ``embedded`` -- the object inside a Markdown fence or surrounding prose;
+   when there are several, the last one (models reason first, answer last).
+3. ``json5`` -- JSON5 syntax: comments, single quotes, unquoted keys,
+   trailing commas.
+4. ``partial`` -- a truncated reply (token limit, stopped stream) cut back
+   to its last complete value, so no half-written order gets through.
+5. ``repair`` -- ``json_repair`` for whatever is left (missing commas,
+   unbalanced quotes, Python literals).
+
+``OutputParser.stats`` records how often each tier was tried and succeeded and
+how long it took, so the cost of malformed replies is visible. Agents share
+``OUTPUT_PARSER`` through ``parse_json_object``.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import ujson
+
+from .incremental_json import JSONObjectScanner
+
+__all__ = [
+    "OutputParser",
+    "ParseResult",
+    "ParserStats",
+    "TierStats",
+    "TIERS",
+    "OUTPUT_PARSER",
+    "parse_json_object",
+]
+
+TIER_STRICT = "strict"
+TIER_EMBEDDED = "embedded"
+TIER_JSON5 = "json5"
+TIER_PARTIAL = "partial"
+TIER_REPAIR = "repair"
+TIERS = (TIER_STRICT, TIER_EMBEDDED, TIER_JSON5, TIER_PARTIAL, TIER_REPAIR)
+
+_FENCE_RE = re.compile(r"```[ \t]*(?:json5?|javascript|js)?[ \t]*\r?\n?(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+@dataclass
+class TierStats:
+    attempts: int = 0
+    successes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mean_microseconds(self) -> float:
+        return self.seconds / self.attempts * 1e6 if self.attempts else 0.0
+
+
+@dataclass
+class ParserStats:
+    tiers: Dict[str, TierStats] = field(default_factory=lambda: {tier: TierStats() for tier in TIERS})
+    failures: int = 0
+
+    @property
+    def parsed(self) -> int:
+        return sum(tier.successes for tier in self.tiers.values())
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    value: Optional[Dict[str, Any]]
+    tier: Optional[str]  # the tier that succeeded; None if none did
+    seconds: float
+
+
+class OutputParser:
+    """Tiered JSON-object parser for model replies (see the module docstring)."""
+
+    def __init__(self) -> None:
+        self.stats = ParserStats()
+        self._tiers: List[Tuple[str, Callable[[str, List[str]], Optional[Dict[str, Any]]]]] = [
+            (TIER_STRICT, _strict),
+            (TIER_EMBEDDED, _embedded),
+            (TIER_JSON5, _json5),
+            (TIER_PARTIAL, _partial),
+            (TIER_REPAIR, _repair),
+        ]
+
+    def parse(self, text: str) -> ParseResult:
+        started = time.perf_counter()
+        candidates: List[str] = []  # filled by the embedded tier, reused by the later ones
+        for name, tier in self._tiers:
+            tier_started = time.perf_counter()
+            try:
+                value = tier(text, candidates)
+            except Exception:  # the lenient parsers raise a variety of errors on bad input
+                value = None
+            stats = self.stats.tiers[name]
+            stats.attempts += 1
+            stats.seconds += time.perf_counter() - tier_started
+            if value is not None:
+                stats.successes += 1
+                return ParseResult(value, name, time.perf_counter() - started)
+        self.stats.failures += 1
+        return ParseResult(None, None, time.perf_counter() - started)
+
+    def reset_stats(self) -> None:
+        self.stats = ParserStats()
+
+
+def _as_object(value: Any) -> Optional[Dict[str, Any]]:
+    return value if isinstance(value, dict) else None
+
+
+def _strict(text: str, candidates: List[str]) -> Optional[Dict[str, Any]]:
+    stripped = text.strip()
+    if not stripped.startswith("{"):
+        return None
+    try:
+        return _as_object(ujson.loads(stripped))
+    except ValueError:
+        return None
+
+
+def _embedded(text: str, candidates: List[str]) -> Optional[Dict[str, Any]]:
+    candidates.extend(reversed([block.strip() for block in _FENCE_RE.findall(text) if "{" in block]))
+    candidates.extend(reversed(_balanced_objects(text)))
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start and text[start : end + 1] not in candidates:
+        candidates.append(text[start : end + 1])
+    for candidate in candidates:
+        brace = candidate.find("{")
+        if brace == -1:
+            continue
+        try:
+            value = _as_object(ujson.loads(candidate[brace : candidate.rfind("}") + 1]))
+        except ValueError:
+            continue
+        if value is not None:
+            return value
+    return None
+
+
+def _balanced_objects(text: str) -> List[str]:
+    """Every top-level ``{...}`` span in ``text`` whose braces balance, in order."""
+    spans = []
+    start = text.find("{")
+    while start != -1:
+        scanner = JSONObjectScanner()
+        if scanner.feed(text[start:]):
+            spans.append(text[start : start + scanner.end])
+            start = text.find("{", start + scanner.end)
+        else:
+            break  # a truncated object: the objects inside it are not answers
+    return spans
+
+
+def _json5(text: str, candidates: List[str]) -> Optional[Dict[str, Any]]:
+    import json5
+
+    for candidate in candidates:
+        try:
+            value = _as_object(json5.loads(candidate))
+        except ValueError:
+            continue
+        if value is not None:
+            return value
+    return None
+
+
+def _partial(text: str, candidates: List[str]) -> Optional[Dict[str, Any]]:
+    scanner = JSONObjectScanner()
+    if scanner.feed(text):
+        return None  # the object closed, so it is malformed rather than truncated
+    return scanner.partial() or None
+
+
+def _repair(text: str, candidates: List[str]) -> Optional[Dict[str, Any]]:
+    import json_repair
+
+    start = text.find("{")
+    if start == -1:
+        return None
+    return _as_object(json_repair.loads(candidates[0] if candidates else text[start:])) or None
+
+
+OUTPUT_PARSER = OutputParser()
+
+
+def parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """The JSON object in a model reply, parsed by the shared ``OUTPUT_PARSER``, or None."""
+    return OUTPUT_PARSER.parse(text).value
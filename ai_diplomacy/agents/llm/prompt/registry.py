@@ -0,0 +1,121 @@
+"""
+Lazy registry of the prompt package's Jinja2 templates.
+
+Nothing happens at import time: the ``jinja2.Environment`` is created on the
+first template lookup and each template is compiled the first time it is asked
+for. Compiled templates are persisted with Jinja's ``FileSystemBytecodeCache``,
+so later processes (including parallel-run workers) load bytecode instead of
+recompiling.
+
+The cache directory is ``$AI_DIPLOMACY_TEMPLATE_CACHE`` if set, otherwise
+``$XDG_CACHE_HOME/ai_diplomacy/jinja`` (``~/.cache/ai_diplomacy/jinja``). Set the
+variable to ``off`` to disable the bytecode cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import jinja2
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["TemplateRegistry", "TEMPLATE_REGISTRY", "default_bytecode_cache_dir"]
+
+TEMPLATE_CACHE_ENV = "AI_DIPLOMACY_TEMPLATE_CACHE"
+
+
+def default_bytecode_cache_dir() -> Optional[Path]:
+    """Where compiled templates are stored, or None when the cache is disabled."""
+    configured = os.environ.get(TEMPLATE_CACHE_ENV)
+    if configured is not None:
+        if configured.strip().lower() in ("", "0", "off", "false", "none"):
+            return None
+        return Path(configured).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "ai_diplomacy" / "jinja"
+
+
+class TemplateRegistry:
+    """Creates the Jinja environment and compiles templates on first use."""
+
+    def __init__(
+        self,
+        package: str = "ai_diplomacy.agents.llm.prompt",
+        directory: str = "templates",
+        bytecode_cache_dir: Optional[Path] = None,
+        use_bytecode_cache: bool = True,
+    ):
+        self.package = package
+        self.directory = directory
+        self._bytecode_cache_dir = bytecode_cache_dir
+        self._use_bytecode_cache = use_bytecode_cache
+        self._environment: Optional["jinja2.Environment"] = None
+        self._templates: Dict[str, "jinja2.Template"] = {}
+        self._digests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def environment(self) -> "jinja2.Environment":
+        if self._environment is None:
+            with self._lock:
+                if self._environment is None:
+                    self._environment = self._create_environment()
+        return self._environment
+
+    def get(self, name: str) -> "jinja2.Template":
+        """Returns the compiled template ``name``, compiling (or loading bytecode) on first use."""
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.environment.get_template(name)
+        return template
+
+    def render(self, name: str, **context) -> str:
+        return self.get(name).render(**context)
+
+    def source_digest(self, name: str) -> str:
+        """A short digest of the template's source, for keys that must change when the prompt does."""
+        digest = self._digests.get(name)
+        if digest is None:
+            source, _, _ = self.environment.loader.get_source(self.environment, name)
+            digest = self._digests[name] = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        return digest
+
+    @property
+    def loaded(self) -> tuple:
+        """Names of the templates compiled or loaded so far."""
+        return tuple(self._templates)
+
+    def clear(self) -> None:
+        """Forgets the environment and compiled templates (the on-disk cache is kept)."""
+        with self._lock:
+            self._environment = None
+            self._templates = {}
+            self._digests = {}
+
+    def _create_environment(self) -> "jinja2.Environment":
+        import jinja2
+
+        bytecode_cache = None
+        cache_dir = self._bytecode_cache_dir or (default_bytecode_cache_dir() if self._use_bytecode_cache else None)
+        if self._use_bytecode_cache and cache_dir is not None:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = jinja2.FileSystemBytecodeCache(str(cache_dir))
+            except OSError as e:
+                logger.warning(f"Template bytecode cache disabled; cannot use {cache_dir}: {e}")
+
+        return jinja2.Environment(
+            loader=jinja2.PackageLoader(self.package, self.directory),
+            autoescape=False,
+            bytecode_cache=bytecode_cache,
+        )
+
+
+TEMPLATE_REGISTRY = TemplateRegistry()
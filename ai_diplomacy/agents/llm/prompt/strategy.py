@@ -1,24 +1,84 @@
 """
 Defines the strategy for transforming game state into LLM prompts.
+
+Prompts are laid out from the most to the least stable text (see
+``LayeredPrompt``): the instructions and output format, which never change,
+then the board summary, which is the same for every power in a phase, and only
+then the power's own situation. Local backends (Ollama, llama.cpp) reuse the KV
+cache for the longest prefix a prompt shares with the previous one, so this
+order lets them skip re-processing everything before the power-specific part.
 """
 from __future__ import annotations
 
 import dataclasses
-from typing import Protocol
-
-import jinja2
+import functools
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Protocol, Sequence
 
 from ai_diplomacy.domain.phase import PhaseState
 
-__all__ = ["PromptStrategy"]
+from .registry import TEMPLATE_REGISTRY
+
+__all__ = [
+    "PromptStrategy",
+    "JinjaPromptStrategy",
+    "LayeredPrompt",
+    "board_summary",
+    "conversation_instructions",
+    "conversation_turn",
+    "order_repair_turn",
+]
+
+
+ORDER_TEMPLATE_NAME = "order_prompt.j2"
+ORDER_INSTRUCTIONS_TEMPLATE_NAME = "order_instructions.j2"
+NEGOTIATION_TEMPLATE_NAME = "negotiation_prompt.j2"
+NEGOTIATION_INSTRUCTIONS_TEMPLATE_NAME = "negotiation_instructions.j2"
+CONVERSATION_INSTRUCTIONS_TEMPLATE_NAME = "conversation_instructions.j2"
+CONVERSATION_TURN_TEMPLATE_NAME = "conversation_turn.j2"
+ORDER_REPAIR_TEMPLATE_NAME = "order_repair.j2"
+BOARD_CONTEXT_HEADER = "Game Context and Relevant Information:"
+BOARD_SUMMARY_TEMPLATE_NAME = "board_summary.j2"
+# Templates are compiled on first use by TEMPLATE_REGISTRY; TEMPLATES and
+# ORDER_TEMPLATE remain available as lazily resolved module attributes.
+_LAZY_ATTRIBUTES = {
+    "TEMPLATES": lambda: TEMPLATE_REGISTRY.environment,
+    "ORDER_TEMPLATE": lambda: TEMPLATE_REGISTRY.get(ORDER_TEMPLATE_NAME),
+    "BOARD_SUMMARY_TEMPLATE": lambda: TEMPLATE_REGISTRY.get(BOARD_SUMMARY_TEMPLATE_NAME),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Rendered board summaries by position hash. The summary is the same for every
+# power in a phase, so it is rendered once and shared by all of their prompts.
+_BOARD_SUMMARY_CACHE: "OrderedDict[int, str]" = OrderedDict()
+BOARD_SUMMARY_CACHE_SIZE = 32
+
+
+@dataclasses.dataclass(frozen=True)
+class LayeredPrompt:
+    """A prompt split by how often its parts change, most stable first."""
+
+    instructions: str  # identical for every power and phase
+    board: str  # identical for every power within a phase
+    power: str  # specific to one power
 
+    @property
+    def text(self) -> str:
+        """The whole prompt as one string."""
+        return "\n\n".join(part for part in (self.instructions, self.board, self.power) if part)
 
-TEMPLATES = jinja2.Environment(
-    loader=jinja2.PackageLoader("ai_diplomacy.agents.llm.prompt", "templates"),
-    autoescape=False,
-)
-ORDER_TEMPLATE = TEMPLATES.get_template("order_prompt.j2")
-# TODO: Load other templates as they are integrated.
+    def as_messages(self) -> List[Dict[str, str]]:
+        """Chat messages: the instructions as the system message, then board and power text."""
+        return [
+            {"role": "system", "content": self.instructions},
+            {"role": "user", "content": f"{self.board}\n\n{self.power}" if self.board else self.power},
+        ]
 
 
 class PromptStrategy(Protocol):
@@ -49,6 +109,49 @@ class PromptStrategy(Protocol):
         """
         ...
 
+    def for_negotiation(
+        self,
+        phase: PhaseState,
+        power: str,
+        active_powers: List[str],
+        *,
+        goal_summary: str | None = None,
+    ) -> str:
+        """
+        Generates the prompt for drafting diplomatic messages.
+
+        Args:
+            phase: The current phase state of the game.
+            power: The name of the power the agent is playing.
+            active_powers: The other powers still in the game.
+            goal_summary: A summary of the agent's current goals.
+
+        Returns:
+            The fully-rendered prompt text.
+        """
+        ...
+
+    def order_prompt(
+        self,
+        phase: PhaseState,
+        power: str,
+        *,
+        goal_summary: str | None = None,
+    ) -> LayeredPrompt:
+        """Like ``for_orders``, split into stable, phase-wide and power-specific parts."""
+        ...
+
+    def negotiation_prompt(
+        self,
+        phase: PhaseState,
+        power: str,
+        active_powers: List[str],
+        *,
+        goal_summary: str | None = None,
+    ) -> LayeredPrompt:
+        """Like ``for_negotiation``, split into stable, phase-wide and power-specific parts."""
+        ...
+
 
 @dataclasses.dataclass(frozen=True)
 class JinjaPromptStrategy:
@@ -64,14 +167,162 @@ class JinjaPromptStrategy:
         """
         Generates the prompt for deciding orders using a Jinja2 template.
         """
-        # This is a simplified context for demonstration.
-        # A real implementation would extract more details from the PhaseState.
+        return self.order_prompt(phase, power, goal_summary=goal_summary).text
+
+    def order_prompt(
+        self,
+        phase: PhaseState,
+        power: str,
+        *,
+        goal_summary: str | None = None,
+    ) -> LayeredPrompt:
+        """The order prompt split into its stable, phase-wide and power-specific parts."""
+        context = {
+            "country": power,
+            "goals": goal_summary.split("\n") if goal_summary else [],
+            "relationships": {},  # To be implemented
+            "formatted_diary": "",  # To be implemented
+            "possible_orders": _possible_orders_for(phase, power),
+        }
+        return LayeredPrompt(
+            instructions=_instructions(ORDER_INSTRUCTIONS_TEMPLATE_NAME, tools_available=False),
+            board=_board_context(phase),
+            power=TEMPLATE_REGISTRY.get(ORDER_TEMPLATE_NAME).render(context).strip(),
+        )
+
+    def for_negotiation(
+        self,
+        phase: PhaseState,
+        power: str,
+        active_powers: List[str],
+        *,
+        goal_summary: str | None = None,
+    ) -> str:
+        """
+        Generates the prompt for drafting diplomatic messages using a Jinja2 template.
+        """
+        return self.negotiation_prompt(phase, power, active_powers, goal_summary=goal_summary).text
+
+    def negotiation_prompt(
+        self,
+        phase: PhaseState,
+        power: str,
+        active_powers: List[str],
+        *,
+        goal_summary: str | None = None,
+    ) -> LayeredPrompt:
+        """The negotiation prompt split into its stable, phase-wide and power-specific parts."""
         context = {
             "country": power,
+            "active_powers": active_powers,
             "goals": goal_summary.split("\n") if goal_summary else [],
             "relationships": {},  # To be implemented
             "formatted_diary": "",  # To be implemented
-            "context_text": f"It is {phase.key.season} {phase.key.year}, phase {phase.key.name}.",
-            "tools_available": False,
         }
-        return ORDER_TEMPLATE.render(context)
+        return LayeredPrompt(
+            instructions=_instructions(NEGOTIATION_INSTRUCTIONS_TEMPLATE_NAME, tools_available=False),
+            board=_board_context(phase),
+            power=TEMPLATE_REGISTRY.get(NEGOTIATION_TEMPLATE_NAME).render(context).strip(),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _instructions(template_name: str, tools_available: bool) -> str:
+    """Instruction blocks take no game state, so each variant is rendered once."""
+    return TEMPLATE_REGISTRY.get(template_name).render(tools_available=tools_available).strip()
+
+
+def conversation_instructions(power: str) -> str:
+    """The system message of a conversation-mode session (see ``agents.llm.conversation``)."""
+    return TEMPLATE_REGISTRY.get(CONVERSATION_INSTRUCTIONS_TEMPLATE_NAME).render(country=power).strip()
+
+
+def conversation_turn(
+    phase: PhaseState,
+    power: str,
+    purpose: str,
+    *,
+    board_changes: Optional[str] = None,
+    inbound: str = "",
+    results: str = "",
+    active_powers: Sequence[str] = (),
+) -> str:
+    """
+    One user turn of a conversation-mode session.
+
+    Carries the full board summary when ``board_changes`` is None (the first
+    turn, or the first after a compaction) and only the changes otherwise,
+    followed by the request: orders (``purpose="orders"``) or messages.
+    """
+    return TEMPLATE_REGISTRY.get(CONVERSATION_TURN_TEMPLATE_NAME).render(
+        country=power,
+        purpose=purpose,
+        full_board=board_changes is None,
+        board=board_summary(phase) if board_changes is None else board_changes,
+        season=phase.key.season,
+        year=phase.key.year,
+        phase_name=phase.key.name,
+        results=results,
+        inbound=inbound,
+        possible_orders=_possible_orders_for(phase, power) if purpose == "orders" else {},
+        active_powers=list(active_powers),
+    ).strip()
+
+
+def order_repair_turn(phase: PhaseState, power: str, rejected: Mapping[str, Optional[str]]) -> str:
+    """
+    A short follow-up asking for new orders for the units whose orders were
+    rejected only: ``rejected`` maps each unit's location to the rejected order
+    (None when the reply had no order for it) and every unit is listed with its
+    legal orders, sorted so the turn does not depend on the engine's set order.
+    """
+    index = getattr(phase, "possible_orders", None)
+    units = [
+        (location, {"rejected": order, "legal": sorted(index.orders_for_location(location)) if index else []})
+        for location, order in rejected.items()
+    ]
+    return (
+        TEMPLATE_REGISTRY.get(ORDER_REPAIR_TEMPLATE_NAME)
+        .render(country=power, phase_name=phase.key.name, units=units)
+        .strip()
+    )
+
+
+def _board_context(phase: PhaseState) -> str:
+    return f"{BOARD_CONTEXT_HEADER}\n{board_summary(phase)}"
+
+
+def board_summary(phase: PhaseState) -> str:
+    """
+    The phase-wide part of every power's prompt (date, unit positions, center
+    counts), rendered once per position and cached by ``PhaseKey.position_hash``.
+    """
+    key = phase.key.position_hash
+    if key and key in _BOARD_SUMMARY_CACHE:
+        _BOARD_SUMMARY_CACHE.move_to_end(key)
+        return _BOARD_SUMMARY_CACHE[key]
+
+    text = TEMPLATE_REGISTRY.get(BOARD_SUMMARY_TEMPLATE_NAME).render(
+        season=phase.key.season,
+        year=phase.key.year,
+        phase_name=phase.key.name,
+        units=phase.board.units,
+        center_counts=phase.board.center_counts(),
+    ).rstrip("\n")
+
+    if key:
+        _BOARD_SUMMARY_CACHE[key] = text
+        while len(_BOARD_SUMMARY_CACHE) > BOARD_SUMMARY_CACHE_SIZE:
+            _BOARD_SUMMARY_CACHE.popitem(last=False)
+    return text
+
+
+def _possible_orders_for(phase: PhaseState, power: str) -> Dict[str, List[str]]:
+    """location -> legal orders for the locations ``power`` may order this phase."""
+    index = getattr(phase, "possible_orders", None)
+    if index is None:
+        return {}
+    return {
+        location: list(index.orders_for_location(location))
+        for location in index.orderable_locations.get(power, ())
+    }
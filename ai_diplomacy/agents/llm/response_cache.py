@@ -0,0 +1,290 @@
+"""
+Content-addressed on-disk cache of LLM responses.
+
+Tournaments and regression runs send the same prompts again and again (every
+game with the same config opens with identical S1901M prompts; a retried game
+replays its early phases). ``ResponseCache`` stores replies in SQLite under the
+SHA-256 of the model id, the chat messages and the sampling parameters, so a
+repeated request is answered without calling the model.
+
+Modes:
+
+* ``off`` -- never read or write.
+* ``read-write`` -- serve hits and store new replies.
+* ``read-only`` -- serve hits but never write (e.g. replaying against a frozen cache).
+
+Only deterministic requests (``temperature == 0``) are cached unless
+``deterministic_only=False``, in which case sampled replies are replayed too.
+Entries expire after ``ttl`` seconds; when the cache exceeds ``max_entries`` or
+``max_bytes`` the least recently used entries are evicted.
+
+``ResponseCache.from_env()`` reads ``$AI_DIPLOMACY_LLM_CACHE`` (the mode, default
+``off``), ``$AI_DIPLOMACY_LLM_CACHE_PATH`` and
+``$AI_DIPLOMACY_LLM_CACHE_SAMPLED`` (``1`` to also cache sampled requests).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+import ujson
+
+if TYPE_CHECKING:
+    from .client import LLMRequest
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ResponseCache", "CachedResponse", "ResponseCacheStats", "request_cache_key"]
+
+MODE_OFF = "off"
+MODE_READ_WRITE = "read-write"
+MODE_READ_ONLY = "read-only"
+CACHE_MODES = (MODE_OFF, MODE_READ_WRITE, MODE_READ_ONLY)
+
+CACHE_MODE_ENV = "AI_DIPLOMACY_LLM_CACHE"
+CACHE_PATH_ENV = "AI_DIPLOMACY_LLM_CACHE_PATH"
+CACHE_SAMPLED_ENV = "AI_DIPLOMACY_LLM_CACHE_SAMPLED"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    text: str
+    prompt_tokens: Optional[int]
+    completion_tokens: Optional[int]
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    expired: int = 0
+    bypassed: int = 0  # requests not eligible for caching (sampled, or mode off)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def request_cache_key(request: "LLMRequest") -> str:
+    """SHA-256 over everything that determines the reply: model, messages, sampling and constraints."""
+    material = {
+        "model": request.model_id,
+        "messages": request.messages,
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+        "options": request.options,
+        "json_schema": request.json_schema,
+        "grammar": request.grammar,
+    }
+    return hashlib.sha256(
+        ujson.dumps(material, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def default_cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "ai_diplomacy" / "llm_responses.sqlite3"
+
+
+class ResponseCache:
+    """SQLite-backed LRU/TTL cache of model replies. Safe to share between threads."""
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        mode: str = MODE_READ_WRITE,
+        *,
+        max_entries: int = 100_000,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl: Optional[float] = 30 * 24 * 3600,
+        deterministic_only: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown response cache mode {mode!r}; expected one of {CACHE_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.deterministic_only = deterministic_only
+        self.stats = ResponseCacheStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._entries = 0
+        self._bytes = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """The cache configured by environment variables, or None when it is off."""
+        mode = os.environ.get(CACHE_MODE_ENV, MODE_OFF).strip().lower() or MODE_OFF
+        if mode == MODE_OFF:
+            return None
+        path = os.environ.get(CACHE_PATH_ENV) or default_cache_path()
+        sampled = os.environ.get(CACHE_SAMPLED_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+        return cls(path, mode, deterministic_only=not sampled)
+
+    def cacheable(self, request: "LLMRequest") -> bool:
+        if self.mode == MODE_OFF:
+            return False
+        return not self.deterministic_only or request.temperature == 0
+
+    def get(self, request: "LLMRequest") -> Optional[CachedResponse]:
+        """The stored reply for ``request``, or None (also counts the hit or miss)."""
+        if not self.cacheable(request):
+            self.stats.bypassed += 1
+            return None
+        key = request_cache_key(request)
+        now = self._clock()
+        try:
+            row = self._lookup(key, now)
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache lookup failed ({self.path}): {e}")
+            row = None
+        if row is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return CachedResponse(row[0], row[1], row[2])
+
+    def _lookup(self, key: str, now: float):
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT text, prompt_tokens, completion_tokens, size, created FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[4] > self.ttl:
+                if self.mode == MODE_READ_WRITE:
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    db.commit()
+                    self._entries -= 1
+                    self._bytes -= row[3]
+                self.stats.expired += 1
+                return None
+            if row is not None and self.mode == MODE_READ_WRITE:
+                db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                db.commit()
+            return row
+
+    def put(
+        self,
+        request: "LLMRequest",
+        text: str,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+    ) -> None:
+        if self.mode != MODE_READ_WRITE or not self.cacheable(request):
+            return
+        try:
+            self._store(request_cache_key(request), request.model_id, text, prompt_tokens, completion_tokens)
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed ({self.path}): {e}")
+            return
+        self.stats.writes += 1
+
+    def _store(
+        self,
+        key: str,
+        model_id: str,
+        text: str,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+    ) -> None:
+        size = len(text.encode("utf-8"))
+        now = self._clock()
+        with self._lock:
+            db = self._connect()
+            previous = db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model_id, text, prompt_tokens, completion_tokens, size, now, now),
+            )
+            if previous is None:
+                self._entries += 1
+            else:
+                self._bytes -= previous[0]
+            self._bytes += size
+            self._evict(db)
+            db.commit()
+
+    def purge_expired(self) -> int:
+        """Deletes every expired entry; returns how many were removed."""
+        if self.ttl is None or self.mode != MODE_READ_WRITE:
+            return 0
+        with self._lock:
+            db = self._connect()
+            removed = db.execute(
+                "DELETE FROM responses WHERE created < ?", (self._clock() - self.ttl,)
+            ).rowcount
+            db.commit()
+            self._recount(db)
+        self.stats.expired += removed
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._connect()
+            return self._entries
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            if self.mode == MODE_READ_ONLY:
+                uri = f"{self.path.resolve().as_uri()}?mode=ro"
+                self._db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.executescript(_SCHEMA)
+            self._recount(self._db)
+        return self._db
+
+    def _recount(self, db: sqlite3.Connection) -> None:
+        entries, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._entries, self._bytes = entries, total
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        while self._entries > self.max_entries or (self._bytes > self.max_bytes and self._entries > 1):
+            excess = max(self._entries - self.max_entries, 1)
+            rows = db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed ASC, rowid ASC LIMIT ?", (excess,)
+            ).fetchall()
+            if not rows:
+                break
+            db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key, _ in rows])
+            self._entries -= len(rows)
+            self._bytes -= sum(size for _, size in rows)
+            self.stats.evictions += len(rows)
@@ -0,0 +1,243 @@
+"""
+Local stand-in for the LLM backends the client talks to.
+
+``StubLLMServer`` answers Ollama's ``/api/chat`` and the OpenAI-compatible
+``/v1/chat/completions`` endpoint over real HTTP/1.1 keep-alive connections, so
+tests and benchmarks exercise the same transport as a game does. Replies come
+from a fixed string or a callable, after an optional fixed latency; streamed
+replies are sent one token at a time with an optional per-token delay.
+
+Like a local server, the stub keeps the previous prompt per model slot and only
+"evaluates" the tokens after the prefix it shares with the new prompt; the
+token counts it reports (and ``prompt_tokens_evaluated``) reflect that.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import ujson
+
+__all__ = ["StubLLMServer", "StubRequest", "stub_tokens"]
+
+_TOKEN_RE = re.compile(r"\s*\S+|\s+$")
+
+Reply = Union[str, Callable[[Dict[str, Any]], str]]
+
+
+@dataclass
+class StubRequest:
+    path: str
+    body: Dict[str, Any]
+    connection: int  # serial number of the TCP connection that carried it
+
+
+def stub_tokens(text: str) -> List[str]:
+    """Splits ``text`` into whitespace-led pseudo tokens; ``"".join`` restores it."""
+    return _TOKEN_RE.findall(text)
+
+
+class StubLLMServer:
+    """
+    Usage::
+
+        async with StubLLMServer(reply='{"orders": []}', latency=0.05) as server:
+            client.register_model("stub", ModelEndpoint("ollama", server.base_url, "stub"))
+    """
+
+    def __init__(
+        self,
+        reply: Reply = '{"orders": []}',
+        *,
+        latency: float = 0.0,
+        token_delay: float = 0.0,
+        kv_cache: bool = True,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.reply = reply
+        self.latency = latency
+        self.token_delay = token_delay
+        self.kv_cache = kv_cache
+        self.host = host
+        self.port = port
+        self.requests: List[StubRequest] = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.tokens_generated = 0
+        self.streams_cancelled = 0
+        self.prompt_tokens_total = 0
+        self.prompt_tokens_evaluated = 0
+        self._slots: Dict[Tuple[Any, ...], List[str]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: set = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "StubLLMServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._handlers):
+                task.cancel()
+            with contextlib.suppress(Exception):
+                await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubLLMServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def reply_for(self, body: Dict[str, Any]) -> str:
+        return self.reply(body) if callable(self.reply) else self.reply
+
+    def _prefill(self, path: str, body: Dict[str, Any]) -> Tuple[int, int]:
+        """(prompt tokens, tokens served from the slot's cached prefix) for this request."""
+        prompt: List[str] = []
+        for message in body.get("messages", ()):
+            prompt.append(f"<{message.get('role', 'user')}>")
+            prompt.extend(stub_tokens(message.get("content", "")))
+        slot = (path, body.get("model"), body.get("id_slot", 0))
+        cached = 0
+        if self.kv_cache:
+            for old, new in zip(self._slots.get(slot, ()), prompt):
+                if old != new:
+                    break
+                cached += 1
+        self._slots[slot] = prompt
+        self.prompt_tokens_total += len(prompt)
+        self.prompt_tokens_evaluated += len(prompt) - cached
+        return len(prompt), cached
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        self.connections += 1
+        connection = self.connections
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                raw = await reader.readexactly(int(headers.get("content-length", "0")))
+                body = ujson.loads(raw) if raw else {}
+                self.requests.append(StubRequest(path, body, connection))
+
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    await self._respond(writer, path, body)
+                finally:
+                    self.in_flight -= 1
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, path: str, body: Dict[str, Any]) -> None:
+        if path not in ("/api/chat", "/v1/chat/completions"):
+            await self._send(writer, 404, {"error": f"unknown path {path}"})
+            return
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        text = self.reply_for(body)
+        prompt_tokens, cached_tokens = self._prefill(path, body)
+        ollama = path == "/api/chat"
+        # Ollama reports only the evaluated prompt tokens; OpenAI-style usage reports the cached share.
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": 0,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+
+        if not body.get("stream"):
+            tokens = stub_tokens(text)
+            self.tokens_generated += len(tokens)
+            if ollama:
+                payload = {
+                    "model": body.get("model"),
+                    "message": {"role": "assistant", "content": text},
+                    "done": True,
+                    "prompt_eval_count": prompt_tokens - cached_tokens,
+                    "eval_count": len(tokens),
+                }
+            else:
+                payload = {
+                    "model": body.get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": dict(usage, completion_tokens=len(tokens)),
+                }
+            await self._send(writer, 200, payload)
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n"
+            + (b"Content-Type: application/x-ndjson\r\n" if ollama else b"Content-Type: text/event-stream\r\n")
+            + b"\r\n"
+        )
+        tokens = stub_tokens(text)
+        try:
+            for token in tokens:
+                if self.token_delay:
+                    await asyncio.sleep(self.token_delay)
+                if ollama:
+                    event = {"model": body.get("model"), "message": {"role": "assistant", "content": token}, "done": False}
+                    line = ujson.dumps(event) + "\n"
+                else:
+                    event = {"choices": [{"index": 0, "delta": {"content": token}}]}
+                    line = "data: " + ujson.dumps(event) + "\n\n"
+                self._write_chunk(writer, line.encode("utf-8"))
+                await writer.drain()
+                self.tokens_generated += 1
+            if ollama:
+                done = {"done": True, "prompt_eval_count": prompt_tokens - cached_tokens, "eval_count": len(tokens)}
+                tail = ujson.dumps(done) + "\n"
+            else:
+                final = {"choices": [], "usage": dict(usage, completion_tokens=len(tokens))}
+                tail = "data: " + ujson.dumps(final) + "\n\ndata: [DONE]\n\n"
+            self._write_chunk(writer, tail.encode("utf-8"))
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except ConnectionError:
+            self.streams_cancelled += 1
+            raise
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]) -> None:
+        data = ujson.dumps(payload).encode("utf-8")
+        reason = "OK" if status == 200 else "Error"
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode(
+                "latin-1"
+            )
+            + data
+        )
+        await writer.drain()
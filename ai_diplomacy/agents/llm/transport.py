@@ -0,0 +1,94 @@
+"""
+Keep-alive connection pools for the LLM backends, built on ``httpx``.
+
+The LLM backends we talk to (Ollama, llama.cpp's server, OpenAI-compatible
+APIs) speak plain JSON over HTTP. ``ConnectionPool`` wraps one
+``httpx.AsyncClient`` per origin, whose ``limits`` keep idle connections open
+between requests so a game's hundreds of calls do not each pay for a TCP (and
+TLS) handshake. Response bodies may be read whole or streamed; a stream that is
+abandoned part-way closes its connection instead of returning it to the pool.
+
+Timeouts and concurrency limits are the caller's (``LLMClient``'s) business:
+the pool only bounds how long it waits to connect.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import AsyncIterator, Dict, Optional, Set
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ConnectionPool", "TransportError"]
+
+# Everything the pool raises for a failed exchange (refused connection, reset, malformed response).
+TransportError = httpx.TransportError
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections to a single origin (``scheme://host:port``).
+
+    Connections belong to the event loop that opened them; if the pool is used
+    from a different loop (each ``asyncio.run`` creates one), the client of the
+    old loop is dropped and a fresh one is created.
+    """
+
+    def __init__(
+        self, base_url: str, max_idle: int = 8, idle_timeout: float = 60.0, connect_timeout: float = 10.0
+    ):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme in {base_url!r}")
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.limits = httpx.Limits(
+            max_connections=None, max_keepalive_connections=max_idle, keepalive_expiry=idle_timeout
+        )
+        self.timeout = httpx.Timeout(None, connect=connect_timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: Set[asyncio.Task] = set()
+
+    async def request(
+        self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """Sends a request and reads the whole response body."""
+        return await self._http().request(method, path, content=body, headers=headers)
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """Sends a request; the body is read from the yielded response (``aiter_lines``, ``aread``)."""
+        async with self._http().stream(method, path, content=body, headers=headers) as response:
+            yield response
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def close(self) -> None:
+        """Closes the pooled connections; from inside their event loop the close is scheduled."""
+        client, self._client = self._client, None
+        if client is None:
+            return
+        with contextlib.suppress(RuntimeError):  # no running loop: the connections died with theirs
+            if asyncio.get_running_loop() is self._loop:
+                task = asyncio.get_running_loop().create_task(client.aclose())
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+    def _http(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._client = None  # connections of a previous loop cannot be used from this one
+            self._loop = loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.origin, limits=self.limits, timeout=self.timeout)
+        return self._client
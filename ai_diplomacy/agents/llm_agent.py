@@ -3,24 +3,84 @@ LLM-based agent implementation.
 """
 from __future__ import annotations
 
+import dataclasses
 import logging
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 from ai_diplomacy.agents.base import BaseAgent
-from ai_diplomacy.agents.llm.prompt.strategy import JinjaPromptStrategy, PromptStrategy
+from ai_diplomacy.agents.llm.client import (
+    LLMClient,
+    LLMClientError,
+    LLMRequest,
+    LLMResponse,
+    LLMTimeoutError,
+    get_llm_client,
+)
+from ai_diplomacy.agents.llm.conversation import (
+    Conversation,
+    LedgerEntry,
+    TokenLedger,
+    approx_tokens,
+    describe_board_changes,
+    describe_inbound_messages,
+    describe_results,
+)
+from ai_diplomacy.agents.llm.incremental_json import JSONObjectScanner
+from ai_diplomacy.agents.llm.order_constraints import OrderConstraint, order_constraint
+from ai_diplomacy.agents.llm.output_parser import parse_json_object
+from ai_diplomacy.agents.llm.prompt.registry import TEMPLATE_REGISTRY
+from ai_diplomacy.agents.llm.prompt.strategy import (
+    ORDER_INSTRUCTIONS_TEMPLATE_NAME,
+    ORDER_TEMPLATE_NAME,
+    JinjaPromptStrategy,
+    LayeredPrompt,
+    PromptStrategy,
+    conversation_instructions,
+    conversation_turn,
+    order_repair_turn,
+)
+from ai_diplomacy.agents.opening_book import OpeningBook, config_fingerprint, get_opening_book
+from ai_diplomacy.domain.message import Message as DiploMessage
+from ai_diplomacy.domain.order import Order
+from ai_diplomacy.domain.possible_orders import normalize_order
 
 if TYPE_CHECKING:
-    from ai_diplomacy.domain import DiploMessage, Order, PhaseState
+    from ai_diplomacy.domain import PhaseState
 
 
 logger = logging.getLogger(__name__)
 
 __all__ = ["LLMAgent"]
 
+BROADCAST_RECIPIENTS = ("GLOBAL", "ALL")
+
 
 class LLMAgent(BaseAgent):
     """
     LLM-based diplomacy agent that implements the BaseAgent interface.
+
+    Model calls go through the process-wide ``LLMClient`` unless a client is
+    passed in, so every agent shares its connection pools and per-model limits.
+    Early-game orders are served from the ``OpeningBook`` (passed in, or the one
+    configured by ``$AI_DIPLOMACY_OPENING_BOOK``) when this configuration has
+    already played the position.
+
+    With ``conversation_mode`` the agent keeps one chat session for the whole
+    game and each phase sends only what changed (see ``agents.llm.conversation``);
+    the session is compacted once it exceeds ``token_budget`` estimated tokens.
+    Either way ``token_ledger`` records the tokens sent per phase.
+
+    With ``streaming`` (the default) replies are streamed and the stream is
+    closed as soon as the reply's JSON object is complete, so the model does not
+    spend time on prose after it. If a streamed call times out, the complete
+    entries received so far are used.
+
+    With ``constrained_orders`` (the default) order requests carry a JSON schema
+    and a GBNF grammar built from the legal orders (see
+    ``agents.llm.order_constraints``), which backends with structured output
+    enforce while decoding; every reply is then validated against the legal
+    orders, and illegal entries are dropped. ``repair_orders`` asks again for
+    just the units whose orders the game rejected.
     """
 
     prompt_strategy: PromptStrategy
@@ -29,6 +89,15 @@ class LLMAgent(BaseAgent):
         self,
         agent_id: str,
         country: str,
+        model_id: Optional[str] = None,
+        *,
+        temperature: Optional[float] = None,
+        llm_client: Optional[LLMClient] = None,
+        opening_book: Optional[OpeningBook] = None,
+        conversation_mode: bool = False,
+        token_budget: int = 6000,
+        streaming: bool = True,
+        constrained_orders: bool = True,
     ):
         """
         Initialize the LLM agent.
@@ -36,7 +105,46 @@ class LLMAgent(BaseAgent):
         super().__init__(agent_id=agent_id, country=country)
         self.prompt_strategy = JinjaPromptStrategy()
         self.country = country
-        # TODO: Restore state, LLM coordinator, etc.
+        self.model_id = model_id
+        self.temperature = temperature  # None: the backend's default; 0 makes replies cacheable
+        self._llm_client = llm_client
+        self._opening_book = opening_book
+        self._config_fingerprint: Optional[str] = None
+        self.conversation_mode = conversation_mode
+        self.token_budget = token_budget
+        self.conversation: Optional[Conversation] = None
+        self.token_ledger = TokenLedger()
+        self.streaming = streaming
+        self.constrained_orders = constrained_orders
+        self._inbound: List[Any] = []
+        self._results: List[Any] = []
+        # TODO: Restore state (goals, relationships, diary).
+
+    @property
+    def llm_client(self) -> LLMClient:
+        return self._llm_client if self._llm_client is not None else get_llm_client()
+
+    @property
+    def opening_book(self) -> Optional[OpeningBook]:
+        return self._opening_book if self._opening_book is not None else get_opening_book()
+
+    @property
+    def config_fingerprint(self) -> str:
+        """Identifies the settings that shape this agent's orders, for the opening book."""
+        if self._config_fingerprint is None:
+            self._config_fingerprint = config_fingerprint(
+                agent=type(self).__name__,
+                model=self.model_id,
+                temperature=self.temperature,
+                strategy=type(self.prompt_strategy).__name__,
+                conversation=self.conversation_mode,
+                constrained=self.constrained_orders,
+                templates=[
+                    TEMPLATE_REGISTRY.source_digest(ORDER_INSTRUCTIONS_TEMPLATE_NAME),
+                    TEMPLATE_REGISTRY.source_digest(ORDER_TEMPLATE_NAME),
+                ],
+            )
+        return self._config_fingerprint
 
     async def decide_orders(self, phase: "PhaseState") -> List["Order"]:
         """
@@ -49,16 +157,314 @@ class LLMAgent(BaseAgent):
             logger.info(f"[{self.country}] No units to command")
             return []
 
-        prompt = self.prompt_strategy.for_orders(phase=phase, power=self.country)
-        logger.debug("Generated prompt for orders:\n%s", prompt)
+        book = self.opening_book if self.model_id else None
+        position_hash = phase.key.position_hash
+        if book is not None and book.covers(phase.key.year, position_hash):
+            booked = book.lookup(self.config_fingerprint, position_hash, self.country)
+            if booked is not None:
+                logger.info(f"[{self.country}] Playing {phase.key.name} from the opening book")
+                return [Order(value=o) for o in booked]
+        else:
+            book = None
 
-        # TODO: Here you would call the LLM with the prompt
-        # For now, returning an empty list to satisfy the interface.
-        return []
+        constraint = order_constraint(phase, self.country) if self.constrained_orders else None
+        if self.conversation_mode:
+            payload = await self._ask_in_conversation(phase, "orders", constraint)
+        else:
+            prompt = self.prompt_strategy.order_prompt(phase=phase, power=self.country)
+            logger.debug("Generated prompt for orders:\n%s", prompt.text)
+            payload = await self._ask(prompt, "orders", phase, constraint)
+        raw_orders = payload.get("orders") if payload else None
+        if not isinstance(raw_orders, list):
+            logger.warning(f"[{self.country}] No orders list in the model's reply for {phase.key.name}")
+            return []
+        if constraint is not None:
+            validated = constraint.validate(payload)
+            if validated.rejected:
+                logger.warning(
+                    f"[{self.country}] Dropped {len(validated.rejected)} illegal or duplicate orders "
+                    f"for {phase.key.name}: {validated.rejected}"
+                )
+            orders = [Order(value=o) for o in validated.orders]
+        else:
+            orders = [Order(value=o.strip()) for o in raw_orders if isinstance(o, str) and o.strip()]
+        if book is not None:
+            bookable = _complete_legal_orders(phase, self.country, [o.value for o in orders])
+            if bookable is not None:
+                book.record(self.config_fingerprint, position_hash, self.country, bookable)
+            else:
+                logger.debug(
+                    f"[{self.country}] Not booking incomplete or illegal orders for {phase.key.name}"
+                )
+        return orders
+
+    async def repair_orders(self, phase: "PhaseState", rejected: Dict[str, Optional[str]]) -> List["Order"]:
+        """
+        Asks the model again for the rejected units only.
+
+        The follow-up lists just those units with their legal orders; in stateless
+        mode it keeps the order prompt's instructions and board as its prefix, so
+        local backends reuse the cached prefix, and in conversation mode it is the
+        next turn of the session. Only legal orders for the listed units are returned.
+        """
+        if not rejected:
+            return []
+        turn = order_repair_turn(phase, self.country, rejected)
+        logger.debug("Order repair turn:\n%s", turn)
+        constraint = order_constraint(phase, self.country, locations=rejected)
+        request_constraint = constraint if self.constrained_orders else None
+        if self.conversation_mode and self.conversation is not None:
+            response = await self._complete(
+                self.conversation.with_user_turn(turn),
+                "repair",
+                phase.key.name,
+                new_tokens=approx_tokens(turn),
+                constraint=request_constraint,
+            )
+            if response is not None:
+                self.conversation.record_exchange(turn, response.text)
+            payload = parse_json_object(response.text) if response is not None else None
+        else:
+            prompt = dataclasses.replace(
+                self.prompt_strategy.order_prompt(phase=phase, power=self.country), power=turn
+            )
+            payload = await self._ask(prompt, "repair", phase, request_constraint)
+        if constraint is None:
+            raw_orders = payload.get("orders") if payload else None
+            if not isinstance(raw_orders, list):
+                return []
+            return [Order(value=o.strip()) for o in raw_orders if isinstance(o, str) and o.strip()]
+        validated = constraint.validate(payload)
+        if validated.rejected:
+            logger.warning(
+                f"[{self.country}] Repair reply for {phase.key.name} still had illegal orders: "
+                f"{validated.rejected}"
+            )
+        return [Order(value=o) for o in validated.orders]
 
     async def negotiate(self, phase: "PhaseState") -> List["DiploMessage"]:
         """
         Generate diplomatic messages for the current phase.
         """
-        # TODO: Implement negotiation logic using a prompt strategy
-        return []
+        if self.conversation_mode:
+            payload = await self._ask_in_conversation(phase, "messages")
+        else:
+            prompt = self.prompt_strategy.negotiation_prompt(
+                phase=phase, power=self.country, active_powers=self._other_active_powers(phase)
+            )
+            logger.debug("Generated prompt for negotiation:\n%s", prompt.text)
+            payload = await self._ask(prompt, "messages", phase)
+        raw_messages = payload.get("messages") if payload else None
+        if not isinstance(raw_messages, list):
+            return []
+
+        messages: List[DiploMessage] = []
+        for raw in raw_messages:
+            if not isinstance(raw, dict) or not raw.get("recipient") or not raw.get("content"):
+                continue
+            recipient = str(raw["recipient"]).strip().upper()
+            if recipient in BROADCAST_RECIPIENTS:
+                messages.append(
+                    DiploMessage(recipient="GLOBAL", content=str(raw["content"]), message_type="global")
+                )
+            else:
+                messages.append(DiploMessage(recipient=recipient, content=str(raw["content"])))
+        return messages
+
+    async def receive_messages(self, msgs: List["DiploMessage"]) -> None:
+        """Buffers messages addressed to this power for the next conversation turn."""
+        if self.conversation_mode:
+            self._inbound.extend(msgs)
+
+    async def update_state(self, phase: "PhaseState", events: list) -> None:
+        """
+        Update internal state after a phase is adjudicated.
+
+        Only conversation-mode agents keep anything: the phase results are buffered
+        and reported in the next turn of the conversation. Goals, relationships and
+        the diary are not updated from the results.
+        """
+        if self.conversation_mode:
+            self._results.extend(events)
+        return None
+
+    async def _ask(
+        self,
+        prompt: LayeredPrompt,
+        purpose: str,
+        phase: "PhaseState",
+        constraint: Optional[OrderConstraint] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Sends ``prompt`` to the agent's model and returns the JSON object in its reply, if any."""
+        messages = prompt.as_messages()
+        sent = sum(approx_tokens(m["content"]) for m in messages)
+        response = await self._complete(
+            messages, purpose, phase.key.name, new_tokens=sent, constraint=constraint
+        )
+        return parse_json_object(response.text) if response is not None else None
+
+    async def _ask_in_conversation(
+        self, phase: "PhaseState", purpose: str, constraint: Optional[OrderConstraint] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Appends this phase's turn to the conversation and returns the JSON object in the reply.
+
+        The turn is kept (and the buffered messages and results cleared) only when
+        the model answers, so a failed call is retried with the same deltas.
+        """
+        if not self.model_id:
+            logger.warning(f"[{self.country}] No model configured; skipping {purpose}")
+            return None
+        if self.conversation is None:
+            self.conversation = Conversation(
+                conversation_instructions(self.country), token_budget=self.token_budget
+            )
+        conversation = self.conversation
+        if conversation.needs_compaction():
+            await self._compact(phase)
+
+        previous = conversation.last_board
+        turn = conversation_turn(
+            phase,
+            self.country,
+            purpose,
+            board_changes=describe_board_changes(previous, phase.board) if previous is not None else None,
+            inbound=describe_inbound_messages(self._inbound),
+            results=describe_results(self._results),
+            active_powers=self._other_active_powers(phase) if purpose == "messages" else (),
+        )
+        logger.debug("Conversation turn for %s:\n%s", purpose, turn)
+        response = await self._complete(
+            conversation.with_user_turn(turn),
+            purpose,
+            phase.key.name,
+            new_tokens=approx_tokens(turn),
+            constraint=constraint,
+        )
+        if response is None:
+            return None
+        conversation.record_exchange(turn, response.text)
+        conversation.last_board = phase.board
+        self._inbound.clear()
+        self._results.clear()
+        return parse_json_object(response.text)
+
+    async def _compact(self, phase: "PhaseState") -> None:
+        """Asks the model to summarize the conversation and replaces the older turns with the summary."""
+        conversation = self.conversation
+        before = conversation.tokens
+        messages = conversation.compaction_messages()
+        response = await self._complete(
+            messages,
+            "compaction",
+            phase.key.name,
+            new_tokens=approx_tokens(messages[-1]["content"]),
+            json_reply=False,
+        )
+        if response is None or not response.text.strip():
+            logger.warning(f"[{self.country}] Conversation compaction failed; keeping the full history")
+            return
+        conversation.compact(response.text)
+        logger.info(
+            f"[{self.country}] Compacted conversation from ~{before} to ~{conversation.tokens} tokens"
+        )
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        purpose: str,
+        phase_name: str,
+        *,
+        new_tokens: int,
+        constraint: Optional[OrderConstraint] = None,
+        json_reply: bool = True,
+    ) -> Optional[LLMResponse]:
+        """
+        Sends ``messages`` to the agent's model and records the exchange in ``token_ledger``.
+        With ``json_reply`` a hedged call only accepts replies holding a JSON object
+        (and, with ``constraint``, at least one legal order).
+        """
+        if not self.model_id:
+            logger.warning(f"[{self.country}] No model configured; skipping {purpose}")
+            return None
+        request = LLMRequest(
+            self.model_id,
+            messages,
+            temperature=self.temperature,
+            json_schema=constraint.json_schema if constraint is not None else None,
+            grammar=constraint.gbnf if constraint is not None else None,
+        )
+        stop = JSONObjectScanner().feed if self.streaming else None
+        accept = _json_reply_check(constraint) if json_reply else None
+        try:
+            response = await self.llm_client.complete(request, stop=stop, accept=accept)
+        except LLMTimeoutError as e:
+            if not e.partial_text:
+                logger.error(f"[{self.country}] LLM call for {purpose} failed: {e}")
+                return None
+            logger.warning(f"[{self.country}] {e}; using the partial {purpose} reply")
+            response = LLMResponse(
+                text=e.partial_text, model_id=self.model_id, latency=request.timeout or 0.0
+            )
+        except LLMClientError as e:
+            logger.error(f"[{self.country}] LLM call for {purpose} failed: {e}")
+            return None
+        logger.debug(
+            f"[{self.country}] {purpose} reply from {self.model_id} in {response.latency:.2f}s "
+            f"(queued {response.queued:.2f}s{', cached' if response.cached else ''}"
+            f"{', stopped early' if response.stopped_early else ''})"
+        )
+        self.token_ledger.record(
+            LedgerEntry(
+                phase=phase_name,
+                purpose=purpose,
+                mode="conversation" if self.conversation_mode else "stateless",
+                sent_tokens=sum(approx_tokens(m["content"]) for m in messages),
+                new_tokens=new_tokens,
+                prompt_tokens=response.prompt_tokens,
+                completion_tokens=response.completion_tokens,
+            )
+        )
+        return response
+
+    def _other_active_powers(self, phase: "PhaseState") -> List[str]:
+        center_counts = phase.board.center_counts()
+        return [
+            power
+            for power in phase.board.index.powers
+            if power != self.country and (center_counts.get(power) or phase.board.get_units(power))
+        ]
+
+
+def _json_reply_check(constraint: Optional[OrderConstraint]) -> Callable[[str], bool]:
+    """Whether a reply holds a JSON object and, with ``constraint``, at least one legal order."""
+
+    def check(text: str) -> bool:
+        payload = parse_json_object(text)
+        if payload is None:
+            return False
+        return constraint is None or bool(constraint.validate(payload).orders)
+
+    return check
+
+
+def _complete_legal_orders(phase: "PhaseState", power: str, orders: List[str]) -> Optional[List[str]]:
+    """
+    ``orders`` in the engine's spelling if every one is legal and, outside
+    adjustment phases, each of the power's orderable units has exactly one;
+    otherwise None. Only such sets go into the opening book.
+    """
+    index = phase.possible_orders
+    if index is None or not orders:
+        return None
+    normalized = [normalize_order(o) for o in orders]
+    if len(set(normalized)) != len(normalized) or not all(index.is_valid(power, o) for o in normalized):
+        return None
+    if not phase.key.name.endswith("A"):
+        locations = index.orderable_locations.get(power, ())
+        if len(normalized) != len(locations):
+            return None
+        chosen = set(normalized)
+        if not all(chosen.intersection(index.orders_for_location(loc)) for loc in locations):
+            return None
+    return normalized
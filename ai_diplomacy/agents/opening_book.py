@@ -0,0 +1,185 @@
+"""
+Opening book shared across games.
+
+Every standard game starts from the same position, so the first phases of a
+game keep posing the same question to the same agent configurations. The
+``OpeningBook`` records the orders an agent configuration chose for a position
+(``PhaseKey.position_hash``) and power, and serves one of the recorded choices
+when that configuration meets the position again. Choices are sampled in
+proportion to how often they were recorded, so games still vary.
+
+Entries are keyed by a configuration fingerprint (see ``config_fingerprint``):
+changing the model, its sampling parameters or the prompt template starts a
+fresh book for that configuration.
+
+The book lives in SQLite so parallel games and later runs share it.
+``get_opening_book()`` returns the book at ``$AI_DIPLOMACY_OPENING_BOOK``, or
+None when the variable is unset; ``$AI_DIPLOMACY_OPENING_BOOK_MIN_SAMPLES`` and
+``$AI_DIPLOMACY_OPENING_BOOK_EXPLORE`` override how many recordings a position
+needs before it is served and how often a hit still asks the model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import ujson
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["OpeningBook", "OpeningBookStats", "config_fingerprint", "get_opening_book"]
+
+OPENING_BOOK_ENV = "AI_DIPLOMACY_OPENING_BOOK"
+OPENING_BOOK_MIN_SAMPLES_ENV = "AI_DIPLOMACY_OPENING_BOOK_MIN_SAMPLES"
+OPENING_BOOK_EXPLORE_ENV = "AI_DIPLOMACY_OPENING_BOOK_EXPLORE"
+
+# Several recordings before a position is served, and an occasional fresh answer
+# after that, so the book keeps collecting alternatives instead of freezing the first.
+DEFAULT_MIN_SAMPLES = 3
+DEFAULT_EXPLORE = 0.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS book (
+    fingerprint TEXT NOT NULL,
+    position TEXT NOT NULL,
+    power TEXT NOT NULL,
+    choice TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (fingerprint, position, power, choice)
+);
+"""
+
+
+@dataclass
+class OpeningBookStats:
+    hits: int = 0
+    misses: int = 0
+    recorded: int = 0
+
+
+def config_fingerprint(**parts: Any) -> str:
+    """A short stable digest of the settings that shape an agent's choices."""
+    material = ujson.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(material).hexdigest()[:16]
+
+
+class OpeningBook:
+    """
+    Recorded order sets per (configuration, position, power).
+
+    Args:
+        path: SQLite file holding the book.
+        max_year: Only positions up to this game year are looked up or recorded.
+        min_samples: How many recordings a position needs before the book serves
+            it; until then agents keep asking their model, which adds variety.
+        explore: Probability of ignoring a hit so the model is asked (and its
+            answer recorded) anyway.
+        rng: Random source for sampling (seed it for reproducible games).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        max_year: int = 1901,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        explore: float = DEFAULT_EXPLORE,
+        rng: Optional[random.Random] = None,
+    ):
+        self.path = Path(path)
+        self.max_year = max_year
+        self.min_samples = min_samples
+        self.explore = explore
+        self.stats = OpeningBookStats()
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def covers(self, year: int, position_hash: int) -> bool:
+        return bool(position_hash) and year <= self.max_year
+
+    def choices(self, fingerprint: str, position_hash: int, power: str) -> List[Tuple[List[str], int]]:
+        """Every recorded order set for the position, with how often it was chosen."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT choice, count FROM book WHERE fingerprint = ? AND position = ? AND power = ? ORDER BY choice",
+                (fingerprint, _position_key(position_hash), power),
+            ).fetchall()
+        return [(ujson.loads(choice), count) for choice, count in rows]
+
+    def lookup(self, fingerprint: str, position_hash: int, power: str) -> Optional[List[str]]:
+        """A recorded order set sampled by frequency, or None when the model should be asked."""
+        try:
+            choices = self.choices(fingerprint, position_hash, power)
+        except sqlite3.Error as e:
+            logger.warning(f"Opening book lookup failed ({self.path}): {e}")
+            choices = []
+        if sum(count for _, count in choices) < max(self.min_samples, 1) or (
+            self.explore and self._rng.random() < self.explore
+        ):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        orders = [choice for choice, _ in choices]
+        return list(self._rng.choices(orders, weights=[count for _, count in choices])[0])
+
+    def record(self, fingerprint: str, position_hash: int, power: str, orders: Sequence[str]) -> None:
+        """Adds one observation of ``power`` choosing ``orders`` in this position."""
+        choice = ujson.dumps(sorted(orders), ensure_ascii=False)
+        try:
+            with self._lock:
+                db = self._connect()
+                db.execute(
+                    "INSERT INTO book VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (fingerprint, position, power, choice) DO UPDATE SET count = count + 1",
+                    (fingerprint, _position_key(position_hash), power, choice),
+                )
+                db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Opening book write failed ({self.path}): {e}")
+            return
+        self.stats.recorded += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+
+def _position_key(position_hash: int) -> str:
+    return f"{position_hash:016x}"  # 64-bit unsigned does not fit SQLite's signed INTEGER
+
+
+_SHARED_BOOK: Optional[OpeningBook] = None
+
+
+def get_opening_book() -> Optional[OpeningBook]:
+    """The process-wide book at ``$AI_DIPLOMACY_OPENING_BOOK``, or None when it is not configured."""
+    global _SHARED_BOOK
+    path = os.environ.get(OPENING_BOOK_ENV)
+    if not path:
+        return None
+    if _SHARED_BOOK is None or _SHARED_BOOK.path != Path(path):
+        _SHARED_BOOK = OpeningBook(
+            path,
+            min_samples=int(os.environ.get(OPENING_BOOK_MIN_SAMPLES_ENV, DEFAULT_MIN_SAMPLES)),
+            explore=float(os.environ.get(OPENING_BOOK_EXPLORE_ENV, DEFAULT_EXPLORE)),
+        )
+    return _SHARED_BOOK
@@ -4,11 +4,10 @@ Useful for testing and as a baseline for LLM agent performance.
 """
 
 import random
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from ai_diplomacy.domain import Order, PhaseState
 from .base import BaseAgent
-from ..core.message import Message  # Corrected
-from diplomacy import Game
+from ..domain.message import Message
 
 __all__ = ["ScriptedAgent"]
 
@@ -62,45 +61,48 @@ class ScriptedAgent(BaseAgent):
             List of orders to submit
         """
         orders = []
-        my_units = phase.get_power_units(self.country)
-
-        if not my_units:
-            return orders
 
         # Simple strategy based on phase type and personality
         if phase.phase_type == "MOVEMENT":
-            orders = self._decide_movement_orders(phase, my_units)
+            orders = self._decide_movement_orders(phase, self._unit_locations(phase))
         elif phase.phase_type == "RETREAT":
-            orders = self._decide_retreat_orders(phase, my_units)
+            orders = self._decide_retreat_orders(phase, self._dislodged_locations(phase))
         elif phase.phase_type == "ADJUSTMENT":
             orders = self._decide_adjustment_orders(phase)
 
         return orders
 
-    def _decide_movement_orders(self, phase: PhaseState, my_units: List[str]) -> List[Order]:
+    def _unit_locations(self, phase: PhaseState) -> List[Tuple[str, str]]:
+        """(unit type, location) for each of our units, read from the board arrays when available."""
+        if phase.board is not None:
+            return phase.board.unit_locations(self.country)
+        # No board (minimal fallback state): parse the unit strings, e.g. "A PAR".
+        return [tuple(unit.split()[:2]) for unit in phase.get_power_units(self.country) if len(unit.split()) >= 2]
+
+    def _dislodged_locations(self, phase: PhaseState) -> List[Tuple[str, str]]:
+        """(unit type, location) for each of our dislodged units."""
+        if phase.board is not None:
+            return phase.board.dislodged_locations(self.country)
+        return self._unit_locations(phase)  # without a board, every unit is treated as dislodged
+
+    def _decide_movement_orders(self, phase: PhaseState, my_units: List[Tuple[str, str]]) -> List[Order]:
         """Decide movement orders based on simple heuristics."""
         orders = []
 
-        for unit in my_units:
-            # Parse unit info (e.g., "A PAR" -> Army in Paris)
-            unit_parts = unit.split()
-            if len(unit_parts) >= 2:
-                unit_type = unit_parts[0]  # A or F
-                location = unit_parts[1]
-
-                # Simple movement strategy
-                if self.personality == "aggressive":
-                    # Try to move toward enemy supply centers
-                    order_str = self._aggressive_move(unit_type, location, phase)  # Renamed variable
-                elif self.personality == "defensive":
-                    # Try to defend own supply centers
-                    order_str = self._defensive_move(unit_type, location, phase)  # Renamed variable
-                else:
-                    # Neutral: balanced expansion and defense
-                    order_str = self._neutral_move(unit_type, location, phase)  # Renamed variable
-
-                if order_str:
-                    orders.append(Order(order_str))
+        for unit_type, location in my_units:
+            # Simple movement strategy
+            if self.personality == "aggressive":
+                # Try to move toward enemy supply centers
+                order_str = self._aggressive_move(unit_type, location, phase)  # Renamed variable
+            elif self.personality == "defensive":
+                # Try to defend own supply centers
+                order_str = self._defensive_move(unit_type, location, phase)  # Renamed variable
+            else:
+                # Neutral: balanced expansion and defense
+                order_str = self._neutral_move(unit_type, location, phase)  # Renamed variable
+
+            if order_str:
+                orders.append(Order(order_str))
 
         return orders
 
@@ -118,21 +120,30 @@ class ScriptedAgent(BaseAgent):
 
     def _defensive_move(self, unit_type: str, location: str, phase: PhaseState) -> str:
         """Generate defensive movement orders."""
-        my_centers = phase.get_power_centers(self.country)
-
         # If this unit is defending a supply center, hold
-        if location in my_centers:
+        if self._owns_center(phase, location):
             return f"{unit_type} {location} H"
 
-        # Otherwise, try to move to support a supply center
+        # Otherwise, try to move to support a supply center not already held by one of our units
         possible_moves = self._get_possible_moves(unit_type, location)
         for move in possible_moves:
-            if move in my_centers:
+            if self._owns_center(phase, move) and not self._occupied_by_us(phase, move):
                 return f"{unit_type} {location} - {move}"
 
         # Default to hold
         return f"{unit_type} {location} H"
 
+    def _owns_center(self, phase: PhaseState, province: str) -> bool:
+        if phase.board is not None:
+            return phase.board.center_owner(province) == self.country
+        return province in phase.get_power_centers(self.country)
+
+    def _occupied_by_us(self, phase: PhaseState, province: str) -> bool:
+        if phase.board is None:
+            return False
+        occupant = phase.board.unit_at(province)
+        return occupant is not None and occupant[0] == self.country
+
     def _neutral_move(self, unit_type: str, location: str, phase: PhaseState) -> str:
         """Generate balanced movement orders."""
         # Mix of aggressive and defensive with some randomness
@@ -156,24 +167,23 @@ class ScriptedAgent(BaseAgent):
         }
         return adjacencies.get(location, [])
 
-    def _decide_retreat_orders(self, phase: PhaseState, my_units: List[str]) -> List[Order]:
+    def _decide_retreat_orders(self, phase: PhaseState, my_units: List[Tuple[str, str]]) -> List[Order]:
         """Decide retreat orders."""
         orders = []
         # Simple retreat strategy: retreat to the safest adjacent territory
         # This would need more sophisticated logic in a real implementation
-        for unit in my_units:
+        for unit_type, location in my_units:
             # For now, just disband (this is overly simplistic)
-            orders.append(Order(f"{unit} D"))
+            orders.append(Order(f"{unit_type} {location} D"))
         return orders
 
     def _decide_adjustment_orders(self, phase: PhaseState) -> List[Order]:
         """Decide build/remove orders."""
         orders = []
-        my_centers = phase.get_power_centers(self.country)
-        my_units = phase.get_power_units(self.country)
+        my_units = self._unit_locations(phase)
 
         unit_count = len(my_units)
-        center_count = len(my_centers)
+        center_count = phase.get_center_count(self.country)
 
         if center_count > unit_count:
             # Can build units
@@ -187,8 +197,8 @@ class ScriptedAgent(BaseAgent):
             removes_needed = unit_count - center_count
             # Remove the "least important" units (simplified)
             for i_unit in range(min(removes_needed, len(my_units))):  # Renamed loop variable
-                unit_to_remove = my_units[i_unit]
-                orders.append(Order(f"{unit_to_remove} D"))  # Disband
+                unit_type, location = my_units[i_unit]
+                orders.append(Order(f"{unit_type} {location} D"))  # Disband
 
         return orders
 
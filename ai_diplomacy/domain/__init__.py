@@ -2,16 +2,31 @@
 from .adapter_diplomacy import game_to_phase
 from .board import BoardState
 from .game_history import PhaseHistory
-from .messaging import DiploMessage
+from .history_journal import HistoryJournal, compact_journal, load_history
+from .message import Message as DiploMessage
 from .order import Order
 from .phase import PhaseKey, PhaseState
+from .possible_orders import PossibleOrdersIndex, normalize_order, possible_orders_for
+from .snapshot_cache import SNAPSHOT_CACHE, PhaseSnapshotCache, SnapshotCacheStats
+from .zobrist import position_hash, update_position_hash
 
 __all__ = [
     "game_to_phase",
     "BoardState",
     "PhaseHistory",
+    "HistoryJournal",
+    "compact_journal",
+    "load_history",
     "DiploMessage",
     "Order",
     "PhaseKey",
     "PhaseState",
+    "PossibleOrdersIndex",
+    "normalize_order",
+    "possible_orders_for",
+    "SNAPSHOT_CACHE",
+    "PhaseSnapshotCache",
+    "SnapshotCacheStats",
+    "position_hash",
+    "update_position_hash",
 ]
@@ -1,20 +1,61 @@
-from diplomacy import Game as DipGame
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Tuple
+
 from .board import BoardState
 from .phase import PhaseState, PhaseKey
+from .possible_orders import possible_orders_for
+from .snapshot_cache import SNAPSHOT_CACHE
+from .zobrist import position_hash, update_position_hash
+
+if TYPE_CHECKING:
+    from diplomacy import Game as DipGame
+
 
 def game_to_phase(game: DipGame) -> PhaseState:
+    """
+    Returns the PhaseState for the game's current phase.
+
+    The snapshot is built once per phase and shared by every caller; treat it as
+    read-only. See ``snapshot_cache`` for invalidation rules.
+    """
+    return SNAPSHOT_CACHE.get(game, "phase", _build_phase)
+
+
+def _build_phase(game: DipGame) -> PhaseState:
     """Converts a diplomacy.Game object to a PhaseState."""
+    name = game.get_current_phase()
+    board = BoardState.from_game(game)
+    season, year = _season_and_year(game.phase)
     key = PhaseKey(
-        state=game.state,
-        scs=game.scs,
-        year=game.year,
-        season=game.season,
-        name=game.phase,
-    )
-    
-    board = BoardState(
-        units=game.units,
-        supply_centers=game.get_supply_centers(),
+        state=game.get_state(),
+        scs=game.get_centers(),
+        year=year,
+        season=season,
+        name=name,
+        position_hash=_position_hash(game, name, board),
     )
+
     history = [] # This will be implemented later
-    return PhaseState(key=key, board=board, history=history)
+    possible_orders = possible_orders_for(game) if hasattr(game, "get_all_possible_orders") else None
+    return PhaseState(key=key, board=board, history=history, possible_orders=possible_orders)
+
+
+def _season_and_year(long_phase: str) -> Tuple[str, int]:
+    """'SPRING 1901 MOVEMENT' -> ('SPRING', 1901); 'FORMING'/'COMPLETED' -> (name, 0)."""
+    parts = long_phase.split()
+    if len(parts) >= 2 and parts[1].isdigit():
+        return parts[0], int(parts[1])
+    return long_phase, 0
+
+
+def _position_hash(game: DipGame, name: str, board: BoardState) -> int:
+    """Updates the previous snapshot's hash when there is one, else hashes from scratch."""
+    previous = SNAPSHOT_CACHE.previous(game, "phase")
+    if previous is not None and previous.key.position_hash:
+        updated = update_position_hash(
+            previous.key.position_hash, previous.board, previous.key.name, board, name
+        )
+        if updated is not None:
+            return updated
+    return position_hash(board, name)
@@ -1,12 +1,350 @@
-from dataclasses import dataclass, field
-from typing import Dict, List
+"""
+Compact board representation.
+
+Provinces, locations (provinces plus coasts such as "STP/SC") and powers are
+interned as small integers by a ``MapIndex``. ``BoardState`` stores unit and
+supply-center ownership in fixed-size arrays indexed by province, so diffs,
+ownership lookups and hashing are array operations. The ``units`` and
+``supply_centers`` string views of earlier versions are still available and are
+computed on first use.
+"""
+
+from array import array
+from itertools import compress
+from operator import ne
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+__all__ = ["UNIT_TYPES", "MapIndex", "BoardState"]
+
+UNIT_TYPES: Tuple[str, ...] = ("A", "F")
+NONE = -1
+
+_MAP_INDEXES: Dict[str, "MapIndex"] = {}
+
+
+class MapIndex:
+    """Interned province, location and power IDs for one map."""
+
+    __slots__ = (
+        "name",
+        "powers",
+        "provinces",
+        "locations",
+        "power_ids",
+        "province_ids",
+        "location_ids",
+        "location_province",
+        "__weakref__",  # ad-hoc indexes key weak caches (see zobrist)
+    )
+
+    def __init__(self, powers: Iterable[str], locations: Iterable[str], name: Optional[str] = None):
+        self.name = name
+        self.powers: Tuple[str, ...] = tuple(dict.fromkeys(p.upper() for p in powers))
+        self.locations: Tuple[str, ...] = tuple(dict.fromkeys(loc.upper() for loc in locations))
+        self.provinces: Tuple[str, ...] = tuple(dict.fromkeys(loc.split("/")[0] for loc in self.locations))
+
+        self.power_ids: Dict[str, int] = {p: i for i, p in enumerate(self.powers)}
+        self.province_ids: Dict[str, int] = {p: i for i, p in enumerate(self.provinces)}
+        self.location_ids: Dict[str, int] = {loc: i for i, loc in enumerate(self.locations)}
+        self.location_province = array(
+            "h", (self.province_ids[loc.split("/")[0]] for loc in self.locations)
+        )
+
+    @classmethod
+    def from_map(cls, dip_map) -> "MapIndex":
+        """Returns the (cached) index for a loaded ``diplomacy`` map."""
+        name = getattr(dip_map, "name", None)
+        if name is not None and name in _MAP_INDEXES:
+            return _MAP_INDEXES[name]
+        index = cls(dip_map.powers, dip_map.locs, name=name)
+        if name is not None:
+            _MAP_INDEXES[name] = index
+        return index
+
+    @classmethod
+    def from_strings(
+        cls, units: Mapping[str, Sequence[str]], supply_centers: Mapping[str, Sequence[str]]
+    ) -> "MapIndex":
+        """Builds an ad-hoc index covering exactly the powers and locations given."""
+        locations = sorted(
+            {_split_unit(u)[2] for us in units.values() for u in us}
+            | {c.upper() for cs in supply_centers.values() for c in cs}
+        )
+        powers = list(dict.fromkeys(list(units) + list(supply_centers)))
+        return cls(powers, locations)
+
+    def province_of(self, location: str) -> int:
+        return self.province_ids[location.upper().split("/")[0]]
+
+
+def _differing(a: array, b: array) -> List[int]:
+    """
+    Indices at which two equally long arrays differ. The element-wise comparison
+    runs in C, so Python only touches the indices that changed.
+    """
+    if a == b:
+        return []
+    return list(compress(range(len(a)), map(ne, a, b)))
+
+
+def _split_unit(unit: str) -> Tuple[bool, str, str]:
+    """'*A PAR' -> (dislodged, 'A', 'PAR')."""
+    unit = unit.strip()
+    dislodged = unit.startswith("*")
+    unit_type, location = unit.lstrip("*").split()[:2]
+    return dislodged, unit_type.upper(), location.upper()
+
 
-@dataclass(frozen=True)
 class BoardState:
-    """Represents the state of the board."""
-    units: Dict[str, List[str]] = field(default_factory=dict)
-    supply_centers: Dict[str, List[str]] = field(default_factory=dict)
+    """
+    Unit and supply-center ownership for one position.
+
+    All arrays are indexed by province ID and hold ``-1`` where nothing is present:
+    ``unit_owner``/``unit_type``/``unit_location`` for the unit occupying the
+    province, ``dislodged_*`` for a unit dislodged from it (retreat phases) and
+    ``sc_owner`` for supply-center ownership. Treat instances as immutable; they are
+    not hashable, so key caches on ``fingerprint()``.
+    """
+
+    __slots__ = (
+        "index",
+        "unit_owner",
+        "unit_type",
+        "unit_location",
+        "dislodged_owner",
+        "dislodged_type",
+        "dislodged_location",
+        "sc_owner",
+        "_units",
+        "_supply_centers",
+        "_fingerprint",
+    )
+
+    def __init__(
+        self,
+        units: Optional[Mapping[str, Sequence[str]]] = None,
+        supply_centers: Optional[Mapping[str, Sequence[str]]] = None,
+        *,
+        index: Optional[MapIndex] = None,
+    ):
+        units = units or {}
+        supply_centers = supply_centers or {}
+        if index is None:
+            index = MapIndex.from_strings(units, supply_centers)
+        self.index = index
+
+        size = len(index.provinces)
+        self.unit_owner = array("b", [NONE]) * size
+        self.unit_type = array("b", [NONE]) * size
+        self.unit_location = array("h", [NONE]) * size
+        self.dislodged_owner = array("b", [NONE]) * size
+        self.dislodged_type = array("b", [NONE]) * size
+        self.dislodged_location = array("h", [NONE]) * size
+        self.sc_owner = array("b", [NONE]) * size
+
+        try:
+            for power, power_units in units.items():
+                power_id = index.power_ids[power.upper()]
+                for unit in power_units:
+                    dislodged, unit_type, location = _split_unit(str(unit))
+                    location_id = index.location_ids[location]
+                    province_id = index.location_province[location_id]
+                    if dislodged:
+                        owner, types, locations = self.dislodged_owner, self.dislodged_type, self.dislodged_location
+                    else:
+                        owner, types, locations = self.unit_owner, self.unit_type, self.unit_location
+                    owner[province_id] = power_id
+                    types[province_id] = UNIT_TYPES.index(unit_type)
+                    locations[province_id] = location_id
+            for power, centers in supply_centers.items():
+                power_id = index.power_ids[power.upper()]
+                for center in centers:
+                    self.sc_owner[index.province_of(center)] = power_id
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Board does not fit map index {index.name or '(ad hoc)'}: {e}") from e
+
+        self._units: Optional[Dict[str, List[str]]] = None
+        self._supply_centers: Optional[Dict[str, List[str]]] = None
+        self._fingerprint: Optional[bytes] = None
+
+    @classmethod
+    def from_game(cls, game) -> "BoardState":
+        """Reads units and centers straight from a ``diplomacy.Game``."""
+        return cls(
+            units=game.get_units(),
+            supply_centers=game.get_centers(),
+            index=MapIndex.from_map(game.map),
+        )
+
+    # --- compatibility string views ---
+    @property
+    def units(self) -> Dict[str, List[str]]:
+        """power -> unit strings ("A PAR", dislodged units as "*A PAR"), in province order."""
+        if self._units is None:
+            views: Dict[str, List[str]] = {power: [] for power in self.index.powers}
+            self._append_units(views, self.unit_owner, self.unit_type, self.unit_location, "")
+            self._append_units(views, self.dislodged_owner, self.dislodged_type, self.dislodged_location, "*")
+            self._units = views
+        return self._units
+
+    @property
+    def supply_centers(self) -> Dict[str, List[str]]:
+        """power -> owned supply centers, in province order."""
+        if self._supply_centers is None:
+            views: Dict[str, List[str]] = {power: [] for power in self.index.powers}
+            for province_id, owner in enumerate(self.sc_owner):
+                if owner != NONE:
+                    views[self.index.powers[owner]].append(self.index.provinces[province_id])
+            self._supply_centers = views
+        return self._supply_centers
+
+    def _append_units(self, views, owners, types, locations, prefix: str) -> None:
+        for province_id, owner in enumerate(owners):
+            if owner != NONE:
+                unit = f"{prefix}{UNIT_TYPES[types[province_id]]} {self.index.locations[locations[province_id]]}"
+                views[self.index.powers[owner]].append(unit)
 
     def get_units(self, power: str) -> List[str]:
         """Returns the units for a given power."""
         return self.units.get(power, [])
+
+    # --- array-backed lookups ---
+    def unit_at(self, province: str) -> Optional[Tuple[str, str, str]]:
+        """(power, unit type, location) of the unit in ``province``, or None."""
+        province_id = self.index.province_ids.get(province.upper().split("/")[0])
+        if province_id is None or self.unit_owner[province_id] == NONE:
+            return None
+        return (
+            self.index.powers[self.unit_owner[province_id]],
+            UNIT_TYPES[self.unit_type[province_id]],
+            self.index.locations[self.unit_location[province_id]],
+        )
+
+    def center_owner(self, province: str) -> Optional[str]:
+        province_id = self.index.province_ids.get(province.upper().split("/")[0])
+        if province_id is None or self.sc_owner[province_id] == NONE:
+            return None
+        return self.index.powers[self.sc_owner[province_id]]
+
+    def unit_locations(self, power: str) -> List[Tuple[str, str]]:
+        """(unit type, location) for every non-dislodged unit of ``power``."""
+        return self._locations(power, self.unit_owner, self.unit_type, self.unit_location)
+
+    def dislodged_locations(self, power: str) -> List[Tuple[str, str]]:
+        """(unit type, location) for every dislodged unit of ``power`` (retreat phases)."""
+        return self._locations(power, self.dislodged_owner, self.dislodged_type, self.dislodged_location)
+
+    def _locations(self, power: str, owners, types, locations) -> List[Tuple[str, str]]:
+        power_id = self.index.power_ids.get(power.upper())
+        if power_id is None:
+            return []
+        return [
+            (UNIT_TYPES[types[i]], self.index.locations[locations[i]])
+            for i, owner in enumerate(owners)
+            if owner == power_id
+        ]
+
+    def center_counts(self) -> Dict[str, int]:
+        counts = {power: 0 for power in self.index.powers}
+        for owner in self.sc_owner:
+            if owner != NONE:
+                counts[self.index.powers[owner]] += 1
+        return counts
+
+    # --- diffs ---
+    def diff_units(self, other: "BoardState") -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """
+        Units present here but not in ``other`` (lost) and vice versa (gained),
+        as ``(power, unit string)`` pairs.
+        """
+        if other.index is not self.index:
+            return self._diff_unit_strings(other)
+
+        lost: List[Tuple[str, str]] = []
+        gained: List[Tuple[str, str]] = []
+        for prefix, arrays in (
+            ("", ("unit_owner", "unit_type", "unit_location")),
+            ("*", ("dislodged_owner", "dislodged_type", "dislodged_location")),
+        ):
+            owner_a, type_a, loc_a = (getattr(self, name) for name in arrays)
+            owner_b, type_b, loc_b = (getattr(other, name) for name in arrays)
+            changed = set(_differing(owner_a, owner_b))
+            changed.update(_differing(type_a, type_b), _differing(loc_a, loc_b))
+            for i in sorted(changed):
+                if owner_a[i] != NONE:
+                    lost.append(self._unit_entry(prefix, owner_a[i], type_a[i], loc_a[i]))
+                if owner_b[i] != NONE:
+                    gained.append(self._unit_entry(prefix, owner_b[i], type_b[i], loc_b[i]))
+        return lost, gained
+
+    def _unit_entry(self, prefix: str, owner: int, unit_type: int, location: int) -> Tuple[str, str]:
+        return (
+            self.index.powers[owner],
+            f"{prefix}{UNIT_TYPES[unit_type]} {self.index.locations[location]}",
+        )
+
+    def _diff_unit_strings(self, other: "BoardState") -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        mine = {(p, u) for p, us in self.units.items() for u in us}
+        theirs = {(p, u) for p, us in other.units.items() for u in us}
+        return sorted(mine - theirs), sorted(theirs - mine)
+
+    def center_changes(self, other: "BoardState") -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """``(center, previous owner, new owner)`` for every center whose owner differs in ``other``."""
+        if other.index is not self.index:
+            mine = {c: p for p, cs in self.supply_centers.items() for c in cs}
+            theirs = {c: p for p, cs in other.supply_centers.items() for c in cs}
+            return [
+                (c, mine.get(c), theirs.get(c))
+                for c in sorted(mine.keys() | theirs.keys())
+                if mine.get(c) != theirs.get(c)
+            ]
+
+        powers = self.index.powers
+        return [
+            (
+                self.index.provinces[i],
+                powers[self.sc_owner[i]] if self.sc_owner[i] != NONE else None,
+                powers[other.sc_owner[i]] if other.sc_owner[i] != NONE else None,
+            )
+            for i in _differing(self.sc_owner, other.sc_owner)
+        ]
+
+    # --- hashing ---
+    def fingerprint(self) -> bytes:
+        """Byte image of every ownership array; equal boards on the same map share it."""
+        if self._fingerprint is None:
+            self._fingerprint = b"".join(
+                a.tobytes()
+                for a in (
+                    self.unit_owner,
+                    self.unit_type,
+                    self.unit_location,
+                    self.dislodged_owner,
+                    self.dislodged_type,
+                    self.dislodged_location,
+                    self.sc_owner,
+                )
+            )
+        return self._fingerprint
+
+    def _canonical(self) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+        """Index-independent form of the position: sorted (power, sorted units/centers) pairs."""
+        return tuple(
+            (f"{kind}:{power}", tuple(sorted(items)))
+            for kind, views in (("units", self.units), ("centers", self.supply_centers))
+            for power, items in sorted(views.items())
+            if items
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BoardState):
+            return NotImplemented
+        if other.index is self.index:
+            return self.fingerprint() == other.fingerprint()
+        return self._canonical() == other._canonical()
+
+    # The arrays are mutable, so boards are not hashable; key caches on ``fingerprint()`` instead.
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"BoardState(units={self.units!r}, supply_centers={self.supply_centers!r})"
@@ -4,17 +4,27 @@ Core domain models for game history.
 
 from __future__ import annotations
 
+import heapq
 import logging
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .inbox import Inboxes
+from .reply_tracker import PendingMessage, ReplyTracker
 
 if TYPE_CHECKING:
     from ai_diplomacy.domain import Message
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["Message", "Phase", "GameHistory"]
+__all__ = ["Message", "Phase", "GameHistory", "HistoryObserver", "BROADCAST_RECIPIENTS"]
+
+# Called with (event, payload) after every GameHistory mutation; see GameHistory.add_observer.
+HistoryObserver = Callable[[str, Dict[str, Any]], None]
+
+# Recipients that address every power at once.
+BROADCAST_RECIPIENTS = ("GLOBAL", "ALL")
 
 
 @dataclass
@@ -34,81 +44,347 @@ class Phase:
     phase_summaries: Dict[str, str] = field(default_factory=dict)
     experience_updates: Dict[str, str] = field(default_factory=dict)
 
+    # Message indexes: positions into ``messages``, in send order. Messages appended
+    # to ``messages`` directly are picked up on the next query.
+    _by_sender: Dict[str, List[int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_recipient: Dict[str, List[int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _broadcasts: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    _indexed: int = field(default=0, init=False, repr=False, compare=False)
+
+    # Bumped by every mutation made through Phase/GameHistory methods; lets
+    # renderers cache text per phase (see history_interpreter).
+    revision: int = field(default=0, init=False, repr=False, compare=False)
+    _render_cache: Dict[Any, Tuple[Any, str]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def cache_token(self) -> Tuple[int, int]:
+        """Changes whenever the phase's contents do (including direct message appends)."""
+        return (self.revision, len(self.messages))
+
+    def cached_render(self, key: Any, render: Callable[["Phase"], str]) -> str:
+        """Returns ``render(self)``, reusing the last result for ``key`` while the phase is unchanged."""
+        token = self.cache_token
+        cached = self._render_cache.get(key)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+        text = render(self)
+        self._render_cache[key] = (token, text)
+        return text
+
     def add_plan(self, power_name: str, plan: str):
         self.plans[power_name] = plan
+        self.revision += 1
 
-    def add_message(self, sender: str, recipient: str, content: str):
-        self.messages.append(Message(sender=sender, recipient=recipient, content=content))
+    def add_message(self, sender: str, recipient: str, content: str) -> Message:
+        message = Message(sender=sender, recipient=recipient, content=content)
+        self.messages.append(message)
+        self._sync_index()
+        self.revision += 1
+        return message
 
     def add_orders(self, power: str, orders: List[str], results: List[List[str]]):
         self.orders_by_power[power].extend(orders)
         if len(results) < len(orders):
             results.extend([[] for _ in range(len(orders) - len(results))])
         self.results_by_power[power].extend(results)
+        self.revision += 1
+
+    # --- indexed queries ---
+    def messages_from(self, sender: str) -> List[Message]:
+        """Messages sent by ``sender`` (any recipient), in send order."""
+        return self._select(self._index()[0].get(sender, ()))
+
+    def messages_to(self, recipient: str) -> List[Message]:
+        """Messages addressed to ``recipient`` by name, in send order (broadcasts excluded)."""
+        return self._select(self._index()[1].get(recipient, ()))
+
+    def broadcasts(self) -> List[Message]:
+        """Messages addressed to GLOBAL/ALL, in send order."""
+        return self._select(self._index()[2])
+
+    def global_messages(self) -> List[Message]:
+        """Messages addressed to GLOBAL, in send order."""
+        return [m for m in self.broadcasts() if m.recipient == "GLOBAL"]
+
+    def conversations(self, power_name: str) -> Dict[str, List[Message]]:
+        """
+        Private conversations of ``power_name``: counterpart -> messages either way,
+        ordered by each counterpart's first message. Messages the power sent to "ALL"
+        appear under "ALL", as the prompt history has always shown them.
+        """
+        by_sender, by_recipient, _ = self._index()
+        sent = (i for i in by_sender.get(power_name, ()) if self.messages[i].recipient != "GLOBAL")
+        received = (i for i in by_recipient.get(power_name, ()) if self.messages[i].sender != power_name)
+        conversations: Dict[str, List[Message]] = {}
+        for position in heapq.merge(sent, received):
+            message = self.messages[position]
+            other = message.recipient if message.sender == power_name else message.sender
+            conversations.setdefault(other, []).append(message)
+        return conversations
+
+    def messages_for(self, power_name: str) -> List[Tuple[int, Message]]:
+        """(position, message) for messages others sent to ``power_name`` or to GLOBAL."""
+        _, by_recipient, broadcasts = self._index()
+        global_positions = (i for i in broadcasts if self.messages[i].recipient == "GLOBAL")
+        return [
+            (i, self.messages[i])
+            for i in heapq.merge(by_recipient.get(power_name, ()), global_positions)
+            if self.messages[i].sender != power_name
+        ]
+
+    def _select(self, positions) -> List[Message]:
+        return [self.messages[i] for i in positions]
+
+    def _index(self) -> Tuple[Dict[str, List[int]], Dict[str, List[int]], List[int]]:
+        if self._indexed != len(self.messages):
+            self._sync_index()
+        return self._by_sender, self._by_recipient, self._broadcasts
+
+    def _sync_index(self) -> None:
+        if self._indexed > len(self.messages):
+            # ``messages`` was replaced or truncated; rebuild from scratch.
+            self._by_sender, self._by_recipient, self._broadcasts, self._indexed = {}, {}, [], 0
+        for position in range(self._indexed, len(self.messages)):
+            message = self.messages[position]
+            self._by_sender.setdefault(message.sender, []).append(position)
+            if message.recipient in BROADCAST_RECIPIENTS:
+                self._broadcasts.append(position)
+            else:
+                self._by_recipient.setdefault(message.recipient, []).append(position)
+        self._indexed = len(self.messages)
 
 
 @dataclass
 class GameHistory:
     phases: List[Phase] = field(default_factory=list)
+    # Recent inbound messages kept per power, and how many phases back they count as recent.
+    inbox_size: int = 50
+    inbox_phase_window: int = 2
+
+    # phase name -> phases with that name, in order. Phases appended to ``phases``
+    # directly are picked up on the next lookup.
+    _phases_by_name: Dict[str, List[Phase]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed: int = field(default=0, init=False, repr=False, compare=False)
+    _positions: Dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # power -> phase position -> (phase name, orders), kept in phase order; fed by add_orders.
+    _orders_index: Dict[str, Dict[int, Tuple[str, List[str]]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Unanswered private messages; fed by add_message (see reply_tracker).
+    reply_tracker: ReplyTracker = field(
+        default_factory=lambda: ReplyTracker(BROADCAST_RECIPIENTS), init=False, repr=False, compare=False
+    )
+    inboxes: Inboxes = field(init=False, repr=False, compare=False)
+    # phase position -> messages recorded in ``inboxes``; a mismatch means messages
+    # bypassed add_message and the inboxes cannot answer for that phase.
+    _inbox_counts: Dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _inbox_in_order: bool = field(default=True, init=False, repr=False, compare=False)
+    _observers: List[HistoryObserver] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.inboxes = Inboxes(self.inbox_size, self.inbox_phase_window)
+
+    def add_observer(self, observer: HistoryObserver) -> None:
+        """
+        Registers ``observer`` to be called after each successful mutation with an
+        event name ("phase", "plan", "message", "orders", "results", "summary",
+        "experience") and the arguments of the call as a dict.
+        """
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: HistoryObserver) -> None:
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+    def _notify(self, event: str, **payload: Any) -> None:
+        for observer in self._observers:
+            try:
+                observer(event, payload)
+            except Exception as e:
+                logger.error(f"History observer failed on {event} event: {e}", exc_info=True)
 
     def add_phase(self, phase_name: str):
         if not self.phases or self.phases[-1].name != phase_name:
             self.phases.append(Phase(name=phase_name))
+            self._sync_index()
+            self.inboxes.prune(len(self.phases) - self.inbox_phase_window)
+            self._notify("phase", phase=phase_name)
             logger.debug(f"Added new phase: {phase_name}")
         else:
             logger.warning(f"Phase {phase_name} already exists. Not adding again.")
 
     def _get_phase(self, phase_name: str) -> Optional[Phase]:
-        for phase in reversed(self.phases):
-            if phase.name == phase_name:
-                return phase
+        """Returns the most recent phase called ``phase_name``."""
+        phases = self._phase_index().get(phase_name)
+        if phases:
+            return phases[-1]
         logger.error(f"Phase {phase_name} not found in history.")
         return None
 
     def get_phase_by_name(self, phase_name_to_find: str) -> Optional[Phase]:
         """Finds and returns a phase by its exact name."""
-        for phase in self.phases:
-            if phase.name == phase_name_to_find:
-                return phase
-        return None
+        phases = self._phase_index().get(phase_name_to_find)
+        return phases[0] if phases else None
+
+    def _phase_index(self) -> Dict[str, List[Phase]]:
+        if self._indexed != len(self.phases):
+            self._sync_index()
+        return self._phases_by_name
+
+    def _sync_index(self) -> None:
+        if self._indexed > len(self.phases):
+            self._phases_by_name, self._positions, self._orders_index, self._indexed = {}, {}, {}, 0
+        for position in range(self._indexed, len(self.phases)):
+            phase = self.phases[position]
+            self._phases_by_name.setdefault(phase.name, []).append(phase)
+            self._positions[id(phase)] = position
+            for power_name in phase.orders_by_power:
+                self._index_orders(position, phase, power_name)
+        self._indexed = len(self.phases)
+
+    def _index_orders(self, position: int, phase: Phase, power_name: str) -> None:
+        entries = self._orders_index.setdefault(power_name, {})
+        out_of_order = position not in entries and entries and position < next(reversed(entries))
+        entries[position] = (phase.name, phase.orders_by_power[power_name])  # replaces a stale entry
+        if out_of_order:
+            self._orders_index[power_name] = dict(sorted(entries.items()))
+
+    def _position_of(self, phase: Phase) -> int:
+        self._phase_index()
+        return self._positions[id(phase)]
+
+    def rebuild_reply_tracker(self) -> None:
+        """
+        Re-derives ``reply_tracker`` and the inboxes from every phase's messages.
+        Needed only after phases or messages were added without going through
+        ``add_message`` (``from_dict`` calls it).
+        """
+        self.reply_tracker = ReplyTracker(BROADCAST_RECIPIENTS)
+        self.inboxes = Inboxes(self.inbox_size, self.inbox_phase_window)
+        self._inbox_counts, self._inbox_in_order = {}, True
+        for position, phase in enumerate(self.phases):
+            for msg in phase.messages:
+                self.reply_tracker.record(position, phase.name, msg.sender, msg.recipient, msg.content)
+                self._record_inbound(position, phase.name, msg.sender, msg.recipient, msg.content, replay=True)
+        self.inboxes.prune(len(self.phases) - self.inbox_phase_window)
+
+    def _record_inbound(
+        self, position: int, phase_name: str, sender: str, recipient: str, content: str, replay: bool = False
+    ) -> None:
+        if not replay and position != len(self.phases) - 1:
+            # The inboxes assume arrival order == history order.
+            self._inbox_in_order = False
+        self.inboxes.record(position, phase_name, sender, recipient, content)
+        self._inbox_counts[position] = self._inbox_counts.get(position, 0) + 1
+
+    def get_recent_messages_to(self, power_name: str, limit: int = 3) -> List[Dict[str, str]]:
+        """
+        The last ``limit`` messages others sent to ``power_name`` or to GLOBAL during
+        the last ``inbox_phase_window`` phases, oldest first, as
+        ``{"sender", "content", "phase"}`` dicts.
+        """
+        window = range(len(self.phases))[-self.inbox_phase_window :] if self.inbox_phase_window > 0 else range(0)
+        if not window:
+            return []
+        entries = None
+        if self._inbox_in_order and all(
+            self._inbox_counts.get(p, 0) == len(self.phases[p].messages) for p in window
+        ):
+            entries = self.inboxes.recent(power_name, limit, window.start)
+        if entries is not None:
+            return [entry.as_dict() for entry in entries]
+
+        # Exact fallback: walk the window's message indexes.
+        found = [
+            {"sender": msg.sender, "content": msg.content, "phase": self.phases[p].name}
+            for p in window
+            for _, msg in self.phases[p].messages_for(power_name)
+        ]
+        return found[-limit:] if found else []
 
     def add_plan(self, phase_name: str, power_name: str, plan: str):
         phase = self._get_phase(phase_name)
         if phase:
             phase.plans[power_name] = plan
+            phase.revision += 1
+            self._notify("plan", phase=phase_name, power=power_name, plan=plan)
             logger.debug(f"Added plan for {power_name} in {phase_name}")
 
     def add_message(self, phase_name: str, sender: str, recipient: str, message_content: str):
         phase = self._get_phase(phase_name)
         if phase:
-            message = Message(sender=sender, recipient=recipient, content=message_content)
-            phase.messages.append(message)
+            phase.add_message(sender, recipient, message_content)
+            position = self._position_of(phase)
+            self.reply_tracker.record(position, phase.name, sender, recipient, message_content)
+            self._record_inbound(position, phase.name, sender, recipient, message_content)
+            self._notify("message", phase=phase_name, sender=sender, recipient=recipient, content=message_content)
             logger.debug(f"Added message from {sender} to {recipient} in {phase_name}")
 
     def add_orders(self, phase_name: str, power_name: str, orders: List[str]):
         phase = self._get_phase(phase_name)
         if phase:
             phase.orders_by_power[power_name].extend(orders)
+            phase.revision += 1
+            self._index_orders(self._position_of(phase), phase, power_name)
+            self._notify("orders", phase=phase_name, power=power_name, orders=orders)
             logger.debug(f"Added orders for {power_name} in {phase_name}: {orders}")
 
     def add_results(self, phase_name: str, power_name: str, results: List[List[str]]):
         phase = self._get_phase(phase_name)
         if phase:
             phase.results_by_power[power_name].extend(results)
+            phase.revision += 1
+            self._notify("results", phase=phase_name, power=power_name, results=results)
             logger.debug(f"Added results for {power_name} in {phase_name}: {results}")
 
     def add_phase_summary(self, phase_name: str, power_name: str, summary: str):
         phase = self._get_phase(phase_name)
         if phase:
             phase.phase_summaries[power_name] = summary
+            phase.revision += 1
+            self._notify("summary", phase=phase_name, power=power_name, summary=summary)
             logger.debug(f"Added phase summary for {power_name} in {phase_name}")
 
     def add_experience_update(self, phase_name: str, power_name: str, update: str):
         phase = self._get_phase(phase_name)
         if phase:
             phase.experience_updates[power_name] = update
+            phase.revision += 1
+            self._notify("experience", phase=phase_name, power=power_name, update=update)
             logger.debug(f"Added experience update for {power_name} in {phase_name}")
 
+    def get_orders_by_power(self, power_name: str) -> List[Tuple[str, List[str]]]:
+        """(phase name, orders) for every phase in which ``power_name`` has orders, in phase order."""
+        self._phase_index()
+        return list(self._orders_index.get(power_name, {}).values())
+
+    def get_messages_from(self, phase_name: str, sender: str) -> List[Message]:
+        phase = self.get_phase_by_name(phase_name)
+        return phase.messages_from(sender) if phase else []
+
+    def get_messages_to(self, phase_name: str, recipient: str) -> List[Message]:
+        phase = self.get_phase_by_name(phase_name)
+        return phase.messages_to(recipient) if phase else []
+
+    def get_broadcasts(self, phase_name: str) -> List[Message]:
+        phase = self.get_phase_by_name(phase_name)
+        return phase.broadcasts() if phase else []
+
+    def get_ignored_messages(self, sender: str, num_phases: int = 3) -> Dict[str, List[PendingMessage]]:
+        """recipient -> private messages ``sender`` sent in the last ``num_phases`` phases that got no reply."""
+        first, last = self._window(num_phases)
+        return self.reply_tracker.ignored_by(sender, first, last)
+
+    def get_messages_awaiting_reply(self, power_name: str, num_phases: int = 3) -> Dict[str, List[PendingMessage]]:
+        """sender -> private messages to ``power_name`` in the last ``num_phases`` phases it has not answered."""
+        first, last = self._window(num_phases)
+        return self.reply_tracker.awaiting_reply(power_name, first, last)
+
+    def _window(self, num_phases: int) -> Tuple[int, int]:
+        # Same positions as ``self.phases[-num_phases:]``.
+        window = range(len(self.phases))[-num_phases:]
+        return (window.start, window.stop - 1) if window else (0, -1)
+
     def get_strategic_directives(self) -> Dict[str, str]:
         if not self.phases:
             return {}
@@ -148,4 +424,24 @@ class GameHistory:
                 }
                 for phase in self.phases
             ]
-        } 
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameHistory":
+        """Inverse of ``to_dict``."""
+        history = cls()
+        for phase_data in data.get("phases", []):
+            phase = Phase(
+                name=phase_data["name"],
+                plans=dict(phase_data.get("plans", {})),
+                messages=[Message(**msg) for msg in phase_data.get("messages", [])],
+                phase_summaries=dict(phase_data.get("phase_summaries", {})),
+                experience_updates=dict(phase_data.get("experience_updates", {})),
+            )
+            for power, orders in phase_data.get("orders_by_power", {}).items():
+                phase.orders_by_power[power].extend(orders)
+            for power, results in phase_data.get("results_by_power", {}).items():
+                phase.results_by_power[power].extend(results)
+            history.phases.append(phase)
+        history.rebuild_reply_tracker()
+        return history
@@ -0,0 +1,191 @@
+"""
+Append-only JSONL journal for ``GameHistory``.
+
+``GameHistory.to_dict()`` serializes the whole game, so checkpointing it after
+every phase gets slower as the game grows. ``HistoryJournal`` instead observes a
+history and appends one ``ujson`` line per mutation, so each save costs only the
+size of the change. ``load_history`` rebuilds a ``GameHistory`` by replaying a
+journal; ``compact_journal`` rewrites a finished game's journal as a single
+snapshot document, which ``load_history`` also understands.
+
+Record format (one JSON object per line)::
+
+    {"event": "phase", "phase": "S1901M"}
+    {"event": "message", "phase": "S1901M", "sender": ..., "recipient": ..., "content": ...}
+    {"event": "orders" | "results" | "plan" | "summary" | "experience", "phase": ..., "power": ..., ...}
+    {"event": "snapshot", "history": {...GameHistory.to_dict()...}}
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional, Union
+
+import ujson
+
+from .history import GameHistory
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["HistoryJournal", "iter_journal", "load_history", "compact_journal"]
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class HistoryJournal:
+    """
+    Streams the mutations of one ``GameHistory`` to a JSONL file.
+
+    Usage::
+
+        with HistoryJournal("game.jsonl") as journal:
+            journal.attach(history)
+            ... play ...
+
+    Lines are flushed as they are written; pass ``fsync=True`` to also force them
+    to disk (slower, survives power loss rather than just process crashes).
+    """
+
+    def __init__(self, path: PathLike, fsync: bool = False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self.records_written = 0
+        self._file: Optional[IO[str]] = None
+        self._history: Optional[GameHistory] = None
+
+    def open(self) -> "HistoryJournal":
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._drop_torn_tail()
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def _drop_torn_tail(self) -> None:
+        """Cuts a final line left without its newline by a crash, so new records do not join it."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            data = f.read()  # only after a crash; a clean journal is never read here
+            logger.warning(f"Dropping torn final journal record in {self.path}")
+            f.truncate(data.rfind(b"\n") + 1)
+
+    def attach(self, history: GameHistory, write_existing: bool = True) -> None:
+        """
+        Starts journaling ``history``. With ``write_existing`` (the default) and an
+        empty journal file, the history's current contents are written first as a
+        snapshot so the journal is self-contained.
+        """
+        self.open()
+        if self._history is not None:
+            self.detach()
+        if write_existing and history.phases and self._file.tell() == 0:
+            self.write("snapshot", {"history": history.to_dict()})
+        history.add_observer(self.write)
+        self._history = history
+
+    def detach(self) -> None:
+        if self._history is not None:
+            self._history.remove_observer(self.write)
+            self._history = None
+
+    def write(self, event: str, payload: Dict[str, Any]) -> None:
+        """Appends one record. Also usable directly as a ``HistoryObserver``."""
+        self.open()
+        record = {"event": event}
+        record.update(payload)
+        self._file.write(ujson.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.records_written += 1
+
+    def close(self) -> None:
+        self.detach()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "HistoryJournal":
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def iter_journal(path: PathLike) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the journal's records.
+
+    Only the final record may be unreadable: that is a line torn by a crash
+    mid-write, and it is skipped with a warning. An unreadable record followed
+    by others means the journal is corrupt, and raises ``ValueError``.
+    """
+    unreadable: Optional[int] = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            if unreadable is not None:
+                raise ValueError(f"Corrupt journal record at {path}:{unreadable} (not the final line)")
+            try:
+                record = ujson.loads(line)
+            except ValueError:
+                unreadable = line_no
+                continue
+            yield record
+    if unreadable is not None:
+        logger.warning(f"Skipping torn final journal record at {path}:{unreadable}")
+
+
+def load_history(path: PathLike) -> GameHistory:
+    """Rebuilds a ``GameHistory`` by replaying the journal at ``path``."""
+    history = GameHistory()
+    for record in iter_journal(path):
+        _apply(history, record)
+    return history
+
+
+def _apply(history: GameHistory, record: Dict[str, Any]) -> None:
+    event = record.get("event")
+    if event == "snapshot":
+        history.phases.extend(GameHistory.from_dict(record["history"]).phases)
+        history.rebuild_reply_tracker()
+    elif event == "phase":
+        history.add_phase(record["phase"])
+    elif event == "message":
+        history.add_message(record["phase"], record["sender"], record["recipient"], record["content"])
+    elif event == "orders":
+        history.add_orders(record["phase"], record["power"], record["orders"])
+    elif event == "results":
+        history.add_results(record["phase"], record["power"], record["results"])
+    elif event == "plan":
+        history.add_plan(record["phase"], record["power"], record["plan"])
+    elif event == "summary":
+        history.add_phase_summary(record["phase"], record["power"], record["summary"])
+    elif event == "experience":
+        history.add_experience_update(record["phase"], record["power"], record["update"])
+    else:
+        logger.warning(f"Ignoring unknown journal event {event!r}")
+
+
+def compact_journal(path: PathLike, output_path: Optional[PathLike] = None) -> GameHistory:
+    """
+    Replays the journal at ``path`` and rewrites it (or writes ``output_path``) as a
+    single snapshot record. The rewrite goes through a temporary file and
+    ``os.replace`` so a crash never leaves a half-written journal behind.
+    """
+    history = load_history(path)
+    target = Path(output_path) if output_path is not None else Path(path)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(ujson.dumps({"event": "snapshot", "history": history.to_dict()}, ensure_ascii=False))
+        f.write("\n")
+    os.replace(tmp, target)
+    return history
@@ -0,0 +1,101 @@
+"""
+Bounded per-power inboxes of recent inbound messages.
+
+``GameHistory.add_message`` appends each private message to its recipient's
+deque and each GLOBAL broadcast to one shared deque, stamping every entry with a
+global sequence number. Reading a power's most recent inbound traffic then walks
+the two deques from the right and merges them by sequence number, which costs
+O(limit) regardless of how many messages the game has produced.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+__all__ = ["InboxEntry", "Inboxes"]
+
+
+@dataclass(frozen=True)
+class InboxEntry:
+    seq: int
+    position: int  # index of the phase in GameHistory.phases
+    phase: str
+    sender: str
+    content: str
+
+    def as_dict(self) -> Dict[str, str]:
+        return {"sender": self.sender, "content": self.content, "phase": self.phase}
+
+
+class Inboxes:
+    """
+    Per-power deques of private messages plus a shared deque of GLOBAL broadcasts.
+
+    Each deque keeps at most ``size`` entries; entries from phases that have left
+    the ``phase_window`` are dropped by ``prune``.
+    """
+
+    def __init__(self, size: int = 50, phase_window: int = 2):
+        self.size = size
+        self.phase_window = phase_window
+        self._private: Dict[str, Deque[InboxEntry]] = {}
+        self._global: Deque[InboxEntry] = deque(maxlen=size)
+        self._seq = 0
+
+    def record(self, position: int, phase: str, sender: str, recipient: str, content: str) -> None:
+        if recipient == "GLOBAL":
+            target = self._global
+        elif recipient != sender:
+            target = self._private.get(recipient)
+            if target is None:
+                target = self._private[recipient] = deque(maxlen=self.size)
+        else:
+            return
+        target.append(InboxEntry(self._seq, position, phase, sender, content))
+        self._seq += 1
+
+    def prune(self, min_position: int) -> None:
+        """Drops entries from phases before ``min_position``."""
+        for inbox in (self._global, *self._private.values()):
+            while inbox and inbox[0].position < min_position:
+                inbox.popleft()
+
+    def recent(self, power: str, limit: int, min_position: int) -> Optional[List[InboxEntry]]:
+        """
+        The last ``limit`` messages others sent to ``power`` or to GLOBAL from
+        phases at or after ``min_position``, oldest first. Returns None when the
+        deques cannot answer exactly (an inbox overflowed inside the window, or
+        ``limit`` exceeds the inbox size); callers then scan the history instead.
+        """
+        if limit <= 0 or limit > self.size:
+            return None
+        private = self._private.get(power, ())
+        shared = self._global
+        i, j = len(private) - 1, len(shared) - 1
+        picked: List[InboxEntry] = []
+        while len(picked) < limit:
+            while j >= 0 and shared[j].sender == power:
+                j -= 1
+            # A deque that is used up may have dropped older entries still inside the window.
+            if (i < 0 and self._may_have_dropped(private, min_position)) or (
+                j < 0 and self._may_have_dropped(shared, min_position)
+            ):
+                return None
+            a = private[i] if i >= 0 else None
+            b = shared[j] if j >= 0 else None
+            if a is not None and (b is None or a.seq > b.seq):
+                entry, i = a, i - 1
+            elif b is not None:
+                entry, j = b, j - 1
+            else:
+                break
+            if entry.position < min_position:
+                break
+            picked.append(entry)
+        picked.reverse()
+        return picked
+
+    def _may_have_dropped(self, inbox, min_position: int) -> bool:
+        return len(inbox) == self.size and inbox[0].position >= min_position
@@ -1,20 +1,28 @@
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
 
 if TYPE_CHECKING:
     from .board import BoardState
     from .game_history import PhaseHistory
+    from .possible_orders import PossibleOrdersIndex
 
 
 @dataclass(frozen=True)
 class PhaseKey:
-    """A unique key for a phase in a game."""
+    """
+    A unique key for a phase in a game.
 
-    state: dict[str, Any]
-    scs: dict[str, int]
+    Equality and hashing use only the phase coordinates and ``position_hash``, the
+    64-bit Zobrist hash of the position (see ``zobrist``); the raw ``state`` and
+    ``scs`` dicts are carried along for display but do not take part.
+    """
+
+    state: dict[str, Any] = field(compare=False)
+    scs: dict[str, Any] = field(compare=False)
     year: int
     season: str
     name: str  # alias for 'phase'
+    position_hash: int = 0
 
 
 @dataclass(frozen=True)
@@ -24,6 +32,7 @@ class PhaseState:
     key: PhaseKey
     board: "BoardState"
     history: list["PhaseHistory"]  # optional
+    possible_orders: Optional["PossibleOrdersIndex"] = None  # shared per-phase index
 
     # --- compatibility shims ---
     @property
@@ -0,0 +1,107 @@
+"""
+Indexed view of the engine's legal orders for one phase.
+
+``diplomacy.Game.get_all_possible_orders()`` is the most expensive call the
+adjudicator makes. ``PossibleOrdersIndex`` calls it once and keeps the result in
+shapes that answer the questions validation, prompts and agents actually ask:
+"is this order legal for this power?" and "what can the unit at X do?".
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from .snapshot_cache import SNAPSHOT_CACHE
+
+__all__ = ["PossibleOrdersIndex", "normalize_order", "possible_orders_for"]
+
+
+@dataclass(frozen=True)
+class PossibleOrdersIndex:
+    """
+    Legal orders for every power in one phase.
+
+    Attributes:
+        by_power: power -> frozenset of legal order strings.
+        by_location: orderable location (e.g. "PAR", "STP", "STP/SC") -> legal orders
+            in engine order.
+        by_unit: unit string (e.g. "A PAR", "F STP/SC") -> legal orders for that unit.
+            Adjustment-phase orders such as "WAIVE" have no unit and only appear in
+            ``by_location``.
+        orderable_locations: power -> locations that power may order this phase.
+    """
+
+    by_power: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    by_location: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    by_unit: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    orderable_locations: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def from_game(cls, game: Any) -> "PossibleOrdersIndex":
+        """Builds the index with a single ``get_all_possible_orders()`` engine call."""
+        all_orders: Dict[str, List[str]] = game.get_all_possible_orders()
+
+        if hasattr(game, "get_orderable_locations"):
+            orderable = game.get_orderable_locations()
+        else:
+            # Minimal fallback for games that only expose their powers' units.
+            orderable = {
+                name: [str(unit).split()[-1] for unit in power.units] for name, power in game.powers.items()
+            }
+
+        by_location = {loc: tuple(orders) for loc, orders in all_orders.items()}
+
+        # Coasted units are listed under both "STP" and "STP/SC"; the dict keeps one copy.
+        by_unit: Dict[str, Dict[str, None]] = {}
+        for orders in by_location.values():
+            for order in orders:
+                parts = order.split()
+                if len(parts) >= 3 and parts[0] in ("A", "F"):
+                    by_unit.setdefault(f"{parts[0]} {parts[1]}", {})[order] = None
+
+        by_power: Dict[str, FrozenSet[str]] = {}
+        for power, locations in orderable.items():
+            power_orders = set()
+            for loc in locations:
+                power_orders.update(by_location.get(loc, ()))
+            by_power[power] = frozenset(power_orders)
+
+        return cls(
+            by_power=by_power,
+            by_location=by_location,
+            by_unit={unit: tuple(orders) for unit, orders in by_unit.items()},
+            orderable_locations={power: tuple(locs) for power, locs in orderable.items()},
+        )
+
+    def orders_for_power(self, power: str) -> FrozenSet[str]:
+        return self.by_power.get(power, frozenset())
+
+    def orders_for_location(self, location: str) -> Tuple[str, ...]:
+        return self.by_location.get(location, ())
+
+    def orders_for_unit(self, unit: str) -> Tuple[str, ...]:
+        return self.by_unit.get(unit, ())
+
+    def is_valid(self, power: str, order: str) -> bool:
+        return order in self.by_power.get(power, ())
+
+    def as_power_dict(self) -> Dict[str, List[str]]:
+        """power -> list of legal orders, grouped by location in engine order."""
+        return {
+            power: [order for loc in locations for order in self.by_location.get(loc, ())]
+            for power, locations in self.orderable_locations.items()
+        }
+
+
+def possible_orders_for(game: Any) -> PossibleOrdersIndex:
+    """Returns the shared, per-phase ``PossibleOrdersIndex`` for ``game``."""
+    return SNAPSHOT_CACHE.get(game, "possible_orders", PossibleOrdersIndex.from_game)
+
+
+def normalize_order(order: str) -> str:
+    """
+    ``order`` in the index's spelling: upper case, single spaces, and spaces
+    around move dashes ("a par-bur" -> "A PAR - BUR"), as the engine parses it.
+    """
+    return " ".join(str(order).replace("-", " - ").upper().split())
@@ -0,0 +1,119 @@
+"""
+Tracks private messages that have not been answered yet.
+
+A private message from A to B counts as answered when B sends A a private
+message, or B sends a broadcast that mentions A, in the same phase or the next
+one (the rule ``get_ignored_messages_by_power`` has always applied). The tracker
+is fed one message at a time by ``GameHistory.add_message`` and keeps the
+outstanding messages grouped by sender, by recipient and by phase, so "who is
+ignoring me?" and "what do I still owe a reply to?" cost O(phases in window +
+result).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set, Tuple
+
+__all__ = ["ReplyTracker", "PendingMessage"]
+
+
+@dataclass(frozen=True)
+class PendingMessage:
+    """A private message that has not been answered (yet)."""
+
+    entry_id: int
+    position: int  # index of the phase in GameHistory.phases
+    phase: str
+    sender: str
+    recipient: str
+    content: str
+
+
+# power -> phase position -> entry id -> message (dicts keep send order)
+_Grouped = Dict[str, Dict[int, Dict[int, PendingMessage]]]
+
+
+class ReplyTracker:
+    """Outstanding private messages, indexed by sender, recipient and phase position."""
+
+    def __init__(self, broadcast_recipients: Iterable[str] = ("GLOBAL", "ALL")):
+        self.broadcast_recipients = frozenset(broadcast_recipients)
+        self._by_sender: _Grouped = {}
+        self._by_recipient: _Grouped = {}
+        # (position, responder, addressee) for every private message seen
+        self._replied: Set[Tuple[int, str, str]] = set()
+        # (position, sender) -> contents of that sender's broadcasts
+        self._broadcasts: Dict[Tuple[int, str], List[str]] = {}
+        self._next_id = 0
+
+    def record(self, position: int, phase: str, sender: str, recipient: str, content: str) -> None:
+        """Feeds one message, sent in the phase at ``position``, to the tracker."""
+        if recipient in self.broadcast_recipients:
+            self._broadcasts.setdefault((position, sender), []).append(content)
+            # A broadcast answers pending messages to its sender from every power it names.
+            for pending in self._pending_to(sender, (position - 1, position)):
+                if pending.sender in content:
+                    self._clear(pending)
+            return
+
+        # This message answers the recipient's pending messages to the sender...
+        for pending in self._pending_to(sender, (position - 1, position)):
+            if pending.sender == recipient:
+                self._clear(pending)
+        self._replied.add((position, sender, recipient))
+
+        # ...and may itself already be answered (a reply sent earlier in the same phase,
+        # or in the next phase when messages are recorded out of order).
+        if self._answered(position, sender, recipient):
+            return
+
+        pending = PendingMessage(self._next_id, position, phase, sender, recipient, content)
+        self._next_id += 1
+        self._by_sender.setdefault(sender, {}).setdefault(position, {})[pending.entry_id] = pending
+        self._by_recipient.setdefault(recipient, {}).setdefault(position, {})[pending.entry_id] = pending
+
+    def ignored_by(self, sender: str, first_position: int, last_position: int) -> Dict[str, List[PendingMessage]]:
+        """recipient -> ``sender``'s unanswered messages in phases ``first_position..last_position``."""
+        return self._collect(self._by_sender.get(sender, {}), first_position, last_position, "recipient")
+
+    def awaiting_reply(
+        self, recipient: str, first_position: int, last_position: int
+    ) -> Dict[str, List[PendingMessage]]:
+        """sender -> messages to ``recipient`` it has not answered, in phases ``first_position..last_position``."""
+        return self._collect(self._by_recipient.get(recipient, {}), first_position, last_position, "sender")
+
+    def _collect(
+        self, by_position: Dict[int, Dict[int, PendingMessage]], first: int, last: int, group_by: str
+    ) -> Dict[str, List[PendingMessage]]:
+        result: Dict[str, List[PendingMessage]] = {}
+        if len(by_position) < last - first + 1:
+            positions = sorted(p for p in by_position if first <= p <= last)
+        else:
+            positions = [p for p in range(first, last + 1) if p in by_position]
+        for position in positions:
+            for pending in by_position[position].values():
+                result.setdefault(getattr(pending, group_by), []).append(pending)
+        return result
+
+    def _answered(self, position: int, sender: str, recipient: str) -> bool:
+        for p in (position, position + 1):
+            if (p, recipient, sender) in self._replied:
+                return True
+            if any(sender in content for content in self._broadcasts.get((p, recipient), ())):
+                return True
+        return False
+
+    def _pending_to(self, recipient: str, positions: Iterable[int]) -> List[PendingMessage]:
+        by_position = self._by_recipient.get(recipient)
+        if not by_position:
+            return []
+        return [pending for p in positions for pending in by_position.get(p, {}).values()]
+
+    def _clear(self, pending: PendingMessage) -> None:
+        for grouped, power in ((self._by_sender, pending.sender), (self._by_recipient, pending.recipient)):
+            by_position = grouped[power]
+            entries = by_position[pending.position]
+            del entries[pending.entry_id]
+            if not entries:
+                del by_position[pending.position]
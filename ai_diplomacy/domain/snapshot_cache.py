@@ -0,0 +1,175 @@
+"""
+Per-phase cache of immutable game snapshots.
+
+Building a ``PhaseState`` walks the whole ``diplomacy.Game`` (and, for
+``PhaseState.from_game``, asks the engine for every possible order). Within a
+phase the answer never changes, so strategies, agents and the game manager can
+share a single snapshot. Entries are keyed by game identity and validated against
+the game's current phase and position hash, so ``game.process()`` invalidates
+them automatically. Snapshots that include submitted orders are requested with
+``depends_on_orders=True`` and are also checked against the game's current
+orders, so ``game.set_orders``/``clear_orders`` invalidate exactly those; the
+board and possible-orders snapshots survive order submission. Code that edits
+the position itself (units, centers) should call ``SNAPSHOT_CACHE.invalidate(game)``.
+
+The snapshots of the last superseded revision stay reachable through
+``previous()`` so builders can derive a new snapshot incrementally (e.g. the
+Zobrist position hash).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["SnapshotCacheStats", "PhaseSnapshotCache", "SNAPSHOT_CACHE"]
+
+T = TypeVar("T")
+
+
+@dataclass
+class SnapshotCacheStats:
+    """Hit/miss counters and cumulative rebuild time for one kind of snapshot."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    rebuild_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def merge(self, other: "SnapshotCacheStats") -> "SnapshotCacheStats":
+        return SnapshotCacheStats(
+            hits=self.hits + other.hits,
+            misses=self.misses + other.misses,
+            invalidations=self.invalidations + other.invalidations,
+            rebuild_seconds=self.rebuild_seconds + other.rebuild_seconds,
+        )
+
+
+@dataclass
+class _GameEntry:
+    # The game is held so its id() cannot be reused while the entry is alive.
+    game: Any
+    revision: Tuple[Hashable, ...]
+    snapshots: Dict[str, Any] = field(default_factory=dict)
+    previous: Dict[str, Any] = field(default_factory=dict)
+    # kind -> the game's orders when an order-dependent snapshot was built
+    orders: Dict[str, Tuple[Hashable, ...]] = field(default_factory=dict)
+
+
+class PhaseSnapshotCache:
+    """
+    Caches one snapshot per (game, kind) for the game's current phase.
+
+    ``kind`` distinguishes the different views built from the same game (e.g.
+    ``"phase"`` for ``game_to_phase`` and ``"phase_state"`` for
+    ``PhaseState.from_game``). Only the most recent ``max_games`` games are kept.
+    """
+
+    def __init__(self, max_games: int = 16):
+        self.max_games = max_games
+        self._entries: "OrderedDict[int, _GameEntry]" = OrderedDict()
+        self._stats: Dict[str, SnapshotCacheStats] = {}
+
+    @staticmethod
+    def revision(game: Any) -> Tuple[Hashable, ...]:
+        """The part of the game's identity that changes when ``game.process()`` runs."""
+        return (getattr(game, "phase", None), getattr(game, "zobrist_hash", None))
+
+    @staticmethod
+    def orders_revision(game: Any) -> Tuple[Hashable, ...]:
+        """The orders currently submitted to ``game``, as a comparable value."""
+        get_orders = getattr(game, "get_orders", None)
+        if get_orders is None:
+            return ()
+        return tuple(sorted((power, tuple(orders)) for power, orders in get_orders().items()))
+
+    def get(self, game: Any, kind: str, builder: Callable[[Any], T], *, depends_on_orders: bool = False) -> T:
+        """
+        Returns the cached ``kind`` snapshot of ``game``, building it on a miss.
+        With ``depends_on_orders`` the snapshot is also rebuilt when the game's
+        submitted orders have changed since it was built.
+        """
+        stats = self._stats.setdefault(kind, SnapshotCacheStats())
+        entry = self._entry_for(game)
+        orders = self.orders_revision(game) if depends_on_orders else None
+
+        if kind in entry.snapshots:
+            if not depends_on_orders or entry.orders.get(kind) == orders:
+                stats.hits += 1
+                return entry.snapshots[kind]
+            stats.invalidations += 1
+            entry.previous[kind] = entry.snapshots.pop(kind)
+
+        stats.misses += 1
+        start = time.perf_counter()
+        snapshot = builder(game)
+        stats.rebuild_seconds += time.perf_counter() - start
+        entry.snapshots[kind] = snapshot
+        if depends_on_orders:
+            entry.orders[kind] = orders
+        return snapshot
+
+    def invalidate(self, game: Any) -> None:
+        """Drops every snapshot of ``game`` (call after changing its position outside ``process()``)."""
+        entry = self._entries.pop(id(game), None)
+        if entry is not None and entry.game is game:
+            for kind in entry.snapshots:
+                self._stats.setdefault(kind, SnapshotCacheStats()).invalidations += 1
+            self._entries[id(game)] = _GameEntry(
+                game=game, revision=entry.revision, previous=entry.snapshots or entry.previous
+            )
+
+    def previous(self, game: Any, kind: str) -> Optional[Any]:
+        """The ``kind`` snapshot built for ``game`` before its latest rebuild or invalidation, if any."""
+        entry = self._entries.get(id(game))
+        if entry is None or entry.game is not game:
+            return None
+        return entry.previous.get(kind)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._stats.clear()
+
+    def stats(self, kind: Optional[str] = None) -> SnapshotCacheStats:
+        """Counters for one snapshot kind, or summed over all kinds."""
+        if kind is not None:
+            return self._stats.get(kind, SnapshotCacheStats())
+        total = SnapshotCacheStats()
+        for kind_stats in self._stats.values():
+            total = total.merge(kind_stats)
+        return total
+
+    def _entry_for(self, game: Any) -> _GameEntry:
+        key = id(game)
+        revision = self.revision(game)
+        entry = self._entries.get(key)
+
+        if entry is not None and entry.game is game and entry.revision == revision:
+            self._entries.move_to_end(key)
+            return entry
+
+        if entry is not None and entry.game is game:
+            logger.debug(f"Phase snapshot for game {key} is stale ({entry.revision} -> {revision}); rebuilding.")
+            for kind in entry.snapshots:
+                self._stats.setdefault(kind, SnapshotCacheStats()).invalidations += 1
+
+        previous = (entry.snapshots or entry.previous) if entry is not None and entry.game is game else {}
+        entry = _GameEntry(game=game, revision=revision, previous=previous)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_games:
+            self._entries.popitem(last=False)
+        return entry
+
+
+SNAPSHOT_CACHE = PhaseSnapshotCache()
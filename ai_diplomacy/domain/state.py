@@ -6,6 +6,9 @@ These provide a stable, frozen snapshot of game state without coupling to the fu
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, FrozenSet, Any
 
+from .board import BoardState
+from .possible_orders import possible_orders_for
+
 __all__ = ["PhaseState"]
 
 
@@ -28,6 +31,8 @@ class PhaseState:
     # Board state
     units: Dict[str, List[str]] = field(default_factory=dict)  # power -> list of unit strings
     supply_centers: Dict[str, List[str]] = field(default_factory=dict)  # power -> list of center names
+    # Array-backed view of the same position, used for diffs and ownership lookups
+    board: Optional[BoardState] = field(default=None, compare=False, repr=False)
 
     # Possible orders
     possible_orders: Dict[str, List[str]] = field(default_factory=dict)  # power -> list of order strings
@@ -68,8 +73,9 @@ class PhaseState:
 
             # Check if game object has get_all_possible_orders method
             if hasattr(game, "get_all_possible_orders"):
-                # The structure is Dict[power_name, List[order_str]]
-                possible_orders_dict = game.get_all_possible_orders()
+                # The engine keys its answer by location; the shared per-phase index
+                # regroups it as Dict[power_name, List[order_str]].
+                possible_orders_dict = possible_orders_for(game).as_power_dict()
 
             for power_name, power_obj in game.powers.items():
                 units_dict[power_name] = [str(unit) for unit in power_obj.units]
@@ -95,6 +101,7 @@ class PhaseState:
                 eliminated_powers=eliminated,
                 units=units_dict,
                 supply_centers=centers_dict,
+                board=BoardState.from_game(game) if hasattr(game, "map") else None,
                 possible_orders=possible_orders_dict,
                 is_game_over=game_over,
                 winner=winner_power,
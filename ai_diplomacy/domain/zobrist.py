@@ -0,0 +1,143 @@
+"""
+Zobrist hashing of board positions.
+
+Every (unit owner, unit type, location) placement, every dislodged placement and
+every (center, owner) pair gets a fixed random 64-bit key; a position's hash is
+the XOR of the keys of everything on the board, XORed with a key for the phase
+name. Because XOR is its own inverse, moving from one phase to the next only
+touches the keys of the provinces that changed (``update_position_hash``).
+
+Keys come from a seeded generator, so hashes are stable across processes and can
+be persisted (opening books, response caches).
+"""
+
+import hashlib
+import random
+import weakref
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .board import NONE, UNIT_TYPES, BoardState, MapIndex
+
+__all__ = ["ZobristTable", "zobrist_table_for", "position_hash", "update_position_hash"]
+
+ZOBRIST_SEED = 0x5EED_D1A1
+_MASK64 = (1 << 64) - 1
+
+
+class ZobristTable:
+    """
+    Random keys for one ``MapIndex``. The table keeps only the index's power and
+    location names, not the index itself, so caching it does not keep the index alive.
+    """
+
+    __slots__ = (
+        "powers",
+        "locations",
+        "seed",
+        "unit_keys",
+        "dislodged_keys",
+        "sc_keys",
+        "_provinces",
+        "_phase_keys",
+    )
+
+    def __init__(self, index: MapIndex, seed: int = ZOBRIST_SEED):
+        self.powers = index.powers
+        self.locations = index.locations
+        self.seed = seed
+        self._provinces = len(index.provinces)
+        rng = random.Random(f"{seed}:{index.name}:{','.join(index.powers)}:{','.join(index.locations)}")
+        placements = len(index.powers) * len(UNIT_TYPES) * len(index.locations)
+        self.unit_keys = array("Q", (rng.getrandbits(64) for _ in range(placements)))
+        self.dislodged_keys = array("Q", (rng.getrandbits(64) for _ in range(placements)))
+        self.sc_keys = array("Q", (rng.getrandbits(64) for _ in range(len(index.powers) * len(index.provinces))))
+        self._phase_keys: Dict[str, int] = {}
+
+    def placement(self, owner: int, unit_type: int, location: int) -> int:
+        """Offset of a (power, unit type, location) placement in the unit key arrays."""
+        return (owner * len(UNIT_TYPES) + unit_type) * len(self.locations) + location
+
+    def phase_key(self, phase_name: str) -> int:
+        key = self._phase_keys.get(phase_name)
+        if key is None:
+            digest = hashlib.blake2b(
+                phase_name.encode("utf-8"), digest_size=8, key=self.seed.to_bytes(8, "little")
+            ).digest()
+            key = self._phase_keys[phase_name] = int.from_bytes(digest, "little")
+        return key
+
+    def province_key(self, board: BoardState, province: int) -> int:
+        """XOR of the keys of everything ``board`` holds in ``province``."""
+        key = 0
+        owner = board.unit_owner[province]
+        if owner != NONE:
+            key ^= self.unit_keys[self.placement(owner, board.unit_type[province], board.unit_location[province])]
+        owner = board.dislodged_owner[province]
+        if owner != NONE:
+            key ^= self.dislodged_keys[
+                self.placement(owner, board.dislodged_type[province], board.dislodged_location[province])
+            ]
+        owner = board.sc_owner[province]
+        if owner != NONE:
+            key ^= self.sc_keys[owner * self._provinces + province]
+        return key
+
+
+# Named maps are cached by name, like ``MapIndex.from_map``; ad-hoc indexes
+# (``MapIndex.from_strings``) only for as long as the index is alive.
+_TABLES: Dict[Tuple[str, int], ZobristTable] = {}
+_AD_HOC_TABLES: "weakref.WeakKeyDictionary[MapIndex, Dict[int, ZobristTable]]" = weakref.WeakKeyDictionary()
+
+
+def zobrist_table_for(index: MapIndex, seed: int = ZOBRIST_SEED) -> ZobristTable:
+    """Returns the shared table for ``index`` (one per map and seed)."""
+    if index.name is None:
+        tables = _AD_HOC_TABLES.setdefault(index, {})
+        table = tables.get(seed)
+        if table is None:
+            table = tables[seed] = ZobristTable(index, seed)
+        return table
+    table = _TABLES.get((index.name, seed))
+    if table is None or table.powers != index.powers or table.locations != index.locations:
+        table = _TABLES[(index.name, seed)] = ZobristTable(index, seed)
+    return table
+
+
+def position_hash(board: BoardState, phase_name: str) -> int:
+    """Full hash of ``board`` in ``phase_name``: O(provinces)."""
+    table = zobrist_table_for(board.index)
+    value = table.phase_key(phase_name)
+    for province in range(len(board.index.provinces)):
+        value ^= table.province_key(board, province)
+    return value & _MASK64
+
+
+def update_position_hash(
+    previous_hash: int,
+    previous_board: BoardState,
+    previous_phase: str,
+    board: BoardState,
+    phase_name: str,
+) -> Optional[int]:
+    """
+    Derives the hash of ``board`` from the previous phase's hash, XORing out and
+    in only the provinces whose contents changed. Returns None when the boards do
+    not share a map index (callers then fall back to ``position_hash``).
+    """
+    if previous_board.index is not board.index:
+        return None
+    table = zobrist_table_for(board.index)
+    value = previous_hash ^ table.phase_key(previous_phase) ^ table.phase_key(phase_name)
+    for province in _changed_provinces(previous_board, board):
+        value ^= table.province_key(previous_board, province) ^ table.province_key(board, province)
+    return value & _MASK64
+
+
+def _changed_provinces(before: BoardState, after: BoardState) -> List[int]:
+    # The board diffs compare whole arrays in C and walk only the provinces that differ.
+    index = before.index
+    lost, gained = before.diff_units(after)
+    changed = {index.province_of(unit.lstrip("*").split()[1]) for _power, unit in lost + gained}
+    changed.update(index.province_ids[center] for center, _before, _after in before.center_changes(after))
+    return sorted(changed)
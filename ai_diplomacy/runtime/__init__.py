@@ -4,13 +4,30 @@ Manages the overall game flow and orchestration of game phases.
 This package includes the main PhaseOrchestrator, which drives the game loop,
 and individual phase strategies for movement, retreats, and builds.
 It also handles negotiation rounds between agents.
+
+Exports are resolved lazily (PEP 562), so importing the package does not pull
+in the ``diplomacy`` engine or the agent stack until one of them is used.
 """
 
-from .phase_orchestrator import PhaseOrchestrator
-from .movement import MovementPhaseStrategy
-from .retreat import RetreatPhaseStrategy
-from .build import BuildPhaseStrategy
-from .negotiation import perform_negotiation_rounds
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+if TYPE_CHECKING:
+    from .build import BuildPhaseStrategy
+    from .movement import MovementPhaseStrategy
+    from .negotiation import perform_negotiation_rounds
+    from .phase_orchestrator import PhaseOrchestrator
+    from .retreat import RetreatPhaseStrategy
+
+_LAZY_EXPORTS: Dict[str, Tuple[str, str]] = {
+    "PhaseOrchestrator": (".phase_orchestrator", "PhaseOrchestrator"),
+    "MovementPhaseStrategy": (".movement", "MovementPhaseStrategy"),
+    "RetreatPhaseStrategy": (".retreat", "RetreatPhaseStrategy"),
+    "BuildPhaseStrategy": (".build", "BuildPhaseStrategy"),
+    "perform_negotiation_rounds": (".negotiation", "perform_negotiation_rounds"),
+}
 
 __all__ = [
     "PhaseOrchestrator",
@@ -19,3 +36,17 @@ __all__ = [
     "BuildPhaseStrategy",
     "perform_negotiation_rounds",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
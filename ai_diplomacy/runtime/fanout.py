@@ -0,0 +1,77 @@
+"""
+Concurrency helpers shared by the phase strategies.
+
+``gather_bounded`` runs one job per agent with an optional cap on how many run
+at once (movement order collection); ``gather_until`` runs every job against
+one shared deadline and cancels the stragglers (simultaneous negotiation
+rounds). Both return results keyed or ordered like their input, never by
+completion order, so callers can merge them deterministically.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["gather_bounded", "gather_until"]
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+
+async def gather_bounded(
+    jobs: Sequence[Callable[[], Awaitable[T]]], max_concurrency: Optional[int] = None
+) -> List[Union[T, BaseException]]:
+    """
+    Runs ``jobs`` concurrently, at most ``max_concurrency`` at a time (None or 0: all at once).
+
+    Returns one result per job, in ``jobs`` order; a job that raised yields its
+    exception instead, so one failure does not affect the others.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def _bounded(job: Callable[[], Awaitable[T]]) -> T:
+        if semaphore is None:
+            return await job()
+        async with semaphore:
+            return await job()
+
+    return await asyncio.gather(*(_bounded(job) for job in jobs), return_exceptions=True)
+
+
+async def gather_until(
+    jobs: Dict[K, Awaitable[T]], timeout: Optional[float]
+) -> Tuple[Dict[K, Union[T, BaseException]], List[K]]:
+    """
+    Runs ``jobs`` concurrently until all finish or ``timeout`` seconds have passed.
+
+    The timeout is shared by the whole batch, not applied per job. Jobs still
+    running when it expires are cancelled.
+
+    Returns:
+        (results of the finished jobs, keys of the cancelled jobs), both in ``jobs`` order;
+        a job that raised yields its exception as its result, and a job that cancelled
+        itself appears in neither
+    """
+    tasks = {key: asyncio.ensure_future(job) for key, job in jobs.items()}
+    if not tasks:
+        return {}, []
+    _done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results: Dict[K, Union[T, BaseException]] = {}
+    cancelled: List[K] = []
+    for key, task in tasks.items():
+        if task in pending:
+            cancelled.append(key)
+        elif task.cancelled():
+            continue
+        elif task.exception() is not None:
+            results[key] = task.exception()
+        else:
+            results[key] = task.result()
+    return results, cancelled
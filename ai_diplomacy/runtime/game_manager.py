@@ -5,13 +5,15 @@ This module maintains the clean boundary between the core engine and agents.
 
 import logging
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from ..domain.possible_orders import PossibleOrdersIndex, normalize_order, possible_orders_for
+from ..domain.snapshot_cache import SNAPSHOT_CACHE
 from ..domain.state import PhaseState
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["GameEvent", "GameManager"]
+__all__ = ["GameEvent", "GameManager", "OrderVerdict", "OrderSubmissionReport"]
 
 
 @dataclass
@@ -24,6 +26,47 @@ class GameEvent:
     details: Dict[str, Any]  # Additional event-specific data
 
 
+@dataclass
+class OrderVerdict:
+    """Whether a single submitted order was accepted, and why not if it was rejected."""
+
+    power: str
+    order: str
+    accepted: bool
+    reason: Optional[str] = None  # "illegal", "inactive_power" or "engine_error" when rejected
+
+
+@dataclass
+class OrderSubmissionReport:
+    """Per-order outcome of a bulk order submission for one phase."""
+
+    phase: str
+    verdicts: List[OrderVerdict] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)  # power -> why its orders were not set
+
+    @property
+    def accepted(self) -> Dict[str, List[str]]:
+        """power -> orders handed to the engine."""
+        result: Dict[str, List[str]] = {}
+        for verdict in self.verdicts:
+            if verdict.accepted:
+                result.setdefault(verdict.power, []).append(verdict.order)
+        return result
+
+    @property
+    def rejected(self) -> Dict[str, List[str]]:
+        """power -> orders that were not submitted."""
+        result: Dict[str, List[str]] = {}
+        for verdict in self.verdicts:
+            if not verdict.accepted:
+                result.setdefault(verdict.power, []).append(verdict.order)
+        return result
+
+    @property
+    def all_accepted(self) -> bool:
+        return not self.errors and all(v.accepted for v in self.verdicts)
+
+
 class GameManager:
     """
     Core game manager that orchestrates phases and validates actions.
@@ -47,10 +90,23 @@ class GameManager:
         """
         Get the current game state as an immutable PhaseState.
 
+        The snapshot is cached per phase, so repeated calls within a phase are free.
+
         Returns:
             PhaseState snapshot of current game state
         """
-        return PhaseState.from_game(self.game)
+        return SNAPSHOT_CACHE.get(self.game, "phase_state", PhaseState.from_game)
+
+    def get_possible_orders_index(self) -> PossibleOrdersIndex:
+        """
+        Get the legal orders for the current phase, indexed by power, location and unit.
+
+        The index is built from a single engine call and shared for the whole phase.
+
+        Returns:
+            PossibleOrdersIndex for the current phase
+        """
+        return possible_orders_for(self.game)
 
     def validate_orders(self, country: str, orders: List[str]) -> Tuple[List[str], List[str]]:
         """
@@ -68,13 +124,13 @@ class GameManager:
 
         try:
             # Get possible orders for this power
-            possible_orders = self.game.get_all_possible_orders()
-            power_possible_orders = possible_orders.get(country, [])
+            power_possible_orders = self.get_possible_orders_index().orders_for_power(country)
 
             for order in orders:
                 order_str = str(order).strip()
-                if order_str in power_possible_orders:
-                    valid_orders.append(order_str)
+                normalized = normalize_order(order_str)
+                if normalized in power_possible_orders:
+                    valid_orders.append(normalized)
                 else:
                     invalid_orders.append(order_str)
                     logger.warning(f"Invalid order for {country}: {order_str}")
@@ -98,22 +154,71 @@ class GameManager:
             orders: List of validated order strings
 
         Returns:
-            True if orders were successfully submitted
+            True if orders were successfully submitted (False for a power that is
+            not active in the game)
         """
-        try:
-            # Clear existing orders for this power
-            self.game.clear_orders(country)
+        report = self.submit_phase_orders({country: orders}, validate=False)
+        return country not in report.errors
 
-            # Submit new orders
-            for order in orders:
-                self.game.set_orders(country, [order])
+    def submit_phase_orders(
+        self, orders_by_power: Dict[str, List[str]], validate: bool = True
+    ) -> OrderSubmissionReport:
+        """
+        Submit every power's orders for the current phase in one pass.
 
-            logger.info(f"Submitted {len(orders)} orders for {country}")
-            return True
+        Orders are normalized to the engine's spelling ("A PAR-BUR" -> "A PAR - BUR") and
+        checked against the phase's possible-orders index, then each power's accepted
+        orders replace its previous ones in a single engine call. Powers that are not in
+        the game or are eliminated have all their orders rejected and are listed in
+        ``errors``.
 
-        except Exception as e:
-            logger.error(f"Error submitting orders for {country}: {e}", exc_info=True)
-            return False
+        Args:
+            orders_by_power: Mapping of power name to its order strings
+            validate: Check orders against the possible-orders index before submitting
+
+        Returns:
+            OrderSubmissionReport with an accept/reject verdict for every order
+        """
+        report = OrderSubmissionReport(phase=self.game.get_current_phase())
+        index = self.get_possible_orders_index() if validate else None
+
+        for country, orders in orders_by_power.items():
+            power = self.game.powers.get(country)
+            order_strs = [str(order).strip() for order in orders]
+
+            if power is None or power.is_eliminated():
+                logger.warning(f"Power {country} is not active in this game. Orders not set.")
+                report.errors[country] = "not an active power in this game"
+                report.verdicts.extend(
+                    OrderVerdict(country, order_str, accepted=False, reason="inactive_power")
+                    for order_str in order_strs
+                )
+                continue
+
+            accepted: List[str] = []
+            for order_str in order_strs:
+                normalized = normalize_order(order_str)
+                if index is None or index.is_valid(country, normalized):
+                    accepted.append(normalized)
+                    report.verdicts.append(OrderVerdict(country, normalized, accepted=True))
+                else:
+                    logger.warning(f"Invalid order for {country}: {order_str}")
+                    report.verdicts.append(OrderVerdict(country, order_str, accepted=False, reason="illegal"))
+
+            try:
+                self.game.clear_orders(country)
+                self.game.set_orders(country, accepted)
+                logger.info(f"Submitted {len(accepted)} orders for {country}")
+            except Exception as e:
+                logger.error(f"Error submitting orders for {country}: {e}", exc_info=True)
+                report.errors[country] = str(e)
+                for verdict in report.verdicts:
+                    if verdict.power == country and verdict.accepted:
+                        verdict.accepted, verdict.reason = False, "engine_error"
+
+        # Order-dependent snapshots notice the new orders themselves; the board and
+        # possible-orders snapshots stay valid for the unchanged position.
+        return report
 
     def process_phase(self) -> List[GameEvent]:
         """
@@ -190,36 +295,40 @@ class GameManager:
         """Detect unit movements and related events."""
         events = []
 
-        # This is a simplified implementation
-        # Real implementation would parse the orders and results more carefully
-
-        for country in pre.powers:
-            pre_units = set(pre.get_power_units(country))
-            post_units = set(post.get_power_units(country))
-
-            # Detect lost units (could be retreats, disbands, or attacks)
-            lost_units = pre_units - post_units
-            for unit in lost_units:
-                events.append(
-                    GameEvent(
-                        event_type="unit_lost",
-                        phase=phase,
-                        participants={"country": country, "unit": unit},
-                        details={"unit_type": unit.split()[0] if unit else "unknown"},
-                    )
+        if pre.board is not None and post.board is not None:
+            # Array diff over provinces; dislodged units ("*A PAR") are not events.
+            lost, gained = pre.board.diff_units(post.board)
+            lost = [(country, unit) for country, unit in lost if not unit.startswith("*")]
+            gained = [(country, unit) for country, unit in gained if not unit.startswith("*")]
+        else:
+            lost, gained = [], []
+            for country in pre.powers:
+                pre_units = set(pre.get_power_units(country))
+                post_units = set(post.get_power_units(country))
+                lost.extend((country, unit) for unit in pre_units - post_units)
+                gained.extend((country, unit) for unit in post_units - pre_units)
+
+        # Detect lost units (could be retreats, disbands, or attacks)
+        for country, unit in lost:
+            events.append(
+                GameEvent(
+                    event_type="unit_lost",
+                    phase=phase,
+                    participants={"country": country, "unit": unit},
+                    details={"unit_type": unit.split()[0] if unit else "unknown"},
                 )
+            )
 
-            # Detect new units (builds)
-            new_units = post_units - pre_units
-            for unit in new_units:
-                events.append(
-                    GameEvent(
-                        event_type="unit_built",
-                        phase=phase,
-                        participants={"country": country, "unit": unit},
-                        details={"unit_type": unit.split()[0] if unit else "unknown"},
-                    )
+        # Detect new units (builds)
+        for country, unit in gained:
+            events.append(
+                GameEvent(
+                    event_type="unit_built",
+                    phase=phase,
+                    participants={"country": country, "unit": unit},
+                    details={"unit_type": unit.split()[0] if unit else "unknown"},
                 )
+            )
 
         return events
 
@@ -227,41 +336,37 @@ class GameManager:
         """Detect supply center ownership changes."""
         events = []
 
-        for country in pre.powers:
-            pre_centers = set(pre.get_power_centers(country))
-            post_centers = set(post.get_power_centers(country))
-
-            # Lost centers
-            lost_centers = pre_centers - post_centers
-            for center in lost_centers:
-                # Try to find who took it
-                new_owner = None
-                for other_country in post.powers:
-                    if center in post.get_power_centers(other_country):
-                        new_owner = other_country
-                        break
-
+        if pre.board is not None and post.board is not None:
+            changes = pre.board.center_changes(post.board)
+        else:
+            pre_owner = {c: p for p in pre.powers for c in pre.get_power_centers(p)}
+            post_owner = {c: p for p in post.powers for c in post.get_power_centers(p)}
+            changes = [
+                (center, pre_owner.get(center), post_owner.get(center))
+                for center in pre_owner.keys() | post_owner.keys()
+                if pre_owner.get(center) != post_owner.get(center)
+            ]
+
+        for center, old_owner, new_owner in changes:
+            if old_owner is not None:
                 events.append(
                     GameEvent(
                         event_type="center_lost",
                         phase=phase,
                         participants={
-                            "country": country,
+                            "country": old_owner,
                             "new_owner": new_owner,
                             "center": center,
                         },
                         details={},
                     )
                 )
-
-            # Gained centers
-            gained_centers = post_centers - pre_centers
-            for center in gained_centers:
+            if new_owner is not None:
                 events.append(
                     GameEvent(
                         event_type="center_gained",
                         phase=phase,
-                        participants={"country": country, "center": center},
+                        participants={"country": new_owner, "center": center},
                         details={},
                     )
                 )
@@ -341,7 +446,6 @@ class GameManager:
         (Internal helper)
         """
         try:
-            possible_orders = self.game.get_all_possible_orders().get(country, [])
-            return order_text in possible_orders
+            return self.get_possible_orders_index().is_valid(country, normalize_order(order_text))
         except Exception:
             return False 
\ No newline at end of file
@@ -5,16 +5,17 @@ This module defines the MovementPhaseStrategy class, which is responsible for
 managing diplomatic negotiations and collecting movement orders from each agent.
 """
 
+import functools
 import logging
-from typing import Dict, List, TYPE_CHECKING, Set
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
-# Import the new negotiation function
-from .negotiation import perform_negotiation_rounds
+from .fanout import gather_bounded
 from ..agents.bloc_llm_agent import BlocLLMAgent
 from ai_diplomacy.domain import PhaseState
 
 if TYPE_CHECKING:
     from diplomacy import Game
+    from ..agents.base import BaseAgent
     from ..game_history import GameHistory
     from .phase_orchestrator import (
         PhaseOrchestrator,
@@ -24,6 +25,11 @@ logger = logging.getLogger(__name__)
 
 __all__ = ["MovementPhaseStrategy"]
 
+# Upper bound on simultaneous ``decide_orders`` calls during a movement phase. ``None``
+# lets every agent run at once; ``GameConfig.max_concurrent_order_requests`` overrides it
+# (e.g. set it to 1 to serialize requests to a single local model).
+DEFAULT_MAX_CONCURRENT_ORDER_REQUESTS: Optional[int] = None
+
 
 class MovementPhaseStrategy:
     async def get_orders(
@@ -34,7 +40,9 @@ class MovementPhaseStrategy:
         game_history: "GameHistory",
     ) -> Dict[str, List[str]]:
         logger.info("Executing Movement Phase actions via MovementPhaseStrategy...")
-        current_phase_name = phase.name
+        # Imported here so order collection (``collect_orders``) does not depend on the
+        # negotiation stack.
+        from .negotiation import perform_negotiation_rounds
 
         await perform_negotiation_rounds(
             game,
@@ -44,7 +52,22 @@ class MovementPhaseStrategy:
             orchestrator.active_powers,  # active_powers are individual game power names
             orchestrator.config,
         )
+        return await self.collect_orders(game, phase, orchestrator, game_history)
 
+    async def collect_orders(
+        self,
+        game: "Game",
+        phase: "PhaseState",
+        orchestrator: "PhaseOrchestrator",
+        game_history: "GameHistory",
+    ) -> Dict[str, List[str]]:
+        """
+        Requests every agent's orders concurrently (at most
+        ``GameConfig.max_concurrent_order_requests`` at a time) and records them in
+        ``game_history`` in active-power order, whatever order the agents finish in.
+        An agent that fails or times out gets empty orders; the others are unaffected.
+        """
+        current_phase_name = phase.name
         orders_by_power: Dict[str, List[str]] = {}
         processed_bloc_agent_ids: Set[str] = set()
 
@@ -55,12 +78,54 @@ class MovementPhaseStrategy:
         # itself as the look-up key for AgentManager.
         power_to_agent_id_map = getattr(orchestrator.config, "power_to_agent_id_map", {}) or {}
 
+        # Resolve every agent up front. Each bloc is scheduled once (for the first of its
+        # powers to appear), so the order requests below can run concurrently while the
+        # merge step still walks the powers in ``active_game_powers`` order.
+        scheduled: List[Tuple[str, Optional["BaseAgent"]]] = []
         for power_name in active_game_powers:
             agent_lookup_key = power_to_agent_id_map.get(power_name, power_name)
-
             agent = orchestrator.agent_manager.get_agent(agent_lookup_key)
 
             if not agent:
+                scheduled.append((power_name, None))
+                continue
+
+            if isinstance(agent, BlocLLMAgent):
+                if agent.agent_id in processed_bloc_agent_ids:
+                    logger.debug(
+                        f"Skipping already scheduled bloc agent {agent.agent_id} (for power {power_name})"
+                    )
+                    continue
+                processed_bloc_agent_ids.add(agent.agent_id)
+                logger.debug(
+                    f"Scheduling BlocLLMAgent {agent.agent_id} for its controlled powers (triggered by {power_name})..."
+                )
+            else:
+                logger.debug(f"Scheduling agent {agent_lookup_key} for power {power_name} (Movement)...")
+            scheduled.append((power_name, agent))
+
+        max_concurrency = getattr(
+            orchestrator.config, "max_concurrent_order_requests", DEFAULT_MAX_CONCURRENT_ORDER_REQUESTS
+        )
+        agent_jobs = [(power_name, agent) for power_name, agent in scheduled if agent is not None]
+        logger.info(
+            f"Collecting movement orders from {len(agent_jobs)} agent(s) "
+            f"(max concurrency: {max_concurrency or 'unbounded'})"
+        )
+        results = await gather_bounded(
+            [
+                functools.partial(
+                    self._collect_agent_orders, game, phase, power_name, agent, orchestrator, game_history
+                )
+                for power_name, agent in agent_jobs
+            ],
+            max_concurrency,
+        )
+        results_by_power = {power_name: result for (power_name, _), result in zip(agent_jobs, results)}
+
+        # Merge in scheduling order so GameHistory is identical whatever order the agents finished in.
+        for power_name, agent in scheduled:
+            if agent is None:
                 # No agent available for this power – record warning and continue with
                 # empty orders so the rest of the pipeline keeps running.
                 logger.warning(
@@ -70,135 +135,32 @@ class MovementPhaseStrategy:
                 game_history.add_orders(current_phase_name, power_name, [])
                 continue
 
+            result = results_by_power[power_name]
             if isinstance(agent, BlocLLMAgent):
-                if agent.agent_id in processed_bloc_agent_ids:
-                    logger.debug(
-                        f"Skipping already processed bloc agent {agent.agent_id} (for power {power_name})"
-                    )
-                    # Order for this power_name should have been added when the bloc was first processed.
-                    # If not, it implies an issue or that the power isn't in this bloc as expected.
-                    if power_name not in orders_by_power:
-                        logger.warning(
-                            f"Power {power_name} was expected to have orders from bloc {agent.agent_id} but does not. Check bloc processing logic."
-                        )
-                        orders_by_power[
-                            power_name
-                        ] = []  # Default to empty if missed, though this state is unusual.
-                    continue
-                else:
-                    logger.debug(
-                        f"Processing BlocLLMAgent {agent.agent_id} for its controlled powers (triggered by {power_name})..."
-                    )
-                    try:
-                        # Decide orders for the entire bloc. This populates the agent's internal cache.
-                        await agent.decide_orders(phase)
-
-                        # Construct the phase key to retrieve all bloc orders.
-                        # This key must match the one used in BlocLLMAgent.decide_orders caching.
-                        # Reconstruct the key carefully as done in BlocLLMAgent.
-                        phase_repr_parts = []
-                        if phase.board.units:  # Check if there are any units on the board
-                            for p_n in sorted(agent.controlled_powers):
-                                power_units_locs_list = phase.board.units.get(p_n, [])
-                                phase_repr_parts.append(f"{p_n}_units:{tuple(sorted(power_units_locs_list))}")
-
-                        if phase.board.supply_centers:  # Check if there is supply center data
-                            sorted_scs_items = sorted(
-                                [
-                                    (p, tuple(sorted(cs)))
-                                    for p, cs in phase.board.supply_centers.items()
-                                ]
-                            )
-                            phase_repr_parts.append(f"scs:{tuple(sorted_scs_items)}")
-
-                        current_phase_key_for_bloc = (
-                            phase.key.year,
-                            phase.key.season,
-                            phase.name,
-                            tuple(phase_repr_parts),
-                        )
-
-                        all_bloc_orders_obj = agent.get_all_bloc_orders_for_phase(current_phase_key_for_bloc)
-                        if not all_bloc_orders_obj and agent.controlled_powers:
-                            logger.warning(
-                                f"BlocLLMAgent {agent.agent_id} returned no orders from get_all_bloc_orders_for_phase despite having controlled powers. LLM might have failed or returned empty."
-                            )
-
-                        for (
-                            bloc_member_power_name,
-                            order_obj_list,
-                        ) in all_bloc_orders_obj.items():
-                            if bloc_member_power_name not in agent.controlled_powers:
-                                logger.warning(
-                                    f"Bloc agent {agent.agent_id} returned orders for {bloc_member_power_name} which it does not control. Ignoring these orders."
-                                )
-                                continue
-                            if bloc_member_power_name not in active_game_powers:
-                                logger.warning(
-                                    f"Bloc agent {agent.agent_id} returned orders for {bloc_member_power_name} which is not an active power in this phase. Ignoring."
-                                )
-                                continue
-
-                            orders_str_list = [str(o) for o in order_obj_list]
-                            orders_by_power[bloc_member_power_name] = orders_str_list
-                            game_history.add_orders(
-                                current_phase_name,
-                                bloc_member_power_name,
-                                orders_str_list,
-                            )
-                            logger.info(
-                                f"AGENT_ORDERS: {bloc_member_power_name} (from Bloc {agent.agent_id}): {orders_str_list}"
-                            )
-                        processed_bloc_agent_ids.add(agent.agent_id)
-
-                        # Ensure all controlled powers by this bloc that are active in the game have an entry in orders_by_power
-                        for controlled_p in agent.controlled_powers:
-                            if controlled_p in active_game_powers and controlled_p not in orders_by_power:
-                                logger.warning(
-                                    f"Controlled power {controlled_p} of bloc {agent.agent_id} did not receive orders. Defaulting to empty list."
-                                )
-                                orders_by_power[controlled_p] = []
-                                game_history.add_orders(
-                                    current_phase_name, controlled_p, []
-                                )  # Log empty orders
-
-                    except Exception as e:
-                        logger.error(
-                            f"CRITICAL_BLOC_FAILURE: Error processing bloc agent {agent.agent_id} (for power {power_name}): {e}",
-                            exc_info=True,
-                        )
-                        # For a bloc failure, all its controlled (and active) powers get empty orders
-                        for bloc_member_power in agent.controlled_powers:
-                            if bloc_member_power in active_game_powers:
-                                orders_by_power[bloc_member_power] = []
-                                game_history.add_orders(current_phase_name, bloc_member_power, [])
-                                logger.info(
-                                    f"AGENT_ORDERS: {bloc_member_power} (from failed Bloc {agent.agent_id}): []"
-                                )
-                        processed_bloc_agent_ids.add(agent.agent_id)  # Mark as processed to avoid re-attempt
-
-            else:  # Standard (non-bloc) LLM agent or other types
-                logger.debug(f"Processing agent {agent_lookup_key} for power {power_name} (Movement)...")
-                try:
-                    orders = await orchestrator._get_orders_for_power(
-                        game,
-                        power_name,
-                        agent,
-                        game_history,  # power_name here is the actual power
-                    )
-                    orders_by_power[power_name] = orders
-                    game_history.add_orders(current_phase_name, power_name, orders)
-                    logger.info(f"AGENT_ORDERS: {power_name}: {orders}")
-                except Exception as e:
-                    logger.error(
-                        f"❌ Error getting orders for {power_name} (Movement): {e}",
-                        exc_info=True,
-                    )
-                    orders_by_power[power_name] = []
-                    game_history.add_orders(
-                        current_phase_name, power_name, []
-                    )  # Ensure history reflects empty orders
-                    logger.info(f"AGENT_ORDERS: {power_name} (failed): []")
+                self._merge_bloc_orders(
+                    agent, power_name, result, active_game_powers, orders_by_power, game_history, current_phase_name
+                )
+            elif isinstance(result, BaseException):
+                logger.error(
+                    f"❌ Error getting orders for {power_name} (Movement): {result}",
+                    exc_info=result,
+                )
+                orders_by_power[power_name] = []
+                game_history.add_orders(current_phase_name, power_name, [])  # Ensure history reflects empty orders
+                logger.info(f"AGENT_ORDERS: {power_name} (failed): []")
+            else:
+                orders = result[power_name]
+                orders_by_power[power_name] = orders
+                game_history.add_orders(current_phase_name, power_name, orders)
+                logger.info(f"AGENT_ORDERS: {power_name}: {orders}")
+
+        for power_name in active_game_powers:
+            if power_name not in orders_by_power:
+                # Mapped to a bloc that does not list this power among its controlled powers.
+                logger.warning(
+                    f"Power {power_name} was expected to have orders from its bloc but does not. Check bloc processing logic."
+                )
+                orders_by_power[power_name] = []
 
         # The specific Neutral Italy handling might need to be revised or integrated
         # if Italy is now part of a bloc managed by NEUTRAL_ITALY_BLOC agent.
@@ -236,3 +198,82 @@ class MovementPhaseStrategy:
                 game_history.add_orders(current_phase_name, italy_power_name, [])
 
         return orders_by_power
+
+    async def _collect_agent_orders(
+        self,
+        game: "Game",
+        phase: "PhaseState",
+        power_name: str,
+        agent: "BaseAgent",
+        orchestrator: "PhaseOrchestrator",
+        game_history: "GameHistory",
+    ) -> Dict[str, List[str]]:
+        """
+        Requests orders from a single agent. Bloc agents answer for all of their
+        controlled powers; any other agent answers for ``power_name`` only.
+        Errors propagate so the caller can isolate them per agent.
+        """
+        if not isinstance(agent, BlocLLMAgent):
+            orders = await orchestrator._get_orders_for_power(game, power_name, agent, game_history)
+            return {power_name: orders}
+
+        # Decide orders for the entire bloc. This populates the agent's internal cache.
+        await agent.decide_orders(phase)
+
+        # Bloc orders are cached by the position's Zobrist hash.
+        all_bloc_orders_obj = agent.get_all_bloc_orders_for_phase(phase.key.position_hash)
+        return {power: [str(o) for o in order_obj_list] for power, order_obj_list in all_bloc_orders_obj.items()}
+
+    def _merge_bloc_orders(
+        self,
+        agent: BlocLLMAgent,
+        trigger_power: str,
+        result: "Dict[str, List[str]] | BaseException",
+        active_game_powers: List[str],
+        orders_by_power: Dict[str, List[str]],
+        game_history: "GameHistory",
+        current_phase_name: str,
+    ) -> None:
+        """Records a bloc agent's orders (or its failure) for every active power it controls."""
+        if isinstance(result, BaseException):
+            logger.error(
+                f"CRITICAL_BLOC_FAILURE: Error processing bloc agent {agent.agent_id} (for power {trigger_power}): {result}",
+                exc_info=result,
+            )
+            # For a bloc failure, all its controlled (and active) powers get empty orders
+            for bloc_member_power in agent.controlled_powers:
+                if bloc_member_power in active_game_powers:
+                    orders_by_power[bloc_member_power] = []
+                    game_history.add_orders(current_phase_name, bloc_member_power, [])
+                    logger.info(f"AGENT_ORDERS: {bloc_member_power} (from failed Bloc {agent.agent_id}): []")
+            return
+
+        if not result and agent.controlled_powers:
+            logger.warning(
+                f"BlocLLMAgent {agent.agent_id} returned no orders from get_all_bloc_orders_for_phase despite having controlled powers. LLM might have failed or returned empty."
+            )
+
+        for bloc_member_power_name, orders_str_list in result.items():
+            if bloc_member_power_name not in agent.controlled_powers:
+                logger.warning(
+                    f"Bloc agent {agent.agent_id} returned orders for {bloc_member_power_name} which it does not control. Ignoring these orders."
+                )
+                continue
+            if bloc_member_power_name not in active_game_powers:
+                logger.warning(
+                    f"Bloc agent {agent.agent_id} returned orders for {bloc_member_power_name} which is not an active power in this phase. Ignoring."
+                )
+                continue
+
+            orders_by_power[bloc_member_power_name] = orders_str_list
+            game_history.add_orders(current_phase_name, bloc_member_power_name, orders_str_list)
+            logger.info(f"AGENT_ORDERS: {bloc_member_power_name} (from Bloc {agent.agent_id}): {orders_str_list}")
+
+        # Ensure all controlled powers by this bloc that are active in the game have an entry in orders_by_power
+        for controlled_p in agent.controlled_powers:
+            if controlled_p in active_game_powers and controlled_p not in orders_by_power:
+                logger.warning(
+                    f"Controlled power {controlled_p} of bloc {agent.agent_id} did not receive orders. Defaulting to empty list."
+                )
+                orders_by_power[controlled_p] = []
+                game_history.add_orders(current_phase_name, controlled_p, [])  # Log empty orders
@@ -8,6 +8,7 @@ from ..agents.llm_agent import LLMAgent  # Added this import
 from ..game_config import GameConfig
 from ..game_state import GameState
 from .agents import get_agent_by_power
+from .fanout import gather_until
 
 if TYPE_CHECKING:
     from diplomacy import Game
@@ -28,6 +29,9 @@ logger = logging.getLogger(__name__)
 
 __all__ = ["perform_negotiation_rounds"]
 
+# GameConfig.negotiation_style value that drafts each round's messages concurrently.
+NEGOTIATION_STYLE_SIMULTANEOUS = "simultaneous"
+
 
 async def perform_negotiation_rounds(
     game: "Game",
@@ -50,7 +54,9 @@ async def perform_negotiation_rounds(
         game_history: The GameHistory object to record messages.
         agent_manager: The AgentManager to retrieve agent instances.
         active_powers: A list of power names that are currently active.
-        config: The GameConfig object, used to determine the number of negotiation rounds.
+        config: The GameConfig object, used to determine the number of negotiation rounds,
+            the negotiation style ("simultaneous" drafts each round concurrently) and the
+            per-round timeout used in simultaneous mode.
     """
     current_phase_name = phase.name
     logger.info(f"Performing negotiation rounds for phase: {current_phase_name}")
@@ -62,57 +68,36 @@ async def perform_negotiation_rounds(
     # GameConfig ensures this attribute exists and has a default if not set by args.
     num_rounds = config.num_negotiation_rounds
 
+    # "simultaneous" lets every power draft its messages for a round at the same time; any
+    # other style keeps the original one-power-after-another behaviour. Either way the
+    # round's messages are only delivered once every power has answered (or timed out).
+    simultaneous = getattr(config, "negotiation_style", None) == NEGOTIATION_STYLE_SIMULTANEOUS
+    round_timeout = getattr(config, "negotiation_round_timeout_seconds", None) or (
+        constants.NEGOTIATION_MESSAGE_TIMEOUT_SECONDS
+    )
+
     for round_num in range(1, num_rounds + 1):
         logger.info(f"Negotiation Round {round_num}/{num_rounds}")
 
-        all_proposed_messages: Dict[str, List[Dict[str, str]]] = {}
-
-        for power_name in active_powers:
-            agent = agent_manager.get_agent(power_name)
-            if agent:
-                logger.debug(
-                    f"[Negotiation] Starting message generation for {power_name} (round {round_num})..."
+        all_proposed_messages: Dict[str, List[Dict[str, str]]]
+        if simultaneous:
+            all_proposed_messages = await _draft_round_concurrently(
+                phase, agent_manager, active_powers, round_num, round_timeout
+            )
+        else:
+            all_proposed_messages = {}
+            for power_name in active_powers:
+                all_proposed_messages[power_name] = await _draft_messages_for_power(
+                    phase,
+                    agent_manager.get_agent(power_name),
+                    power_name,
+                    round_num,
+                    timeout=constants.NEGOTIATION_MESSAGE_TIMEOUT_SECONDS,
                 )
-                try:
-                    if isinstance(agent, LLMAgent):
-                        messages_list_objects: List[DiploMessage] = await asyncio.wait_for(
-                            agent.negotiate(phase),
-                            timeout=constants.NEGOTIATION_MESSAGE_TIMEOUT_SECONDS,
-                        )
-                        messages_as_dicts = []
-                        for msg_obj in messages_list_objects:
-                            messages_as_dicts.append(
-                                {
-                                    constants.LLM_MESSAGE_KEY_RECIPIENT: msg_obj.recipient,
-                                    constants.LLM_MESSAGE_KEY_CONTENT: msg_obj.content,
-                                    constants.LLM_MESSAGE_KEY_TYPE: msg_obj.message_type,
-                                }
-                            )
-                        all_proposed_messages[power_name] = messages_as_dicts
-                        logger.debug(
-                            f"✅ {power_name} (LLMAgent): Generated {len(messages_as_dicts)} messages (round {round_num})"
-                        )
-                    else:
-                        logger.warning(
-                            f"Agent {power_name} is not an LLMAgent. Skipping message generation. (Type: {type(agent)})"
-                        )
-                        all_proposed_messages[power_name] = []
-
-                except asyncio.TimeoutError:
-                    logger.error(f"❌ Timeout generating messages for {power_name} (round {round_num})")
-                    all_proposed_messages[power_name] = []
-                except Exception as e:
-                    logger.error(
-                        f"❌ Error generating messages for {power_name} (round {round_num}): {e}",
-                        exc_info=True,
-                    )
-                    all_proposed_messages[power_name] = []
-            else:
-                logger.warning(f"No agent found for active power {power_name} during message generation.")
-                all_proposed_messages[power_name] = []
 
-        for sender_power, messages_to_send_dicts in all_proposed_messages.items():
-            for msg_dict in messages_to_send_dicts:
+        # Barrier: the round is closed, deliver its messages in active-power order.
+        for sender_power in active_powers:
+            for msg_dict in all_proposed_messages.get(sender_power, []):
                 recipient = msg_dict.get(
                     constants.LLM_MESSAGE_KEY_RECIPIENT,
                     constants.MESSAGE_RECIPIENT_GLOBAL,
@@ -134,6 +119,85 @@ async def perform_negotiation_rounds(
             logger.info(f"Final Negotiation Round {round_num} completed.")
 
 
+async def _draft_messages_for_power(
+    phase: "PhaseState",
+    agent: "BaseAgent | None",
+    power_name: str,
+    round_num: int,
+    timeout: "float | None",
+) -> List[Dict[str, str]]:
+    """
+    Asks one agent for its messages this round and returns them as message dicts.
+
+    Never raises: a missing agent, a non-LLM agent, a timeout or an error all yield an
+    empty list so one power cannot hold up or break the round. ``timeout=None`` leaves
+    the time limit to the caller.
+    """
+    if not agent:
+        logger.warning(f"No agent found for active power {power_name} during message generation.")
+        return []
+
+    if not isinstance(agent, LLMAgent):
+        logger.warning(
+            f"Agent {power_name} is not an LLMAgent. Skipping message generation. (Type: {type(agent)})"
+        )
+        return []
+
+    logger.debug(f"[Negotiation] Starting message generation for {power_name} (round {round_num})...")
+    try:
+        messages_list_objects: List[DiploMessage] = await asyncio.wait_for(agent.negotiate(phase), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.error(f"❌ Timeout generating messages for {power_name} (round {round_num})")
+        return []
+    except Exception as e:
+        logger.error(
+            f"❌ Error generating messages for {power_name} (round {round_num}): {e}",
+            exc_info=True,
+        )
+        return []
+
+    messages_as_dicts = [
+        {
+            constants.LLM_MESSAGE_KEY_RECIPIENT: msg_obj.recipient,
+            constants.LLM_MESSAGE_KEY_CONTENT: msg_obj.content,
+            constants.LLM_MESSAGE_KEY_TYPE: msg_obj.message_type,
+        }
+        for msg_obj in messages_list_objects
+    ]
+    logger.debug(
+        f"✅ {power_name} (LLMAgent): Generated {len(messages_as_dicts)} messages (round {round_num})"
+    )
+    return messages_as_dicts
+
+
+async def _draft_round_concurrently(
+    phase: "PhaseState",
+    agent_manager: "AgentManager",
+    active_powers: List[str],
+    round_num: int,
+    round_timeout: float,
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Drafts every power's messages for one round at the same time.
+
+    The whole round shares a single ``round_timeout``; powers still drafting when it
+    expires are cancelled and contribute no messages.
+    """
+    results, cancelled = await gather_until(
+        {
+            power_name: _draft_messages_for_power(
+                phase, agent_manager.get_agent(power_name), power_name, round_num, timeout=None
+            )
+            for power_name in active_powers
+        },
+        round_timeout,
+    )
+    for power_name in cancelled:
+        logger.error(f"❌ Timeout generating messages for {power_name} (round {round_num})")
+    # _draft_messages_for_power never raises, so every finished power has a message list.
+    return {power_name: results.get(power_name, []) for power_name in active_powers}
+
+
 async def conduct_negotiations(
     game_config: "GameConfig",
     game: "GameState",
@@ -0,0 +1,203 @@
+"""
+Repairs an agent's rejected orders by asking again for those units only.
+
+After ``GameManager.validate_orders``, ``repair_orders`` sends the agent a short
+follow-up (``BaseAgent.repair_orders``) naming only the units left without a
+legal order, with their legal alternatives, and merges the corrected orders into
+the accepted ones. Rounds repeat for whatever is still wrong, up to
+``max_rounds`` and never past the phase deadline; units still unresolved then
+hold. Each round's latency and tokens are logged next to those of the agent's
+full order request, so repairing can be compared with regenerating every order.
+
+Only movement phases are repaired. Retreat and adjustment orders are not one per
+unit location (a power may waive several builds, and builds go to free home
+centres), so there the legal orders are kept as given and the rest dropped.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from ..domain.possible_orders import normalize_order
+
+if TYPE_CHECKING:
+    from ..agents.base import BaseAgent
+    from ..domain import PhaseState
+    from .game_manager import GameManager
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["OrderRepairReport", "RepairRound", "repair_orders"]
+
+DEFAULT_MAX_REPAIR_ROUNDS = 2
+# Seconds from the first order request of a phase until repairs stop and unresolved
+# units hold; ``GameConfig.order_phase_deadline_seconds`` overrides it.
+DEFAULT_ORDER_PHASE_DEADLINE_SECONDS = 180.0
+
+
+@dataclass
+class RepairRound:
+    """One follow-up request and what it fixed."""
+
+    number: int
+    locations: List[str]  # units asked about, by location
+    repaired: List[str]  # orders accepted from the reply
+    seconds: float
+    prompt_tokens: int = 0  # as reported by the backend, else estimated
+    completion_tokens: int = 0
+    timed_out: bool = False
+
+
+@dataclass
+class OrderRepairReport:
+    """The orders to submit for one power, and how the rejected ones were resolved."""
+
+    power: str
+    orders: List[str] = field(default_factory=list)  # accepted, repaired and held orders
+    rejected: List[str] = field(default_factory=list)  # orders rejected by the first validation
+    repaired: List[str] = field(default_factory=list)
+    held: List[str] = field(default_factory=list)  # hold orders for units that were never repaired
+    rounds: List[RepairRound] = field(default_factory=list)
+
+
+async def repair_orders(
+    game_manager: "GameManager",
+    power: str,
+    agent: "BaseAgent",
+    phase: "PhaseState",
+    orders: Sequence[str],
+    *,
+    deadline: Optional[float] = None,
+    max_rounds: int = DEFAULT_MAX_REPAIR_ROUNDS,
+) -> OrderRepairReport:
+    """
+    Validates ``orders`` and asks ``agent`` to repair the rejected ones.
+
+    Args:
+        game_manager: The manager of the game the orders are for
+        power: The power the orders are for
+        agent: The agent that gave the orders
+        phase: The current phase, as given to the agent
+        orders: The agent's orders
+        deadline: Event-loop time (``loop.time()``) after which no repair is attempted
+        max_rounds: Follow-up requests at most
+
+    Returns:
+        OrderRepairReport whose ``orders`` hold one legal order per resolved unit
+        (outside movement phases: the legal ``orders``, unrepaired)
+    """
+    if game_manager.game.phase_type != "M":
+        valid, invalid = game_manager.validate_orders(power, list(orders))
+        if invalid:
+            logger.warning(f"[{power}] Dropping orders rejected outside a movement phase: {invalid}")
+        return OrderRepairReport(power, orders=valid, rejected=invalid)
+
+    index = game_manager.get_possible_orders_index()
+    locations = index.orderable_locations.get(power, ())
+    location_of = {order: loc for loc in locations for order in index.orders_for_location(loc)}
+
+    valid, invalid = game_manager.validate_orders(power, list(orders))
+    report = OrderRepairReport(power, rejected=invalid)
+    accepted: Dict[str, str] = {}  # location -> order
+    for order in valid:
+        accepted.setdefault(location_of.get(order, order), order)
+    if not invalid:
+        report.orders = list(accepted.values())
+        return report
+
+    # location -> the rejected order for that unit (None if the reply had none)
+    pending: Dict[str, Optional[str]] = {}
+    unattributed = False
+    for order in invalid:
+        location = _unit_location(order, locations)
+        if location is None:
+            unattributed = True
+        elif location not in accepted:
+            pending.setdefault(location, order)
+    if unattributed:
+        # An order that names none of the power's units was meant for one of them.
+        for location in locations:
+            if location not in accepted:
+                pending.setdefault(location, None)
+
+    loop = asyncio.get_running_loop()
+    ledger = getattr(agent, "token_ledger", None)
+    while pending and len(report.rounds) < max_rounds:
+        remaining = deadline - loop.time() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            logger.warning(f"[{power}] Phase deadline reached; not repairing {sorted(pending)}")
+            break
+        number = len(report.rounds) + 1
+        asked = list(pending)
+        mark = len(ledger.entries) if ledger is not None else 0
+        started = loop.time()
+        timed_out = False
+        replies: List[str] = []
+        try:
+            async with asyncio.timeout(remaining):
+                replies = [str(o.value) for o in await agent.repair_orders(phase, dict(pending))]
+        except TimeoutError:
+            timed_out = True
+        except Exception as e:
+            logger.error(f"[{power}] Order repair round {number} failed: {e}", exc_info=True)
+
+        repaired: List[str] = []
+        for order in game_manager.validate_orders(power, replies)[0] if replies else []:
+            location = location_of.get(order)
+            if location in pending:
+                del pending[location]
+                accepted[location] = order
+                repaired.append(order)
+        prompt_tokens, completion_tokens = _tokens(ledger.entries[mark:] if ledger is not None else [])
+        attempt = RepairRound(
+            number,
+            locations=asked,
+            repaired=repaired,
+            seconds=loop.time() - started,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            timed_out=timed_out,
+        )
+        report.rounds.append(attempt)
+        report.repaired.extend(repaired)
+        full_prompt, full_completion = _tokens(
+            [e for e in ledger.entries if e.phase == phase.key.name and e.purpose == "orders"]
+            if ledger is not None
+            else []
+        )
+        logger.info(
+            f"[{power}] Order repair round {number} for {phase.key.name}: "
+            f"{len(repaired)}/{len(attempt.locations)} units repaired in {attempt.seconds:.2f}s"
+            f"{' (timed out)' if timed_out else ''}, {prompt_tokens} prompt + {completion_tokens} "
+            f"completion tokens (full order request: {full_prompt} + {full_completion})"
+        )
+        if timed_out or not replies:
+            break
+
+    for location in pending:
+        hold = next((o for o in index.orders_for_location(location) if o.endswith(" H")), None)
+        if hold is not None:
+            accepted[location] = hold
+            report.held.append(hold)
+    if pending:
+        logger.warning(f"[{power}] Unrepaired units {sorted(pending)}; holding with {report.held}")
+    report.orders = list(accepted.values())
+    return report
+
+
+def _unit_location(order: str, locations: Sequence[str]) -> Optional[str]:
+    """The orderable location of the unit ``order`` names ("a par-mun" -> "PAR"), if any."""
+    parts = normalize_order(order).split()
+    if len(parts) < 2 or parts[0] not in ("A", "F"):
+        return None
+    for location in (parts[1], parts[1].split("/")[0]):
+        if location in locations:
+            return location
+    return None
+
+
+def _tokens(entries: Sequence) -> Tuple[int, int]:
+    """(prompt, completion) tokens of ledger entries; estimated where the backend reported none."""
+    prompt = sum(e.prompt_tokens if e.prompt_tokens is not None else e.sent_tokens for e in entries)
+    return prompt, sum(e.completion_tokens or 0 for e in entries)
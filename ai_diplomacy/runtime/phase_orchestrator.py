@@ -27,6 +27,8 @@ from .movement import MovementPhaseStrategy, execute_movement_phase
 from .retreat import RetreatPhaseStrategy
 from .build import BuildPhaseStrategy
 from .result_parser import GameResultParser
+from .game_manager import GameManager
+from .order_repair import DEFAULT_ORDER_PHASE_DEADLINE_SECONDS, repair_orders
 from .negotiation import conduct_negotiations
 
 try:
@@ -99,6 +101,9 @@ class PhaseOrchestrator:  # Renamed from GamePhaseOrchestrator
         self.active_powers: List[str] = []
         self.result_parser = GameResultParser()
         self.phase_counter = 0
+        self.game_manager: Optional[GameManager] = None
+        # Event-loop time at which this phase's order repairs stop; set by the first order request.
+        self.order_deadline: Optional[float] = None
 
         if self.game_config.powers_and_models:
             self.active_powers = list(self.game_config.powers_and_models.keys())
@@ -118,6 +123,8 @@ class PhaseOrchestrator:  # Renamed from GamePhaseOrchestrator
     async def run_game_loop(self, game: "GameState", game_history: "GameHistory"):
         logger.info(f"Starting game loop for game ID: {self.game_config.game_id}")
         self.game_config.game_instance = game
+        game_manager = GameManager(game)
+        self.game_manager = game_manager
 
         try:
             while True:
@@ -180,17 +187,14 @@ class PhaseOrchestrator:  # Renamed from GamePhaseOrchestrator
                         continue
 
                 if strategy:
+                    self.order_deadline = None
                     all_orders_for_phase = await strategy.get_orders(game, phase, self, game_history)
                     # ---- MODIFICATION START: Set orders and process ----
                     logger.info("Submitting all collected orders to the game engine.")
-                    for power_name, orders in all_orders_for_phase.items():
-                        if power_name in game.powers and not game.powers[power_name].is_eliminated():
-                            game.set_orders(power_name, orders)
-                            logger.debug(f"Orders set for {power_name}: {orders}")
-                        else:
-                            logger.warning(
-                                f"Power {power_name} from order list not in active game powers. Orders not set."
-                            )
+                    submission = game_manager.submit_phase_orders(all_orders_for_phase)
+                    for power_name, rejected_orders in submission.rejected.items():
+                        logger.warning(f"Orders rejected for {power_name}: {rejected_orders}")
+                    logger.debug(f"Orders set: {submission.accepted}")
 
                     logger.info("Processing game state with submitted orders...")
                     game.process()
@@ -260,8 +264,9 @@ class PhaseOrchestrator:  # Renamed from GamePhaseOrchestrator
         agent: "BaseAgent",
         game_history: "GameHistory",  # may not be needed here anymore
     ) -> List[str]:
-        """Gets orders for a single power from its assigned agent."""
+        """Gets orders for a single power from its assigned agent, repairing any the game rejects."""
         phase = game_to_phase(game)
+        deadline = self._order_deadline()  # started by the phase's first request, before any agent answers
         try:
             logger.debug(f"Calling agent.decide_orders() for {power_name} (type: {type(agent).__name__})")
             order_objects: List[Order] = await asyncio.wait_for(
@@ -269,7 +274,6 @@ class PhaseOrchestrator:  # Renamed from GamePhaseOrchestrator
                 timeout=constants.ORDER_DECISION_TIMEOUT_SECONDS,
             )
             logger.debug(f"✅ {power_name}: Generated {len(order_objects)} orders")
-            return [str(o.value) for o in order_objects]
         except asyncio.TimeoutError:
             logger.error(f"❌ Timeout getting orders for {power_name}.")
             raise RuntimeError(f"Timeout getting orders for {power_name}")
@@ -277,6 +281,29 @@ class PhaseOrchestrator:  # Renamed from GamePhaseOrchestrator
             logger.error(f"❌ Error getting orders for {power_name}: {e}", exc_info=True)
             raise RuntimeError(f"Error getting orders for {power_name}: {e}") from e
 
+        # Rejected orders are re-requested for just those units, until the phase deadline.
+        game_manager = self.game_manager
+        if game_manager is None or game_manager.game is not game:
+            game_manager = GameManager(game)
+        repair = await repair_orders(
+            game_manager,
+            power_name,
+            agent,
+            phase,
+            [str(o.value) for o in order_objects],
+            deadline=deadline,
+        )
+        return repair.orders
+
+    def _order_deadline(self) -> float:
+        """The phase-level deadline for order repairs, started by the phase's first order request."""
+        if self.order_deadline is None:
+            seconds = getattr(
+                self.game_config, "order_phase_deadline_seconds", DEFAULT_ORDER_PHASE_DEADLINE_SECONDS
+            )
+            self.order_deadline = asyncio.get_running_loop().time() + seconds
+        return self.order_deadline
+
     async def _process_phase_results_and_updates(
         self,
         game: "Game",
@@ -1,6 +1,10 @@
+from __future__ import annotations
+
 import logging
-from typing import Dict, List, Optional
-from diplomacy import Game
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from diplomacy import Game
 
 logger = logging.getLogger(__name__)
 
@@ -93,14 +93,7 @@ class RetreatPhaseStrategy:
                     )
                     try:
                         await agent.decide_orders(phase)
-                        current_phase_key_for_bloc = (
-                            phase.key.state,
-                            phase.key.scs,
-                            phase.key.year,
-                            phase.key.season,
-                            phase.name,
-                        )
-                        all_bloc_orders_obj = agent.get_all_bloc_orders_for_phase(current_phase_key_for_bloc)
+                        all_bloc_orders_obj = agent.get_all_bloc_orders_for_phase(phase.key.position_hash)
 
                         for (
                             bloc_power_name,
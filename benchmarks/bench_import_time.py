@@ -0,0 +1,78 @@
+"""
+Benchmark: cold-start import cost of the prompt package and first-render cost
+with and without the template bytecode cache.
+
+Each measurement runs in a fresh interpreter. ``-X importtime`` totals are
+cumulative microseconds as reported by CPython; "jinja2 loaded" shows whether the
+import pulled in jinja2 at all (it should not: templates compile on first use).
+
+Usage:
+    python benchmarks/bench_import_time.py --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MODULES = ["ai_diplomacy.agents", "ai_diplomacy.agents.llm.prompt.strategy"]
+
+_FIRST_RENDER = """
+import time
+from ai_diplomacy.agents.llm.prompt.registry import TEMPLATE_REGISTRY
+start = time.perf_counter()
+for name in ("order_prompt.j2", "board_summary.j2", "negotiation_prompt.j2"):
+    TEMPLATE_REGISTRY.get(name)
+print(time.perf_counter() - start)
+"""
+
+
+def import_cost(module: str) -> tuple:
+    """(cumulative import microseconds, whether jinja2 was imported) for ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}, sys; print('jinja2' in sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            total = int(parts[1])
+    return total, result.stdout.strip() == "True"
+
+
+def first_compile_seconds(cache_dir: str) -> float:
+    env = dict(os.environ, AI_DIPLOMACY_TEMPLATE_CACHE=cache_dir)
+    result = subprocess.run(
+        [sys.executable, "-c", _FIRST_RENDER], capture_output=True, text=True, check=True, env=env
+    )
+    return float(result.stdout.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        samples = [import_cost(module) for _ in range(args.runs)]
+        median_us = statistics.median(us for us, _ in samples)
+        print(f"import {module}: {median_us / 1000:.1f} ms (median of {args.runs}), jinja2 loaded: {samples[0][1]}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = first_compile_seconds("off")
+        first_fill = first_compile_seconds(cache_dir)
+        warm = statistics.median(first_compile_seconds(cache_dir) for _ in range(args.runs))
+    print(f"first template load, no bytecode cache: {cold * 1000:.2f} ms")
+    print(f"first template load, filling cache:     {first_fill * 1000:.2f} ms")
+    print(f"first template load, warm cache:        {warm * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: movement-phase order collection wall-clock time against power count.
+
+Every simulated agent sleeps for a fixed latency before answering, standing in for
+an LLM round-trip. The serial run (max concurrency 1) should grow linearly with the
+number of powers; the concurrent run should stay close to a single latency. Only
+order collection (``MovementPhaseStrategy.collect_orders``) is timed; there are
+no negotiation rounds.
+
+Usage:
+    python benchmarks/bench_movement_concurrency.py --latency 0.2 --powers 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import List, Optional
+
+from ai_diplomacy.domain.history import GameHistory
+from ai_diplomacy.runtime.movement import MovementPhaseStrategy
+
+POWERS = ["AUSTRIA", "ENGLAND", "FRANCE", "GERMANY", "ITALY", "RUSSIA", "TURKEY"]
+
+
+class _SleepyOrchestrator:
+    """Just enough of PhaseOrchestrator for MovementPhaseStrategy."""
+
+    def __init__(self, powers: List[str], latency: float, max_concurrency: Optional[int]):
+        self.active_powers = powers
+        self.latency = latency
+        self.config = SimpleNamespace(
+            num_negotiation_rounds=0,
+            power_to_agent_id_map={},
+            max_concurrent_order_requests=max_concurrency,
+        )
+        agents = {p: SimpleNamespace(agent_id=p.lower(), country=p) for p in powers}
+        self.agent_manager = SimpleNamespace(get_agent=agents.get)
+
+    async def _get_orders_for_power(self, game, power_name, agent, game_history) -> List[str]:
+        await asyncio.sleep(self.latency)
+        return [f"A {power_name[:3]} H"]
+
+
+async def _run_phase(num_powers: int, latency: float, max_concurrency: Optional[int]) -> float:
+    powers = POWERS[:num_powers]
+    orchestrator = _SleepyOrchestrator(powers, latency, max_concurrency)
+    game = SimpleNamespace(powers={p: None for p in powers})
+    phase = SimpleNamespace(name="S1901M", board=SimpleNamespace(units={}, supply_centers={}))
+    history = GameHistory()
+    history.add_phase(phase.name)
+
+    start = time.perf_counter()
+    await MovementPhaseStrategy().collect_orders(game, phase, orchestrator, history)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated agent latency in seconds.")
+    parser.add_argument("--powers", type=int, default=len(POWERS), help="Largest power count to measure.")
+    parser.add_argument("--limit", type=int, default=0, help="Concurrency limit for the bounded run (0 = none).")
+    args = parser.parse_args()
+
+    print(f"{'powers':>6} {'serial (s)':>12} {'concurrent (s)':>15} {'speed-up':>9}")
+    for n in range(1, min(args.powers, len(POWERS)) + 1):
+        serial = asyncio.run(_run_phase(n, args.latency, 1))
+        concurrent = asyncio.run(_run_phase(n, args.latency, args.limit or None))
+        print(f"{n:>6} {serial:>12.3f} {concurrent:>15.3f} {serial / concurrent:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
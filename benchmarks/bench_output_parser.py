@@ -0,0 +1,49 @@
+"""
+Benchmark: per-tier cost of parsing model replies with the tiered OutputParser.
+
+Parses every reply in ``benchmarks/data/llm_outputs.jsonl`` (well-formed,
+fenced, JSON5-style, truncated and broken replies collected from local models)
+and reports which tier handled each case and what each tier costs.
+
+Usage:
+    python benchmarks/bench_output_parser.py --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from ai_diplomacy.agents.llm.output_parser import TIERS, OutputParser
+
+CORPUS = Path(__file__).parent / "data" / "llm_outputs.jsonl"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="passes over the corpus")
+    args = parser.parse_args()
+
+    cases = [json.loads(line) for line in CORPUS.read_text(encoding="utf-8").splitlines() if line.strip()]
+    output_parser = OutputParser()
+    print(f"{'case':<38} {'tier':>9} {'us/parse':>9} {'ok':>3}")
+    for case in cases:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            result = output_parser.parse(case["text"])
+        per_parse = (time.perf_counter() - started) / args.repeat * 1e6
+        ok = "yes" if result.value == case["expected"] else "NO"
+        print(f"{case['case'][:38]:<38} {result.tier or '-':>9} {per_parse:>9.1f} {ok:>3}")
+
+    stats = output_parser.stats
+    print(f"\n{'tier':>9} {'attempts':>9} {'successes':>10} {'us/attempt':>11}")
+    for tier in TIERS:
+        tier_stats = stats.tiers[tier]
+        print(f"{tier:>9} {tier_stats.attempts:>9} {tier_stats.successes:>10} {tier_stats.mean_microseconds:>11.1f}")
+    print(f"{'failed':>9} {stats.failures:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: prompt tokens a local backend must prefill, by prompt layout.
+
+Order prompts for every power are sent, phase by phase, to a StubLLMServer that
+reuses the KV cache for the prefix a prompt shares with the previous prompt in
+the same slot, as Ollama and llama.cpp do. "power-first" puts the power's own
+situation before the board and the instructions (the old layout);
+"stable-prefix" is the current LayeredPrompt order.
+
+Usage:
+    python benchmarks/bench_prompt_prefix.py --phases 6 --backend llamacpp
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from diplomacy import Game
+
+from ai_diplomacy.agents.llm.client import BACKEND_OLLAMA, BACKEND_OPENAI, LLMClient, LLMRequest, ModelEndpoint
+from ai_diplomacy.agents.llm.prompt.strategy import JinjaPromptStrategy, LayeredPrompt
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+from ai_diplomacy.domain import game_to_phase
+
+
+def _power_first(prompt: LayeredPrompt):
+    return [{"role": "user", "content": "\n\n".join((prompt.power, prompt.board, prompt.instructions))}]
+
+
+def _stable_prefix(prompt: LayeredPrompt):
+    return prompt.as_messages()
+
+
+def _phases(count: int):
+    game = Game()
+    phases = []
+    while len(phases) < count and not game.is_game_done:
+        phases.append(game_to_phase(game))
+        game.process()  # no orders: every unit holds
+    return phases
+
+
+async def _run(layout, phases, backend: str) -> StubLLMServer:
+    strategy = JinjaPromptStrategy()
+    async with StubLLMServer(reply='{"orders": []}') as server:
+        client = LLMClient()
+        if backend == "ollama":
+            endpoint = ModelEndpoint(BACKEND_OLLAMA, server.base_url, "stub", keep_alive="30m")
+        else:
+            endpoint = ModelEndpoint(BACKEND_OPENAI, server.base_url + "/v1", "stub", cache_prompt=True, slot=0)
+        client.register_model("stub", endpoint)
+        for phase in phases:
+            for power in phase.board.index.powers:
+                prompt = strategy.order_prompt(phase, power)
+                await client.complete(LLMRequest("stub", layout(prompt), temperature=0))
+        await client.aclose()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phases", type=int, default=6, help="game phases to prompt for")
+    parser.add_argument("--backend", choices=("llamacpp", "ollama"), default="llamacpp")
+    args = parser.parse_args()
+
+    phases = _phases(args.phases)
+    print(f"{len(phases)} phases x 7 powers, backend {args.backend}")
+    print(f"{'layout':>14} {'prompt tokens':>14} {'prefilled':>10} {'avoided':>10}")
+    for name, layout in (("power-first", _power_first), ("stable-prefix", _stable_prefix)):
+        server = asyncio.run(_run(layout, phases, args.backend))
+        total, evaluated = server.prompt_tokens_total, server.prompt_tokens_evaluated
+        print(f"{name:>14} {total:>14} {evaluated:>10} {1 - evaluated / total:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: order-prompt render time per phase against power count.
+
+"shared" is the current JinjaPromptStrategy: the board summary is rendered once
+per position and reused for every power. "unshared" clears the summary cache
+before each power, which is what rendering every prompt from scratch costs.
+
+Usage:
+    python benchmarks/bench_prompt_render.py --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from diplomacy import Game
+
+from ai_diplomacy.agents.llm.prompt import strategy
+from ai_diplomacy.domain import game_to_phase
+
+POWERS = ["AUSTRIA", "ENGLAND", "FRANCE", "GERMANY", "ITALY", "RUSSIA", "TURKEY"]
+
+
+def _render_phase(prompts: strategy.JinjaPromptStrategy, phase, powers, shared: bool) -> None:
+    strategy._BOARD_SUMMARY_CACHE.clear()
+    for power in powers:
+        if not shared:
+            strategy._BOARD_SUMMARY_CACHE.clear()
+        prompts.for_orders(phase, power)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="phases rendered per measurement")
+    args = parser.parse_args()
+
+    phase = game_to_phase(Game())
+    prompts = strategy.JinjaPromptStrategy()
+    _render_phase(prompts, phase, POWERS, shared=True)  # warm up template and orders caches
+
+    print(f"{'powers':>6} {'unshared ms/phase':>18} {'shared ms/phase':>16} {'speedup':>8}")
+    for count in range(1, len(POWERS) + 1):
+        timings = {}
+        for shared in (False, True):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                _render_phase(prompts, phase, POWERS[:count], shared)
+            timings[shared] = (time.perf_counter() - start) / args.repeat * 1000
+        print(f"{count:>6} {timings[False]:>18.3f} {timings[True]:>16.3f} {timings[False] / timings[True]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: time-to-orders and generated tokens with and without early stopping.
+
+A StubLLMServer streams an orders JSON object followed by a paragraph of prose,
+one token every ``--token-delay`` seconds, as chatty local models do. "full"
+reads the whole stream, which takes as long as a non-streamed call; "early-stop"
+feeds it to a JSONObjectScanner and closes the stream once the object is
+complete.
+
+Usage:
+    python benchmarks/bench_streaming.py --requests 7 --token-delay 0.01 --prose-tokens 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from ai_diplomacy.agents.llm.client import BACKEND_OLLAMA, LLMClient, LLMRequest, ModelEndpoint
+from ai_diplomacy.agents.llm.incremental_json import JSONObjectScanner
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+
+ORDERS = '{"orders": ["A PAR - BUR", "A MAR - SPA", "F BRE - MAO"]}'
+
+
+async def _run(early_stop: bool, requests: int, token_delay: float, reply: str):
+    async with StubLLMServer(reply=reply, token_delay=token_delay) as server:
+        client = LLMClient()
+        client.register_model("stub", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "stub"))
+        started = time.perf_counter()
+        for i in range(requests):
+            request = LLMRequest.from_prompt("stub", f"Orders for power {i}?")
+            stop = JSONObjectScanner().feed if early_stop else (lambda delta: False)
+            await client.complete(request, stop=stop)
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(token_delay * 5)  # let the server notice the closed streams
+        await client.aclose()
+    return elapsed / requests, server.tokens_generated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=7, help="order requests to send")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds per generated token")
+    parser.add_argument("--prose-tokens", type=int, default=200, help="tokens of prose after the JSON")
+    args = parser.parse_args()
+
+    reply = ORDERS + " Because" + " the position demands caution" * (args.prose_tokens // 4) + "."
+    print(f"{args.requests} requests, {args.token_delay * 1000:.0f} ms/token, ~{args.prose_tokens} prose tokens")
+    print(f"{'mode':>11} {'time-to-orders':>15} {'tokens generated':>17}")
+    results = {}
+    for name, early_stop in (("full", False), ("early-stop", True)):
+        latency, tokens = asyncio.run(_run(early_stop, args.requests, args.token_delay, reply))
+        results[name] = (latency, tokens)
+        print(f"{name:>11} {latency * 1000:>12.0f} ms {tokens:>17}")
+    (full_latency, full_tokens), (stop_latency, stop_tokens) = results["full"], results["early-stop"]
+    print(f"speedup {full_latency / stop_latency:.1f}x, tokens saved {1 - stop_tokens / full_tokens:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.agents.llm.client import BACKEND_OLLAMA, LLMClient, ModelEndpoint
+from ai_diplomacy.agents.llm.conversation import Conversation
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+from ai_diplomacy.agents.llm_agent import LLMAgent
+from ai_diplomacy.domain import game_to_phase
+from ai_diplomacy.domain.message import Message
+
+
+def _reply(body):
+    if "Summarize the conversation" in body["messages"][-1]["content"]:
+        return "France holds Paris and Marseilles; Germany promised to stay out of Burgundy."
+    return '{"orders": ["A PAR - BUR"]}'
+
+
+def _agent(server, **kwargs):
+    client = LLMClient()
+    client.register_model("stub", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "m"))
+    return LLMAgent("france", "FRANCE", "stub", llm_client=client, **kwargs), client
+
+
+@pytest.mark.unit
+async def test_later_phases_send_only_the_changes():
+    game = Game()
+    async with StubLLMServer(reply=_reply) as server:
+        agent, client = _agent(server, conversation_mode=True)
+        assert [o.value for o in await agent.decide_orders(game_to_phase(game))] == ["A PAR - BUR"]
+
+        game.set_orders("FRANCE", ["A PAR - BUR"])
+        game.process()
+        await agent.update_state(game_to_phase(game), [["A PAR - BUR", ""]])
+        await agent.receive_messages([Message(recipient="FRANCE", content="Stay out of Belgium.")])
+        await agent.decide_orders(game_to_phase(game))
+        await client.aclose()
+
+    first, second = (r.body["messages"] for r in server.requests)
+    assert [m["role"] for m in second] == ["system", "user", "assistant", "user"]
+    assert second[:2] == first
+    turn = second[-1]["content"]
+    assert "Unit positions" in first[1]["content"] and "Unit positions" not in turn
+    assert "- FRANCE: no longer A PAR; now A BUR" in turn
+    assert "A PAR - BUR" in turn.split("Results of the last adjudication:")[1]
+    assert "Stay out of Belgium." in turn
+
+    spring, fall = agent.token_ledger.entries
+    assert spring.mode == fall.mode == "conversation"
+    assert fall.new_tokens < spring.new_tokens < fall.sent_tokens
+
+
+@pytest.mark.unit
+async def test_conversation_is_compacted_once_over_budget():
+    phase = game_to_phase(Game())
+    async with StubLLMServer(reply=_reply) as server:
+        agent, client = _agent(server, conversation_mode=True, token_budget=900)
+        for _ in range(4):
+            await agent.decide_orders(phase)
+        await client.aclose()
+
+    conversation = agent.conversation
+    assert conversation.compactions == 1
+    assert [e.purpose for e in agent.token_ledger.entries].count("compaction") == 1
+    assert "Germany promised" in conversation.messages[1]["content"]
+    # The turn after a compaction carries the full board again.
+    assert "Unit positions" in server.requests[-1].body["messages"][-1]["content"]
+    assert conversation.tokens < agent.token_ledger.entries[-2].sent_tokens
+
+
+@pytest.mark.unit
+def test_compact_keeps_the_most_recent_turns():
+    conversation = Conversation("rules", keep_recent_turns=1)
+    conversation.record_exchange("turn 1", "reply 1")
+    conversation.record_exchange("turn 2", "reply 2")
+    conversation.compact("summary")
+
+    assert [m["content"] for m in conversation.messages][3:] == ["turn 2", "reply 2"]
+    assert conversation.messages[1]["content"].endswith("summary")
+    assert conversation.last_board is None
+
+
+@pytest.mark.unit
+async def test_stateless_mode_records_every_prompt_token_as_new():
+    game = Game()
+    async with StubLLMServer(reply=_reply) as server:
+        agent, client = _agent(server)
+        await agent.decide_orders(game_to_phase(game))
+        game.process()
+        await agent.decide_orders(game_to_phase(game))
+        await client.aclose()
+
+    totals = agent.token_ledger.by_phase()
+    assert list(totals) == ["S1901M", "F1901M"]
+    assert all(row["sent"] == row["new"] > 0 for row in totals.values())
+    assert {e.mode for e in agent.token_ledger.entries} == {"stateless"}
+    assert all(len(r.body["messages"]) == 2 for r in server.requests)
@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_diplomacy.agents.llm.client import (
+    BACKEND_OLLAMA,
+    LLMClient,
+    LLMClientError,
+    LLMRequest,
+    ModelEndpoint,
+)
+from ai_diplomacy.agents.llm.hedging import HedgePolicy, LatencyHistogram, hedges_from_env
+from ai_diplomacy.agents.llm.incremental_json import JSONObjectScanner
+from ai_diplomacy.agents.llm.output_parser import parse_json_object
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+
+ORDERS = '{"orders": ["A PAR - BUR"]}'
+
+
+@pytest.mark.unit
+def test_histogram_quantiles_follow_recent_latency():
+    histogram = LatencyHistogram(half_life=100)
+    for i in range(100):
+        histogram.record(0.1 if i < 90 else 2.0)
+    assert 0.1 <= histogram.quantile(0.5) < 0.12
+    assert 2.0 <= histogram.quantile(0.95) < 2.4
+
+    for _ in range(400):
+        histogram.record(1.0)
+    assert 1.0 <= histogram.quantile(0.5) < 1.2  # the older, faster samples have aged out
+
+    policy = HedgePolicy("fallback", percentile=0.95, min_samples=20, initial_delay=30.0, min_delay=0.5)
+    assert policy.delay(LatencyHistogram()) == 30.0
+    assert 1.0 <= policy.delay(histogram) < 1.2
+
+
+@pytest.mark.unit
+async def test_slow_call_is_hedged_and_the_loser_cancelled():
+    async with (
+        StubLLMServer(reply=ORDERS + " and a long explanation" * 50, token_delay=0.05) as slow,
+        StubLLMServer(reply=ORDERS) as fast,
+    ):
+        client = LLMClient()
+        client.register_model("slow", ModelEndpoint(BACKEND_OLLAMA, slow.base_url, "m"))
+        client.register_model("fast", ModelEndpoint(BACKEND_OLLAMA, fast.base_url, "m"))
+        client.register_hedge("slow", HedgePolicy("fast", initial_delay=0.1, min_delay=0.0))
+
+        started = time.perf_counter()
+        request = LLMRequest.from_prompt("slow", "orders please")
+        response = await client.complete(request, stop=JSONObjectScanner().feed)
+        elapsed = time.perf_counter() - started
+        for _ in range(100):
+            if slow.streams_cancelled:
+                break
+            await asyncio.sleep(0.01)
+        await client.aclose()
+
+    assert (response.text, response.model_id) == (ORDERS, "fast")
+    assert elapsed < 1.0
+    assert slow.streams_cancelled == 1 and client.stats["slow"].in_flight == 0
+    assert (client.stats["slow"].hedges, client.stats["slow"].hedge_wins) == (1, 1)
+
+
+@pytest.mark.unit
+async def test_fast_primary_is_not_hedged_and_its_latency_sets_the_threshold():
+    async with StubLLMServer(reply=ORDERS) as primary, StubLLMServer(reply=ORDERS) as secondary:
+        client = LLMClient()
+        client.register_model("primary", ModelEndpoint(BACKEND_OLLAMA, primary.base_url, "m"))
+        client.register_model("secondary", ModelEndpoint(BACKEND_OLLAMA, secondary.base_url, "m"))
+        client.register_hedge("primary", HedgePolicy("secondary", min_samples=5, min_delay=0.0))
+
+        assert client.hedge_delay("primary") == 30.0
+        for _ in range(5):
+            assert (await client.generate("primary", "hi")).model_id == "primary"
+        await client.aclose()
+
+    assert client.hedge_delay("primary") < 1.0
+    assert client.stats["primary"].hedges == 0 and secondary.requests == []
+    assert client.hedge_delay("secondary") is None
+
+
+@pytest.mark.unit
+async def test_failed_primary_cascades_to_the_fallback():
+    async with StubLLMServer(reply=ORDERS) as server:
+        client = LLMClient()
+        client.register_model("down", ModelEndpoint(BACKEND_OLLAMA, "http://127.0.0.1:9", "m"))
+        client.register_model("up", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "m"))
+        client.register_hedge("down", HedgePolicy("up"))
+        client.register_hedge("up", HedgePolicy("down"))  # cycles end at the models already tried
+
+        response = await client.generate("down", "hi")
+        await client.aclose()
+
+    assert (response.text, response.model_id) == (ORDERS, "up")
+    assert client.stats["down"].failures == 1 and client.stats["down"].hedge_wins == 1
+
+
+@pytest.mark.unit
+async def test_a_reply_failing_the_callers_check_loses_to_a_valid_fallback():
+    async with (
+        StubLLMServer(reply="I would rather talk first.") as chatty,
+        StubLLMServer(reply=ORDERS) as strict,
+    ):
+        client = LLMClient()
+        client.register_model("chatty", ModelEndpoint(BACKEND_OLLAMA, chatty.base_url, "m"))
+        client.register_model("strict", ModelEndpoint(BACKEND_OLLAMA, strict.base_url, "m"))
+        client.register_hedge("chatty", HedgePolicy("strict", initial_delay=5.0, min_delay=0.0))
+
+        request = LLMRequest.from_prompt("chatty", "orders please")
+        response = await client.complete(request, accept=lambda text: parse_json_object(text) is not None)
+        await client.aclose()
+
+    assert (response.text, response.model_id) == (ORDERS, "strict")
+    assert client.stats["chatty"].hedge_wins == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("fallback_outcome", ["cancelled", "error"])
+async def test_cancelled_calls_never_leak_cancelled_error(monkeypatch, fallback_outcome):
+    client = LLMClient()
+    client.register_hedge("primary", HedgePolicy("fallback", initial_delay=0.0, min_delay=0.0))
+
+    async def attempt(request, stop, accept=None):
+        await asyncio.sleep(0)
+        if request.model_id == "primary" or fallback_outcome == "cancelled":
+            raise asyncio.CancelledError()  # e.g. the call's own nested hedge or an outer timeout
+        raise LLMClientError("fallback is down")
+
+    monkeypatch.setattr(client, "_attempt", attempt)
+    with pytest.raises(LLMClientError) as raised:
+        await client.generate("primary", "hi")
+
+    expected = "were both cancelled" if fallback_outcome == "cancelled" else "fallback is down"
+    assert expected in str(raised.value)
+
+
+@pytest.mark.unit
+def test_hedges_are_read_from_the_environment(monkeypatch):
+    monkeypatch.setenv("AI_DIPLOMACY_LLM_HEDGE", "openai/gpt-4o=openai/gpt-4o-mini, broken")
+    monkeypatch.setenv("AI_DIPLOMACY_LLM_HEDGE_PERCENTILE", "90")
+    assert hedges_from_env() == {"openai/gpt-4o": HedgePolicy("openai/gpt-4o-mini", percentile=0.9)}
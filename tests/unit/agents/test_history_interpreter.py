@@ -0,0 +1,67 @@
+import pytest
+
+from ai_diplomacy.agents import history_interpreter
+from ai_diplomacy.agents.history_interpreter import get_previous_phases_history
+from ai_diplomacy.domain.history import GameHistory, Message
+
+POWERS = ["FRANCE", "GERMANY", "ENGLAND"]
+
+
+def _history() -> GameHistory:
+    history = GameHistory()
+    history.add_phase("S1901M")
+    history.add_message("S1901M", "FRANCE", "GERMANY", "Bounce in BUR?")
+    history.add_message("S1901M", "GERMANY", "GLOBAL", "Peace in the west.")
+    history.add_orders("S1901M", "FRANCE", ["A PAR - BUR"])
+    history.add_orders("S1901M", "GERMANY", ["A MUN - BUR"])
+    history.add_phase("F1901M")
+    history.add_plan("F1901M", "FRANCE", "Take BEL")
+    history.add_phase("W1901A")
+    return history
+
+
+def _rendered(history: GameHistory):
+    return [get_previous_phases_history(history, power, "W1901A") for power in POWERS]
+
+
+def _uncached(history: GameHistory):
+    return _rendered(GameHistory.from_dict(history.to_dict()))
+
+
+@pytest.mark.unit
+def test_cached_phase_blocks_match_a_fresh_render_after_every_mutation(monkeypatch):
+    renders = []
+    render = history_interpreter._render_previous_phase
+    monkeypatch.setattr(
+        history_interpreter,
+        "_render_previous_phase",
+        lambda phase, power: renders.append((phase.name, power)) or render(phase, power),
+    )
+    history = _history()
+    assert _rendered(history) == _uncached(history)
+    renders.clear()
+
+    cached = _rendered(history)
+    assert renders == [], "an unchanged history is served from the cache"
+    assert cached == _uncached(history)
+
+    mutations = [
+        # Results arrive for a phase that has already closed.
+        lambda: history.add_results("S1901M", "FRANCE", [["bounce"]]),
+        lambda: history.add_message("S1901M", "ENGLAND", "FRANCE", "Late note."),
+        lambda: history.phases[0].messages.append(Message("GERMANY", "FRANCE", "Appended directly.")),
+        lambda: history.add_orders("F1901M", "ENGLAND", ["F LON - NTH"]),
+        lambda: history.add_plan("F1901M", "GERMANY", "Hold"),
+    ]
+    for mutate in mutations:
+        before = _rendered(history)
+        mutate()
+        renders.clear()
+        after = _rendered(history)
+        rerendered = list(renders)
+        assert after == _uncached(history)
+        assert after != before
+        assert rerendered and all(name in ("S1901M", "F1901M") for name, _ in rerendered)
+        assert len(rerendered) <= len(POWERS), "only the mutated phase is re-rendered"
+
+    assert "A PAR - BUR (bounce)" in _rendered(history)[0]
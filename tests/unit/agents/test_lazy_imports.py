@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("diplomacy", "jinja2", "pandas", "networkx", "ollama", "google.genai", "llm")
+
+
+def _import_in_fresh_interpreter(statement: str) -> dict:
+    """Runs ``statement`` under ``-X importtime`` and reports what got loaded."""
+    probe = (
+        f"{statement}\n"
+        "import json, sys\n"
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        # Top-level entries carry a single space of indentation; their cumulative time covers the subtree.
+        if len(parts) == 3 and parts[2].startswith(" ai_diplomacy") and not parts[2].startswith("  "):
+            cumulative_us += int(parts[1])
+    return {"heavy": json.loads(proc.stdout.strip().splitlines()[-1]), "ai_diplomacy_us": cumulative_us}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import ai_diplomacy",
+        "import ai_diplomacy.domain",
+        "import ai_diplomacy.agents",
+        "import ai_diplomacy.runtime",
+        "from ai_diplomacy.agents import NullAgent, ScriptedAgent",
+    ],
+)
+def test_package_imports_stay_light(statement):
+    result = _import_in_fresh_interpreter(statement)
+    print(f"{statement}: ai_diplomacy {result['ai_diplomacy_us'] / 1000:.1f} ms")
+    assert result["heavy"] == []
+
+
+@pytest.mark.unit
+def test_lazy_exports_resolve_and_are_cached():
+    import ai_diplomacy.agents as agents
+    from ai_diplomacy.domain.order import Order
+
+    assert "LLMPromptStrategy" in dir(agents)
+    assert agents.Order is Order
+    assert agents.__dict__["Order"] is Order
+    with pytest.raises(AttributeError):
+        agents.HumanAgent
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.agents.llm.client import (
+    BACKEND_OLLAMA,
+    BACKEND_OPENAI,
+    STRUCTURED_GRAMMAR,
+    STRUCTURED_JSON_SCHEMA,
+    LLMClient,
+    LLMTimeoutError,
+    ModelEndpoint,
+    resolve_model,
+)
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+from ai_diplomacy.agents.llm_agent import LLMAgent
+from ai_diplomacy.domain import game_to_phase
+
+
+@pytest.mark.unit
+async def test_requests_reuse_pooled_connections():
+    async with StubLLMServer(reply='{"orders": ["A PAR H"]}') as server:
+        client = LLMClient()
+        client.register_model("local", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "gemma3:12b"))
+        for _ in range(5):
+            response = await client.generate("local", "orders please")
+            assert response.text == '{"orders": ["A PAR H"]}'
+        await client.aclose()
+
+    assert server.connections == 1
+    assert server.requests[0].path == "/api/chat"
+    assert server.requests[0].body["model"] == "gemma3:12b"
+    assert client.stats["local"].requests == 5
+
+
+@pytest.mark.unit
+async def test_local_models_are_serialized_and_remote_models_fan_out():
+    async with StubLLMServer(latency=0.05) as server:
+        client = LLMClient()
+        client.register_model("local", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "gemma3:12b"))
+        client.register_model(
+            "remote", ModelEndpoint(BACKEND_OPENAI, server.base_url + "/v1", "gpt", max_concurrency=4)
+        )
+
+        await asyncio.gather(*(client.generate("local", "hi") for _ in range(4)))
+        assert server.max_in_flight == 1
+        assert client.stats["local"].total_queued > 0
+
+        server.max_in_flight = 0
+        responses = await asyncio.gather(*(client.generate("remote", "hi") for _ in range(4)))
+        assert server.max_in_flight == 4
+        assert server.requests[-1].path == "/v1/chat/completions"
+        assert all(r.completion_tokens for r in responses)
+        await client.aclose()
+
+
+@pytest.mark.unit
+async def test_timeout_is_enforced_by_the_client():
+    async with StubLLMServer(latency=0.5) as server:
+        client = LLMClient()
+        client.register_model("slow", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "m", timeout=0.05))
+        with pytest.raises(LLMTimeoutError):
+            await client.generate("slow", "hi")
+        assert client.stats["slow"].timeouts == 1
+
+        server.latency = 0.0
+        assert (await client.generate("slow", "hi")).text
+        await client.aclose()
+
+
+@pytest.mark.unit
+def test_model_ids_select_backends(monkeypatch):
+    monkeypatch.setenv("OLLAMA_HOST", "127.0.0.1:11500")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.delenv("OLLAMA_KEEP_ALIVE", raising=False)
+    monkeypatch.delenv("LLAMACPP_SLOT", raising=False)
+
+    assert resolve_model("gemma3:12b") == ModelEndpoint(
+        BACKEND_OLLAMA,
+        "http://127.0.0.1:11500",
+        "gemma3:12b",
+        keep_alive="30m",
+        structured_output=STRUCTURED_JSON_SCHEMA,
+    )
+    assert resolve_model("hf.co/org/model").model == "hf.co/org/model"
+    remote = resolve_model("openai/gpt-4o-mini")
+    assert (remote.backend, remote.model, remote.api_key) == (BACKEND_OPENAI, "gpt-4o-mini", "sk-test")
+    assert remote.max_concurrency > 1
+    local = resolve_model("llamacpp/qwen")
+    assert (local.backend, local.cache_prompt, local.slot, local.max_concurrency) == (BACKEND_OPENAI, True, 0, 1)
+    assert (local.structured_output, remote.structured_output) == (STRUCTURED_GRAMMAR, None)
+
+
+@pytest.mark.unit
+async def test_llm_agent_orders_and_messages_come_from_the_shared_client():
+    def reply(body):
+        instructions = body["messages"][0]["content"]
+        if "negotiation phase" in instructions:
+            return 'Sure: {"messages": [{"recipient": "germany", "content": "DMZ?"}, {"recipient": "ALL", "content": "Peace"}]}'
+        return '```json\n{"orders": ["A PAR - BUR", " F BRE - MAO "]}\n```'
+
+    phase = game_to_phase(Game())
+    async with StubLLMServer(reply=reply) as server:
+        client = LLMClient()
+        client.register_model("stub", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "stub"))
+        agent = LLMAgent("france_1", "FRANCE", model_id="stub", llm_client=client)
+
+        assert [o.value for o in await agent.decide_orders(phase)] == ["A PAR - BUR", "F BRE - MAO"]
+        messages = await agent.negotiate(phase)
+        await client.aclose()
+
+    assert [(m.recipient, m.message_type) for m in messages] == [("GERMANY", "private"), ("GLOBAL", "global")]
+    assert "A PAR" in server.requests[0].body["messages"][-1]["content"]
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.agents.llm.client import BACKEND_OLLAMA, LLMClient, ModelEndpoint
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+from ai_diplomacy.agents import opening_book
+from ai_diplomacy.agents.llm_agent import LLMAgent
+from ai_diplomacy.agents.opening_book import OpeningBook, config_fingerprint
+from ai_diplomacy.domain import game_to_phase
+
+
+@pytest.mark.unit
+def test_book_samples_recorded_choices_by_frequency(tmp_path):
+    book = OpeningBook(tmp_path / "book.sqlite3", min_samples=2, explore=0.0, rng=random.Random(7))
+    fp = config_fingerprint(model="m", temperature=0.7)
+
+    book.record(fp, 0xFFFF_FFFF_FFFF_FFFF, "FRANCE", ["F BRE - MAO", "A PAR - BUR"])
+    assert book.lookup(fp, 0xFFFF_FFFF_FFFF_FFFF, "FRANCE") is None  # below min_samples
+    book.record(fp, 0xFFFF_FFFF_FFFF_FFFF, "FRANCE", ["A PAR - BUR", "F BRE - MAO"])  # same set, other order
+    book.record(fp, 0xFFFF_FFFF_FFFF_FFFF, "FRANCE", ["A PAR - PIC"])
+
+    assert book.choices(fp, 0xFFFF_FFFF_FFFF_FFFF, "FRANCE") == [
+        (["A PAR - BUR", "F BRE - MAO"], 2),
+        (["A PAR - PIC"], 1),
+    ]
+    served = {tuple(book.lookup(fp, 0xFFFF_FFFF_FFFF_FFFF, "FRANCE")) for _ in range(50)}
+    assert served == {("A PAR - BUR", "F BRE - MAO"), ("A PAR - PIC",)}
+    assert book.lookup(config_fingerprint(model="other"), 0xFFFF_FFFF_FFFF_FFFF, "FRANCE") is None
+    assert book.lookup(fp, 0xFFFF_FFFF_FFFF_FFFF, "GERMANY") is None
+
+
+FRANCE_OPENING = '{"orders": ["A PAR - BUR", "A MAR - SPA", "F BRE - MAO"]}'
+
+
+@pytest.mark.unit
+async def test_agents_replay_openings_instead_of_calling_the_model(tmp_path):
+    book = OpeningBook(tmp_path / "book.sqlite3", min_samples=1, explore=0.0)
+    phase = game_to_phase(Game())
+    async with StubLLMServer(reply=FRANCE_OPENING) as server:
+        client = LLMClient()
+        client.register_model("stub", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "stub"))
+
+        def agent(model_id="stub"):
+            return LLMAgent("france", "FRANCE", model_id=model_id, llm_client=client, opening_book=book)
+
+        first = [o.value for o in await agent().decide_orders(phase)]
+        assert sorted(o.value for o in await agent().decide_orders(phase)) == sorted(first)
+        assert len(server.requests) == 1
+
+        client.register_model("other", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "other"))
+        await agent("other").decide_orders(phase)  # a different configuration has its own book
+        assert len(server.requests) == 2
+        await client.aclose()
+
+    assert (book.stats.hits, book.stats.recorded) == (1, 2)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("constrained", [True, False])
+async def test_partial_or_illegal_order_sets_are_not_booked(tmp_path, constrained):
+    book = OpeningBook(tmp_path / "book.sqlite3", min_samples=1, explore=0.0)
+    phase = game_to_phase(Game())
+    async with StubLLMServer(reply='{"orders": ["A PAR - BUR", "A MAR - MUN", "F BRE - MAO"]}') as server:
+        client = LLMClient()
+        client.register_model("stub", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "stub"))
+        agent = LLMAgent(
+            "france", "FRANCE", "stub", llm_client=client, opening_book=book, constrained_orders=constrained
+        )
+        assert await agent.decide_orders(phase)
+        await client.aclose()
+
+    assert book.stats.recorded == 0
+
+
+@pytest.mark.unit
+def test_shared_book_explores_by_default_and_reads_its_settings_from_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setattr(opening_book, "_SHARED_BOOK", None)
+    monkeypatch.setenv(opening_book.OPENING_BOOK_ENV, str(tmp_path / "default.sqlite3"))
+    default = opening_book.get_opening_book()
+    assert default.min_samples >= 3 and default.explore > 0
+
+    monkeypatch.setenv(opening_book.OPENING_BOOK_ENV, str(tmp_path / "tuned.sqlite3"))
+    monkeypatch.setenv(opening_book.OPENING_BOOK_MIN_SAMPLES_ENV, "5")
+    monkeypatch.setenv(opening_book.OPENING_BOOK_EXPLORE_ENV, "0.25")
+    tuned = opening_book.get_opening_book()
+    assert (tuned.min_samples, tuned.explore) == (5, 0.25)
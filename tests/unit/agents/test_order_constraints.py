@@ -0,0 +1,82 @@
+import pytest
+from diplomacy import Game
+from pydantic import ValidationError
+
+from ai_diplomacy.agents.llm.client import (
+    BACKEND_OLLAMA,
+    BACKEND_OPENAI,
+    STRUCTURED_GRAMMAR,
+    STRUCTURED_JSON_SCHEMA,
+    LLMClient,
+    ModelEndpoint,
+)
+from ai_diplomacy.agents.llm.order_constraints import OrderConstraint, order_constraint
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+from ai_diplomacy.agents.llm_agent import LLMAgent
+from ai_diplomacy.domain import game_to_phase
+
+
+@pytest.mark.unit
+def test_schema_has_one_enum_of_legal_orders_per_unit():
+    phase = game_to_phase(Game())
+    constraint = order_constraint(phase, "FRANCE")
+    orders = constraint.json_schema["properties"]["orders"]
+
+    assert [location for location, _ in constraint.locations] == ["BRE", "MAR", "PAR"]
+    assert orders["minItems"] == orders["maxItems"] == 3 and orders["items"] is False
+    assert set(orders["prefixItems"][2]["enum"]) == set(phase.possible_orders.orders_for_location("PAR"))
+    assert order_constraint(phase, "FRANCE") is constraint  # shared, with its compiled validator
+
+    grammar = constraint.gbnf
+    assert grammar.startswith(
+        'root ::= "{" ws "\\"orders\\"" ws ":" ws "[" ws unit0 ws "," ws unit1 ws "," ws unit2'
+    )
+    assert '"\\"A PAR - BUR\\""' in grammar.splitlines()[3]
+
+
+@pytest.mark.unit
+def test_validation_keeps_legal_orders_once_per_unit():
+    constraint = order_constraint(game_to_phase(Game()), "FRANCE")
+
+    valid = constraint.validate({"orders": ["F BRE - MAO", " A PAR - BUR ", "A MAR - SPA"]})
+    assert valid.orders == ["F BRE - MAO", "A PAR - BUR", "A MAR - SPA"] and valid.rejected == []
+
+    mixed = constraint.validate({"orders": ["A PAR - MUN", "A PAR - BUR", "A PAR H", 7]})
+    assert mixed.orders == ["A PAR - BUR"]
+    assert mixed.rejected == ["A PAR - MUN", "A PAR H", 7]
+
+    with pytest.raises(ValidationError):
+        constraint.validator.model_validate({"orders": ["A PAR - BUR", "A PAR H"]})
+
+
+@pytest.mark.unit
+def test_adjustment_phase_allows_any_subset():
+    constraint = OrderConstraint(
+        "FRANCE", (("PAR", ("A PAR B", "WAIVE")), ("BRE", ("A BRE B", "F BRE B"))), optional=True
+    )
+    orders = constraint.json_schema["properties"]["orders"]
+    assert orders["maxItems"] == 2 and "prefixItems" not in orders
+    assert constraint.validate({"orders": ["F BRE B"]}).orders == ["F BRE B"]
+    assert '(order (ws "," ws order)*)?' in constraint.gbnf
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "backend, structured, field",
+    [
+        (BACKEND_OLLAMA, STRUCTURED_JSON_SCHEMA, "format"),
+        (BACKEND_OPENAI, STRUCTURED_GRAMMAR, "grammar"),
+    ],
+)
+async def test_agent_sends_the_constraint_and_drops_illegal_orders(backend, structured, field):
+    async with StubLLMServer(reply='{"orders": ["A PAR - BUR", "A MAR - MUN"]}') as server:
+        client = LLMClient()
+        base_url = server.base_url if backend == BACKEND_OLLAMA else server.base_url + "/v1"
+        client.register_model("stub", ModelEndpoint(backend, base_url, "m", structured_output=structured))
+        agent = LLMAgent("france", "FRANCE", "stub", llm_client=client)
+        orders = await agent.decide_orders(game_to_phase(Game()))
+        await client.aclose()
+
+    assert [o.value for o in orders] == ["A PAR - BUR"]
+    body = server.requests[0].body
+    assert field in body and ("format" in body) + ("grammar" in body) + ("json_schema" in body) == 1
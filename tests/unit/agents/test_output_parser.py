@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from ai_diplomacy.agents.llm.output_parser import OutputParser
+
+CORPUS = Path(__file__).parents[3] / "benchmarks" / "data" / "llm_outputs.jsonl"
+ORDERS = {"orders": ["A PAR - BUR"]}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "text, tier",
+    [
+        ('{"orders": ["A PAR - BUR"]}', "strict"),
+        ('Orders:\n```json\n{"orders": ["A PAR - BUR"]}\n```', "embedded"),
+        ("{orders: ['A PAR - BUR',],}", "json5"),
+        ('{"orders": ["A PAR - BUR", "A MAR - S', "partial"),
+        ('{"orders": ["A PAR - BUR"}', "repair"),
+    ],
+)
+def test_each_reply_is_handled_by_the_cheapest_tier_that_can(text, tier):
+    result = OutputParser().parse(text)
+    assert (result.value, result.tier) == (ORDERS, tier)
+
+
+@pytest.mark.unit
+def test_stats_record_attempts_successes_and_time_per_tier():
+    parser = OutputParser()
+    parser.parse('{"orders": []}')
+    parser.parse("{'orders': []}")
+    parser.parse("no json here")
+
+    tiers = parser.stats.tiers
+    assert (tiers["strict"].attempts, tiers["strict"].successes) == (3, 1)
+    assert (tiers["json5"].attempts, tiers["json5"].successes) == (2, 1)
+    assert tiers["repair"].attempts == 1 and parser.stats.failures == 1
+    assert parser.stats.parsed == 2
+    assert all(t.seconds > 0 for t in tiers.values() if t.attempts)
+
+
+@pytest.mark.unit
+def test_benchmark_corpus_parses_as_expected():
+    parser = OutputParser()
+    cases = [json.loads(line) for line in CORPUS.read_text(encoding="utf-8").splitlines() if line.strip()]
+    mismatches = [case["case"] for case in cases if parser.parse(case["text"]).value != case["expected"]]
+    assert mismatches == []
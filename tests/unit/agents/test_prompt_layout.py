@@ -0,0 +1,73 @@
+from collections import OrderedDict
+
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.agents.llm.client import BACKEND_OPENAI, LLMClient, LLMRequest, ModelEndpoint
+from ai_diplomacy.agents.llm.prompt import strategy as strategy_module
+from ai_diplomacy.agents.llm.prompt.registry import TEMPLATE_REGISTRY
+from ai_diplomacy.agents.llm.prompt.strategy import JinjaPromptStrategy
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+from ai_diplomacy.domain import game_to_phase
+
+
+@pytest.mark.unit
+def test_prompts_start_with_text_shared_by_all_powers():
+    game = Game()
+    strategy = JinjaPromptStrategy()
+    spring = game_to_phase(game)
+    france, germany = strategy.order_prompt(spring, "FRANCE"), strategy.order_prompt(spring, "GERMANY")
+    game.process()
+    fall = strategy.order_prompt(game_to_phase(game), "FRANCE")
+
+    assert france.instructions == germany.instructions == fall.instructions
+    assert france.board == germany.board != fall.board
+    assert "FRANCE" not in france.instructions + france.board.split("Unit positions")[0]
+    assert france.text.startswith(france.instructions) and france.text.endswith(france.power)
+    assert strategy.for_orders(spring, "FRANCE") == france.text
+
+
+@pytest.mark.unit
+async def test_backend_reuses_the_cached_prefix_and_gets_affinity_hints():
+    strategy = JinjaPromptStrategy()
+    phase = game_to_phase(Game())
+    async with StubLLMServer() as server:
+        client = LLMClient()
+        client.register_model(
+            "local", ModelEndpoint(BACKEND_OPENAI, server.base_url + "/v1", "m", cache_prompt=True, slot=0)
+        )
+        first = await client.complete(
+            LLMRequest("local", strategy.order_prompt(phase, "FRANCE").as_messages())
+        )
+        second = await client.complete(
+            LLMRequest("local", strategy.order_prompt(phase, "GERMANY").as_messages())
+        )
+        await client.aclose()
+
+    assert first.cached_prompt_tokens == 0
+    assert 0 < second.cached_prompt_tokens < second.prompt_tokens
+    assert (server.requests[0].body["cache_prompt"], server.requests[0].body["id_slot"]) == (True, 0)
+
+
+@pytest.mark.unit
+def test_board_summary_is_rendered_once_per_position(monkeypatch):
+    monkeypatch.setattr(strategy_module, "_BOARD_SUMMARY_CACHE", OrderedDict())
+    template = TEMPLATE_REGISTRY.get(strategy_module.BOARD_SUMMARY_TEMPLATE_NAME)
+    renders = []
+    render = template.render
+    monkeypatch.setattr(
+        template, "render", lambda **context: renders.append(context["phase_name"]) or render(**context)
+    )
+
+    game = Game()
+    strategy = JinjaPromptStrategy()
+    spring, same_position = game_to_phase(game), game_to_phase(game)
+    france = strategy.order_prompt(spring, "FRANCE")
+    germany = strategy.order_prompt(same_position, "GERMANY")
+    assert renders == ["S1901M"]
+    assert france.board == germany.board
+    assert strategy_module.board_summary(spring) is strategy_module.board_summary(same_position)
+
+    game.process()
+    fall = strategy.order_prompt(game_to_phase(game), "FRANCE")
+    assert renders == ["S1901M", "F1901M"] and fall.board != france.board
@@ -0,0 +1,92 @@
+import pytest
+
+from ai_diplomacy.agents.llm.client import BACKEND_OLLAMA, LLMClient, LLMRequest, ModelEndpoint
+from ai_diplomacy.agents.llm.response_cache import ResponseCache
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _request(prompt, temperature=0):
+    return LLMRequest.from_prompt("m", prompt, temperature=temperature)
+
+
+@pytest.mark.unit
+def test_lru_eviction_and_ttl(tmp_path):
+    clock = _Clock()
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_entries=2, ttl=60, clock=clock)
+    cache.put(_request("a"), "A")
+    clock.now += 1
+    cache.put(_request("b"), "B")
+    clock.now += 1
+    assert cache.get(_request("a")).text == "A"  # "a" is now the most recently used
+    clock.now += 1
+    cache.put(_request("c"), "C")
+
+    assert cache.get(_request("b")) is None
+    assert [cache.get(_request(p)).text for p in "ac"] == ["A", "C"]
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (3, 1, 1)
+
+    clock.now += 61
+    assert cache.get(_request("a")) is None
+    assert cache.stats.expired == 1 and len(cache) == 1
+
+
+@pytest.mark.unit
+def test_modes_and_sampled_requests(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    writer = ResponseCache(path)
+    writer.put(_request("hot", temperature=0.7), "sampled")  # not deterministic: not stored
+    writer.put(_request("cold"), "stored")
+    writer.close()
+
+    reader = ResponseCache(path, "read-only")
+    assert reader.get(_request("cold")).text == "stored"
+    reader.put(_request("new"), "ignored")
+    assert reader.get(_request("new")) is None
+    assert reader.get(_request("hot", temperature=0.7)) is None and reader.stats.bypassed == 1
+
+    sampled = ResponseCache(path, deterministic_only=False)
+    sampled.put(_request("hot", temperature=0.7), "sampled")
+    assert sampled.get(_request("hot", temperature=0.7)).text == "sampled"
+
+    with pytest.raises(ValueError):
+        ResponseCache(path, "sometimes")
+
+
+@pytest.mark.unit
+async def test_client_skips_the_model_on_a_hit(tmp_path):
+    async with StubLLMServer(reply='{"orders": []}') as server:
+        client = LLMClient(response_cache=ResponseCache(tmp_path / "cache.sqlite3"))
+        client.register_model("m", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "m"))
+
+        first = await client.generate("m", "S1901M orders", temperature=0)
+        second = await client.generate("m", "S1901M orders", temperature=0)
+        await client.generate("m", "S1901M orders", temperature=0, max_tokens=50)  # different parameters
+        await client.aclose()
+
+    assert (first.cached, second.cached) == (False, True)
+    assert second.text == first.text
+    assert len(server.requests) == 2
+
+
+@pytest.mark.unit
+async def test_client_never_caches_an_empty_reply(tmp_path):
+    async with StubLLMServer(reply="  \n") as server:
+        cache = ResponseCache(tmp_path / "cache.sqlite3")
+        client = LLMClient(response_cache=cache)
+        client.register_model("m", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "m"))
+
+        first = await client.generate("m", "S1901M orders", temperature=0)
+        second = await client.generate("m", "S1901M orders", temperature=0)
+        await client.aclose()
+
+    assert (first.cached, second.cached) == (False, False)
+    assert len(server.requests) == 2
+    assert cache.stats.writes == 0 and len(cache) == 0
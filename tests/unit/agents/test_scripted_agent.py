@@ -0,0 +1,37 @@
+import pytest
+
+from ai_diplomacy.agents.scripted_agent import ScriptedAgent
+from ai_diplomacy.domain.board import BoardState
+from ai_diplomacy.domain.state import PhaseState
+
+
+def _phase(phase_type, units, centers):
+    return PhaseState(
+        phase_name="S1901M",
+        year=1901,
+        season="SPRING",
+        phase_type=phase_type,
+        powers=frozenset(units) | frozenset(centers),
+        units={p: [u for u in us if not u.startswith("*")] for p, us in units.items()},
+        supply_centers=centers,
+        board=BoardState(units, centers),
+    )
+
+
+@pytest.mark.unit
+async def test_defensive_orders_come_from_the_board():
+    agent = ScriptedAgent("fr", "FRANCE", personality="defensive")
+    phase = _phase("MOVEMENT", {"FRANCE": ["A PAR", "F BRE"]}, {"FRANCE": ["BRE"], "GERMANY": ["PAR"]})
+
+    # F BRE holds its center; A PAR's only French center in reach (BRE) already holds a French unit.
+    assert [str(o) for o in await agent.decide_orders(phase)] == ["F BRE H", "A PAR H"]
+
+
+@pytest.mark.unit
+async def test_retreats_disband_only_dislodged_units_and_removals_follow_center_count():
+    agent = ScriptedAgent("fr", "FRANCE")
+    retreat = _phase("RETREAT", {"FRANCE": ["A PAR", "*A BUR"], "GERMANY": ["A BUR"]}, {"FRANCE": ["PAR"]})
+    assert [str(o) for o in await agent.decide_orders(retreat)] == ["A BUR D"]
+
+    adjustment = _phase("ADJUSTMENT", {"FRANCE": ["A PAR", "A PIC", "F BRE"]}, {"FRANCE": ["PAR"]})
+    assert [str(o) for o in await agent.decide_orders(adjustment)] == ["F BRE D", "A PAR D"]
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.agents.llm.client import BACKEND_OLLAMA, BACKEND_OPENAI, LLMClient, ModelEndpoint
+from ai_diplomacy.agents.llm.conversation import approx_tokens
+from ai_diplomacy.agents.llm.incremental_json import JSONObjectScanner, partial_json_object
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer, stub_tokens
+from ai_diplomacy.agents.llm_agent import LLMAgent
+from ai_diplomacy.domain import game_to_phase
+
+ORDERS = '{"orders": ["A PAR - BUR", "A MAR - SPA", "F BRE - MAO"]}'
+PROSE = " I chose these orders because" + " the position demands caution" * 40 + "."
+
+
+@pytest.mark.unit
+def test_scanner_reports_when_the_top_level_object_closes():
+    text = 'Sure! ```json\n{"messages": [{"recipient": "ITALY", "content": "a \\"}\\" {[ brace"}]}\n``` Hope this helps.'
+    scanner = JSONObjectScanner()
+    closed_at = next(i for i, token in enumerate(stub_tokens(text)) if scanner.feed(token))
+
+    assert "Hope" not in "".join(stub_tokens(text)[: closed_at + 1])
+    assert scanner.result() == {"messages": [{"recipient": "ITALY", "content": 'a "}" {[ brace'}]}
+
+
+@pytest.mark.unit
+def test_partial_object_keeps_only_complete_values():
+    assert partial_json_object('{"orders": ["A PAR - BUR", "A MAR - S') == {"orders": ["A PAR - BUR"]}
+    assert partial_json_object('{"messages": [{"recipient": "ITALY", "content": "hi"}, {"reci') == {
+        "messages": [{"recipient": "ITALY", "content": "hi"}]
+    }
+    assert partial_json_object('{"orders": [') is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", [BACKEND_OLLAMA, BACKEND_OPENAI])
+async def test_agent_stops_the_stream_once_the_orders_are_complete(backend):
+    async with StubLLMServer(reply=ORDERS + PROSE, token_delay=0.002) as server:
+        client = LLMClient()
+        base_url = server.base_url if backend == BACKEND_OLLAMA else server.base_url + "/v1"
+        client.register_model("stub", ModelEndpoint(backend, base_url, "m"))
+        agent = LLMAgent("france", "FRANCE", "stub", llm_client=client)
+        orders = await agent.decide_orders(game_to_phase(Game()))
+        for _ in range(100):
+            if server.streams_cancelled:
+                break
+            await asyncio.sleep(0.01)
+        await client.aclose()
+
+    assert [o.value for o in orders] == ["A PAR - BUR", "A MAR - SPA", "F BRE - MAO"]
+    assert server.requests[0].body["stream"] is True
+    assert server.streams_cancelled == 1
+    assert server.tokens_generated < len(stub_tokens(ORDERS + PROSE)) // 2
+    assert client.stats["stub"].stopped_early == 1
+    # The backend's usage never arrives, so the completion is estimated from the text streamed.
+    (entry,) = agent.token_ledger.entries
+    assert entry.prompt_tokens is None and entry.completion_tokens == approx_tokens(ORDERS)
+
+
+@pytest.mark.unit
+async def test_timed_out_stream_yields_the_complete_orders_received():
+    reply = '{"orders": [' + ", ".join(f'"A PAR - BUR {i}"' for i in range(50)) + "]}"
+    async with StubLLMServer(reply=reply, token_delay=0.01) as server:
+        client = LLMClient()
+        client.register_model("stub", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "m", timeout=0.3))
+        agent = LLMAgent("france", "FRANCE", "stub", llm_client=client, constrained_orders=False)
+        orders = await agent.decide_orders(game_to_phase(Game()))
+        await client.aclose()
+
+    values = [o.value for o in orders]
+    assert 0 < len(values) < 50
+    assert values == [f"A PAR - BUR {i}" for i in range(len(values))]
+    assert client.stats["stub"].timeouts == 1
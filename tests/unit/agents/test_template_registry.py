@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("jinja2")
+registry_module = pytest.importorskip("ai_diplomacy.agents.llm.prompt.registry", exc_type=ImportError)
+TemplateRegistry = registry_module.TemplateRegistry
+
+
+@pytest.mark.unit
+def test_templates_compile_on_first_use_and_reuse_bytecode(tmp_path):
+    registry = TemplateRegistry(bytecode_cache_dir=tmp_path)
+    assert registry.loaded == ()
+
+    first = registry.get("board_summary.j2")
+    assert registry.get("board_summary.j2") is first
+    assert registry.loaded == ("board_summary.j2",)
+    assert list(tmp_path.iterdir()), "compiled bytecode should be written to the cache directory"
+
+    # A fresh registry (another process, in practice) loads the cached bytecode.
+    other = TemplateRegistry(bytecode_cache_dir=tmp_path)
+    assert other.get("board_summary.j2").render is not None
+
+
+@pytest.mark.unit
+def test_bytecode_cache_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("AI_DIPLOMACY_TEMPLATE_CACHE", "off")
+    registry = TemplateRegistry()
+    registry.get("board_summary.j2")
+    assert registry.environment.bytecode_cache is None
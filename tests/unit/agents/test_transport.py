@@ -0,0 +1,111 @@
+import asyncio
+import contextlib
+
+import pytest
+
+from ai_diplomacy.agents.llm.transport import ConnectionPool, TransportError
+
+
+class RawHTTPServer:
+    """Answers every request on a connection with the next scripted raw response."""
+
+    def __init__(self, *responses: bytes):
+        self.responses = list(responses)
+        self.connections = 0
+        self.requests = []
+        self._writers = []
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        self.base_url = f"http://{host}:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        for writer in self._writers:
+            writer.close()
+        await asyncio.sleep(0.01)  # let the handlers see EOF and return
+        with contextlib.suppress(Exception):
+            await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.append(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.requests.append(head.split(b"\r\n", 1)[0].decode())
+                length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+                await reader.readexactly(length)
+                for part in self.responses.pop(0).split(b"|"):  # "|" marks a separate write
+                    writer.write(part)
+                    await writer.drain()
+                    await asyncio.sleep(0)
+        except (asyncio.IncompleteReadError, ConnectionError, IndexError):
+            pass
+        finally:
+            writer.close()
+
+
+def _chunked(*chunks: bytes, trailer: bytes = b"") -> bytes:
+    head = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+    body = b"|".join(b"%x;ext=1\r\n%s\r\n" % (len(c), c) for c in chunks)
+    return head + body + b"|0\r\n" + trailer + b"\r\n"
+
+
+def _sized(body: bytes, extra: bytes = b"") -> bytes:
+    return b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n%s\r\n%s" % (len(body), extra, body)
+
+
+@pytest.mark.unit
+async def test_chunked_bodies_are_decoded_across_writes_extensions_and_trailers():
+    lines = [b'{"response": "A PAR', b' - BUR"}\n{"done": true}', b"\n"]
+    async with RawHTTPServer(_chunked(*lines, trailer=b"X-Trailer: 1\r\n"), _sized(b"next")) as server:
+        pool = ConnectionPool(server.base_url)
+        async with pool.stream("POST", "/api/generate", b"{}") as response:
+            decoded = [line async for line in response.aiter_lines()]
+        follow_up = await pool.request("POST", "/api/generate", b"{}")
+        await pool.aclose()
+
+    assert decoded == ['{"response": "A PAR - BUR"}', '{"done": true}']
+    # The trailer was consumed, so the next response on the same connection parses cleanly.
+    assert follow_up.content == b"next" and server.connections == 1
+
+
+@pytest.mark.unit
+async def test_keep_alive_connections_are_reused_and_closed_ones_are_not():
+    async with RawHTTPServer(
+        _sized(b"one"), _sized(b"two"), _sized(b"three", b"Connection: close\r\n")
+    ) as server:
+        pool = ConnectionPool(server.base_url)
+        bodies = [(await pool.request("POST", "/", b"{}")).content for _ in range(3)]
+        assert server.connections == 1
+
+        server.responses.append(_sized(b"four"))
+        assert (await pool.request("POST", "/", b"{}")).content == b"four"
+        await pool.aclose()
+
+    assert bodies == [b"one", b"two", b"three"]
+    assert len(server.requests) == 4 and server.connections == 2
+
+
+@pytest.mark.unit
+async def test_an_abandoned_stream_closes_its_connection():
+    async with RawHTTPServer(_chunked(b"a", b"b", b"c"), _sized(b"fresh")) as server:
+        pool = ConnectionPool(server.base_url)
+        async with pool.stream("POST", "/", b"{}") as response:
+            async for _chunk in response.aiter_bytes():
+                break
+        follow_up = await pool.request("POST", "/", b"{}")
+        await pool.aclose()
+
+    assert follow_up.content == b"fresh" and server.connections == 2
+
+
+@pytest.mark.unit
+async def test_a_refused_connection_raises_a_transport_error():
+    pool = ConnectionPool("http://127.0.0.1:9")
+    with pytest.raises(TransportError):
+        await pool.request("POST", "/", b"{}")
+    pool.close()
@@ -0,0 +1,63 @@
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.domain.board import BoardState, MapIndex
+
+
+@pytest.mark.unit
+def test_board_from_game_matches_engine_strings():
+    game = Game()
+    board = BoardState.from_game(game)
+
+    assert board.index is MapIndex.from_map(game.map)
+    assert sorted(board.get_units("RUSSIA")) == sorted(game.get_units("RUSSIA"))
+    assert sorted(board.supply_centers["FRANCE"]) == ["BRE", "MAR", "PAR"]
+    assert board.unit_at("STP") == ("RUSSIA", "F", "STP/SC")
+    assert board.center_owner("stp/sc") == "RUSSIA"
+    assert board.center_owner("BEL") is None
+    assert board.center_counts()["RUSSIA"] == 4
+    assert sorted(board.unit_locations("ENGLAND")) == [("A", "LVP"), ("F", "EDI"), ("F", "LON")]
+
+
+@pytest.mark.unit
+def test_diffs_report_moves_and_center_changes():
+    game = Game()
+    before = BoardState.from_game(game)
+    game.set_orders("FRANCE", ["A PAR - BUR"])
+    game.process()
+    game.set_orders("FRANCE", ["A BUR - BEL"])
+    game.process()
+    after = BoardState.from_game(game)
+
+    lost, gained = before.diff_units(after)
+    assert ("FRANCE", "A PAR") in lost
+    assert ("FRANCE", "A BEL") in gained
+    assert before.center_changes(after) == [("BEL", None, "FRANCE")]
+
+
+@pytest.mark.unit
+def test_equality_follows_the_position():
+    index = MapIndex.from_map(Game().map)
+    board = BoardState({"FRANCE": ["A PAR", "*F BRE"]}, {"FRANCE": ["PAR"]}, index=index)
+    same = BoardState({"FRANCE": ["*F BRE", "A PAR"]}, {"FRANCE": ["PAR"]}, index=index)
+
+    assert board == same and board.fingerprint() == same.fingerprint()
+    assert board.units["FRANCE"] == ["A PAR", "*F BRE"]
+    assert board != BoardState({"FRANCE": ["A PAR"]}, {"FRANCE": ["PAR"]}, index=index)
+    # Boards built without a map index still compare by their string views.
+    assert BoardState({"FRANCE": ["A PAR"]}, {"FRANCE": ["PAR"]}).get_units("FRANCE") == ["A PAR"]
+    with pytest.raises(ValueError):
+        BoardState({"FRANCE": ["A XYZ"]}, index=index)
+
+
+@pytest.mark.unit
+def test_boards_on_different_indexes_compare_by_position_and_are_unhashable():
+    units, centers = {"FRANCE": ["A PAR", "F BRE"]}, {"FRANCE": ["PAR", "BRE"]}
+    full = BoardState(units, centers, index=MapIndex.from_map(Game().map))
+    ad_hoc = BoardState({"FRANCE": ["F BRE", "A PAR"]}, {"FRANCE": ["BRE", "PAR"]})
+
+    assert full.index is not ad_hoc.index
+    assert full == ad_hoc and ad_hoc == full
+    assert full != BoardState({"FRANCE": ["A PAR"]}, centers)
+    with pytest.raises(TypeError):
+        hash(full)
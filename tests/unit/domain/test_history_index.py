@@ -0,0 +1,73 @@
+import pytest
+
+from ai_diplomacy.domain.history import GameHistory, Message
+
+
+def _history() -> GameHistory:
+    history = GameHistory()
+    history.add_phase("S1901M")
+    history.add_message("S1901M", "FRANCE", "GERMANY", "Bounce in BUR?")
+    history.add_message("S1901M", "GERMANY", "GLOBAL", "Peace in the west.")
+    history.add_message("S1901M", "GERMANY", "FRANCE", "Agreed.")
+    history.add_message("S1901M", "ENGLAND", "FRANCE", "Channel stays empty.")
+    history.add_orders("S1901M", "FRANCE", ["A PAR - BUR"])
+    history.add_phase("F1901M")
+    history.add_orders("F1901M", "FRANCE", ["A BUR - BEL"])
+    return history
+
+
+@pytest.mark.unit
+def test_phase_lookup_by_name():
+    history = _history()
+    history.add_phase("S1901M")  # a repeated name: lookups keep their old first/last semantics
+
+    assert history.get_phase_by_name("S1901M") is history.phases[0]
+    assert history._get_phase("S1901M") is history.phases[-1]
+    assert history.get_phase_by_name("W1901A") is None
+    assert history.get_orders_by_power("FRANCE") == [("S1901M", ["A PAR - BUR"]), ("F1901M", ["A BUR - BEL"])]
+
+
+@pytest.mark.unit
+def test_orders_index_follows_add_orders_and_direct_phase_appends():
+    history = _history()
+    history.add_phase("W1901A")
+    history.add_orders("W1901A", "GERMANY", ["A MUN B"])
+    history.add_orders("S1901M", "GERMANY", ["A MUN - RUH"])  # an earlier phase, recorded late
+    history.add_orders("F1901M", "FRANCE", ["F BRE - MAO"])
+
+    assert history.get_orders_by_power("GERMANY") == [("S1901M", ["A MUN - RUH"]), ("W1901A", ["A MUN B"])]
+    assert history.get_orders_by_power("FRANCE")[1] == ("F1901M", ["A BUR - BEL", "F BRE - MAO"])
+    assert history.get_orders_by_power("ITALY") == []
+
+    restored = GameHistory.from_dict(history.to_dict())
+    assert restored.get_orders_by_power("GERMANY") == history.get_orders_by_power("GERMANY")
+
+
+@pytest.mark.unit
+def test_message_indexes():
+    history = _history()
+    phase = history.get_phase_by_name("S1901M")
+
+    assert [m.content for m in history.get_messages_from("S1901M", "GERMANY")] == ["Peace in the west.", "Agreed."]
+    assert [m.sender for m in history.get_messages_to("S1901M", "FRANCE")] == ["GERMANY", "ENGLAND"]
+    assert [m.sender for m in history.get_broadcasts("S1901M")] == ["GERMANY"]
+    assert {other: len(msgs) for other, msgs in phase.conversations("FRANCE").items()} == {
+        "GERMANY": 2,
+        "ENGLAND": 1,
+    }
+    assert [m.content for _, m in phase.messages_for("FRANCE")] == [
+        "Peace in the west.",
+        "Agreed.",
+        "Channel stays empty.",
+    ]
+
+
+@pytest.mark.unit
+def test_direct_appends_are_indexed_on_next_query():
+    history = _history()
+    phase = history.phases[0]
+    phase.messages.append(Message(sender="ITALY", recipient="FRANCE", content="Hello"))
+    history.phases.append(type(phase)(name="W1901A"))
+
+    assert [m.sender for m in phase.messages_to("FRANCE")] == ["GERMANY", "ENGLAND", "ITALY"]
+    assert history.get_phase_by_name("W1901A") is history.phases[-1]
@@ -0,0 +1,96 @@
+import pytest
+
+from ai_diplomacy.domain.history import GameHistory
+from ai_diplomacy.domain.history_journal import HistoryJournal, compact_journal, iter_journal, load_history
+
+
+def _play(history: GameHistory) -> None:
+    history.add_phase("S1901M")
+    history.add_message("S1901M", "FRANCE", "GERMANY", "Bounce in BUR? ✓")
+    history.add_message("S1901M", "GERMANY", "GLOBAL", "Peace.")
+    history.add_plan("S1901M", "FRANCE", "Take BEL")
+    history.add_orders("S1901M", "FRANCE", ["A PAR - BUR"])
+    history.add_results("S1901M", "FRANCE", [["bounce"]])
+    history.add_phase_summary("S1901M", "FRANCE", "Bounced.")
+    history.add_experience_update("S1901M", "FRANCE", "Germany is hostile.")
+    history.add_phase("F1901M")
+
+
+@pytest.mark.unit
+def test_journal_replays_to_the_same_history(tmp_path):
+    path = tmp_path / "game.jsonl"
+    history = GameHistory()
+    with HistoryJournal(path) as journal:
+        journal.attach(history)
+        _play(history)
+
+    assert journal.records_written == 9
+    assert [r["event"] for r in iter_journal(path)][:3] == ["phase", "message", "message"]
+    assert load_history(path).to_dict() == history.to_dict()
+
+    history.add_phase("W1901A")  # detached on close: not journaled
+    assert len(load_history(path).phases) == 2
+
+
+@pytest.mark.unit
+def test_compaction_and_resume(tmp_path):
+    path = tmp_path / "game.jsonl"
+    history = GameHistory()
+    with HistoryJournal(path) as journal:
+        journal.attach(history)
+        _play(history)
+
+    compacted = compact_journal(path)
+    assert [r["event"] for r in iter_journal(path)] == ["snapshot"]
+    assert compacted.to_dict() == history.to_dict()
+
+    # Resuming appends after the snapshot; a torn final line is ignored on load.
+    resumed = load_history(path)
+    with HistoryJournal(path) as journal:
+        journal.attach(resumed)
+        resumed.add_orders("F1901M", "FRANCE", ["A BUR - BEL"])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event": "orders", "pha')
+
+    assert load_history(path).to_dict() == resumed.to_dict()
+
+
+@pytest.mark.unit
+def test_attach_snapshots_existing_history(tmp_path):
+    history = GameHistory()
+    _play(history)
+    path = tmp_path / "late.jsonl"
+    with HistoryJournal(path) as journal:
+        journal.attach(history)
+        history.add_message("F1901M", "ENGLAND", "FRANCE", "Hi")
+
+    assert [r["event"] for r in iter_journal(path)] == ["snapshot", "message"]
+    assert load_history(path).to_dict() == history.to_dict()
+
+
+@pytest.mark.unit
+def test_only_a_torn_final_record_is_skipped(tmp_path, caplog):
+    path = tmp_path / "game.jsonl"
+    path.write_text('{"event": "phase", "phase": "S1901M"}\n\n{"event": "orders", "pha', encoding="utf-8")
+
+    assert [r["event"] for r in iter_journal(path)] == ["phase"]
+    assert "torn final journal record" in caplog.text and ":3" in caplog.text
+
+    # Resuming drops the torn line instead of appending a record onto it.
+    history = load_history(path)
+    with HistoryJournal(path) as journal:
+        journal.attach(history)
+        history.add_orders("S1901M", "FRANCE", ["A PAR - BUR"])
+    assert load_history(path).to_dict() == history.to_dict()
+
+
+@pytest.mark.unit
+def test_an_unreadable_record_before_the_end_raises(tmp_path):
+    path = tmp_path / "game.jsonl"
+    path.write_text(
+        '{"event": "phase", "phase": "S1901M"}\n{"event": "mess\n{"event": "phase", "phase": "F1901M"}\n',
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match=r"game.jsonl:2"):
+        load_history(path)
@@ -0,0 +1,42 @@
+import pytest
+
+from ai_diplomacy.domain.history import GameHistory, Message
+from ai_diplomacy.domain.inbox import Inboxes
+
+
+@pytest.mark.unit
+def test_recent_messages_merge_private_and_global_traffic():
+    history = GameHistory(inbox_size=4)
+    history.add_phase("S1901M")
+    history.add_message("S1901M", "ENGLAND", "FRANCE", "old")
+    history.add_phase("F1901M")
+    history.add_message("F1901M", "GERMANY", "FRANCE", "one")
+    history.add_message("F1901M", "FRANCE", "GLOBAL", "own broadcast")
+    history.add_message("F1901M", "ITALY", "GLOBAL", "two")
+    history.add_message("F1901M", "ITALY", "ALL", "not an inbox message")
+    history.add_message("F1901M", "RUSSIA", "FRANCE", "three")
+    history.add_phase("W1901A")
+
+    assert [m["content"] for m in history.get_recent_messages_to("FRANCE", limit=3)] == ["one", "two", "three"]
+    # S1901M has left the two-phase window.
+    assert [m["content"] for m in history.get_recent_messages_to("FRANCE", limit=4)] == ["one", "two", "three"]
+    assert history.get_recent_messages_to("FRANCE", limit=1) == [
+        {"sender": "RUSSIA", "content": "three", "phase": "F1901M"}
+    ]
+
+
+@pytest.mark.unit
+def test_inbox_declines_when_it_cannot_answer_exactly():
+    inboxes = Inboxes(size=2)
+    for seq in range(3):
+        inboxes.record(0, "S1901M", "GERMANY", "FRANCE", f"m{seq}")
+
+    assert [e.content for e in inboxes.recent("FRANCE", 2, 0)] == ["m1", "m2"]
+    assert inboxes.recent("FRANCE", 3, 0) is None  # larger than the inbox
+    assert inboxes.recent("FRANCE", 2, 1) == []
+
+    # Messages that bypassed add_message are still found via the fallback scan.
+    history = GameHistory()
+    history.add_phase("S1901M")
+    history.phases[0].messages.append(Message(sender="GERMANY", recipient="FRANCE", content="direct"))
+    assert [m["content"] for m in history.get_recent_messages_to("FRANCE")] == ["direct"]
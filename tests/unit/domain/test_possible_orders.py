@@ -0,0 +1,53 @@
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.domain.possible_orders import PossibleOrdersIndex, possible_orders_for
+from ai_diplomacy.domain.snapshot_cache import SNAPSHOT_CACHE
+from ai_diplomacy.domain.state import PhaseState
+
+
+class CountingGame:
+    """Wraps a diplomacy.Game and counts get_all_possible_orders() calls."""
+
+    def __init__(self):
+        self._game = Game()
+        self.engine_calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self._game, name)
+
+    def get_all_possible_orders(self):
+        self.engine_calls += 1
+        return self._game.get_all_possible_orders()
+
+
+@pytest.mark.unit
+def test_index_groups_engine_orders_by_power_location_and_unit():
+    index = PossibleOrdersIndex.from_game(Game())
+
+    assert "A PAR - BUR" in index.orders_for_power("FRANCE")
+    assert "A PAR - BUR" not in index.orders_for_power("GERMANY")
+    assert "A PAR H" in index.orders_for_location("PAR")
+    assert set(index.orders_for_unit("F STP/SC")) == set(index.orders_for_location("STP/SC"))
+    assert index.is_valid("RUSSIA", "F STP/SC - BOT")
+    assert not index.is_valid("RUSSIA", "F STP/SC - NTH")
+    assert index.orders_for_power("NOBODY") == frozenset()
+
+
+@pytest.mark.unit
+def test_index_is_built_once_per_phase():
+    game = CountingGame()
+    try:
+        first = possible_orders_for(game)
+        state = PhaseState.from_game(game)
+        for power in state.powers:
+            for unit in state.get_power_units(power):
+                possible_orders_for(game).is_valid(power, f"{unit} H")
+
+        assert possible_orders_for(game) is first
+        assert game.engine_calls == 1
+        assert state.get_all_possible_orders()["FRANCE"] == [
+            order for loc in ("BRE", "MAR", "PAR") for order in first.orders_for_location(loc)
+        ]
+    finally:
+        SNAPSHOT_CACHE.invalidate(game)
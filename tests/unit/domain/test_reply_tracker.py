@@ -0,0 +1,38 @@
+import pytest
+
+from ai_diplomacy.domain.history import GameHistory
+
+
+def _summaries(pending_by_power):
+    return {power: [(m.phase, m.content) for m in msgs] for power, msgs in pending_by_power.items()}
+
+
+@pytest.mark.unit
+def test_replies_and_global_mentions_clear_pending_messages():
+    history = GameHistory()
+    history.add_phase("S1901M")
+    history.add_message("S1901M", "FRANCE", "GERMANY", "DMZ Burgundy?")
+    history.add_message("S1901M", "FRANCE", "ENGLAND", "Channel?")
+    history.add_message("S1901M", "FRANCE", "ITALY", "Piedmont?")
+    history.add_message("S1901M", "ENGLAND", "GLOBAL", "FRANCE can have the Channel.")
+    history.add_phase("F1901M")
+    history.add_message("F1901M", "GERMANY", "FRANCE", "Agreed.")  # next-phase reply counts
+
+    assert _summaries(history.get_ignored_messages("FRANCE")) == {"ITALY": [("S1901M", "Piedmont?")]}
+    assert _summaries(history.get_messages_awaiting_reply("ITALY")) == {"FRANCE": [("S1901M", "Piedmont?")]}
+    assert history.get_messages_awaiting_reply("GERMANY") == {}
+
+    history.add_phase("W1901A")
+    history.add_message("W1901A", "ITALY", "FRANCE", "Too late.")  # two phases later: still ignored
+    assert "ITALY" in history.get_ignored_messages("FRANCE")
+    assert history.get_ignored_messages("FRANCE", num_phases=2) == {}
+
+
+@pytest.mark.unit
+def test_tracker_survives_round_trip_through_dict():
+    history = GameHistory()
+    history.add_phase("S1901M")
+    history.add_message("S1901M", "FRANCE", "GERMANY", "Hello?")
+
+    restored = GameHistory.from_dict(history.to_dict())
+    assert _summaries(restored.get_ignored_messages("FRANCE")) == {"GERMANY": [("S1901M", "Hello?")]}
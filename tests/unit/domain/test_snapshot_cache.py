@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.domain import SNAPSHOT_CACHE
+from ai_diplomacy.domain.possible_orders import possible_orders_for
+from ai_diplomacy.domain.snapshot_cache import PhaseSnapshotCache
+from ai_diplomacy.domain.state import PhaseState
+from ai_diplomacy.runtime.game_manager import GameManager
+
+
+def _counting_builder():
+    calls = []
+
+    def build(game):
+        calls.append(game.phase)
+        return {"phase": game.phase}
+
+    return build, calls
+
+
+@pytest.mark.unit
+def test_snapshot_is_shared_within_a_phase():
+    cache = PhaseSnapshotCache()
+    game = SimpleNamespace(phase="S1901M", zobrist_hash=1)
+    build, calls = _counting_builder()
+
+    first = cache.get(game, "phase", build)
+    second = cache.get(game, "phase", build)
+
+    assert first is second
+    assert calls == ["S1901M"]
+    stats = cache.stats("phase")
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.hit_rate == 0.5
+
+
+@pytest.mark.unit
+def test_phase_change_and_explicit_invalidation_rebuild():
+    cache = PhaseSnapshotCache()
+    game = SimpleNamespace(phase="S1901M", zobrist_hash=1)
+    build, calls = _counting_builder()
+
+    cache.get(game, "phase", build)
+    game.phase, game.zobrist_hash = "F1901M", 2  # what game.process() does
+    assert cache.get(game, "phase", build) == {"phase": "F1901M"}
+
+    cache.invalidate(game)  # what callers do after editing the position directly
+    cache.get(game, "phase", build)
+
+    assert calls == ["S1901M", "F1901M", "F1901M"]
+    assert cache.stats().invalidations == 2
+
+
+@pytest.mark.unit
+def test_games_and_kinds_are_cached_separately():
+    cache = PhaseSnapshotCache(max_games=1)
+    game_a = SimpleNamespace(phase="S1901M")
+    game_b = SimpleNamespace(phase="S1901M")
+    build, calls = _counting_builder()
+
+    cache.get(game_a, "phase", build)
+    cache.get(game_a, "phase_state", build)
+    cache.get(game_b, "phase", build)
+    cache.get(game_a, "phase", build)  # evicted by game_b
+
+    assert len(calls) == 4
+    assert cache.stats().misses == 4
+
+
+@pytest.mark.unit
+def test_from_game_snapshot_follows_the_engine():
+    cache = PhaseSnapshotCache()
+    game = Game()
+
+    before = cache.get(game, "phase_state", PhaseState.from_game)
+    assert cache.get(game, "phase_state", PhaseState.from_game) is before
+
+    game.process()
+    after = cache.get(game, "phase_state", PhaseState.from_game)
+    assert after is not before
+    assert (before.phase_name, after.phase_name) == ("S1901M", "F1901M")
+    assert cache.stats("phase_state").rebuild_seconds > 0
+
+
+@pytest.mark.unit
+def test_only_order_dependent_snapshots_follow_set_orders():
+    cache = PhaseSnapshotCache()
+    game = Game()
+    build_orders = lambda g: g.get_orders("FRANCE")  # noqa: E731
+
+    board = cache.get(game, "phase_state", PhaseState.from_game)
+    assert cache.get(game, "orders", build_orders, depends_on_orders=True) == []
+
+    game.set_orders("FRANCE", ["A PAR - BUR"])  # straight to the engine, no invalidate()
+    assert cache.get(game, "orders", build_orders, depends_on_orders=True) == ["A PAR - BUR"]
+    assert cache.get(game, "phase_state", PhaseState.from_game) is board
+    assert cache.stats("orders").invalidations == 1 and cache.stats("phase_state").invalidations == 0
+
+
+@pytest.mark.unit
+def test_submitting_orders_keeps_the_possible_orders_index():
+    game = Game()
+    manager = GameManager(game)
+    index = possible_orders_for(game)
+    misses = SNAPSHOT_CACHE.stats("possible_orders").misses
+
+    manager.submit_phase_orders({"FRANCE": ["A PAR - BUR"]})
+    manager.validate_orders("FRANCE", ["A MAR - SPA"])
+
+    assert possible_orders_for(game) is index
+    assert SNAPSHOT_CACHE.stats("possible_orders").misses == misses
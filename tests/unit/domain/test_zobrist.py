@@ -0,0 +1,83 @@
+import gc
+
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.domain import SNAPSHOT_CACHE, game_to_phase
+from ai_diplomacy.domain.board import BoardState
+from ai_diplomacy.domain import zobrist
+from ai_diplomacy.domain.zobrist import position_hash, update_position_hash
+
+
+@pytest.mark.unit
+def test_incremental_hash_matches_full_hash():
+    game = Game()
+    before = BoardState.from_game(game)
+    game.set_orders("FRANCE", ["A PAR - BUR", "F BRE - MAO"])
+    game.set_orders("GERMANY", ["A MUN - RUH"])
+    game.process()
+    after = BoardState.from_game(game)
+
+    full = position_hash(after, "F1901M")
+    incremental = update_position_hash(position_hash(before, "S1901M"), before, "S1901M", after, "F1901M")
+
+    assert incremental == full
+    assert full != position_hash(before, "S1901M")
+    # Same board, different phase -> different key.
+    assert position_hash(after, "F1902M") != full
+    assert 0 <= full < 2**64
+
+
+@pytest.mark.unit
+def test_incremental_hash_follows_dislodgements_and_retreats():
+    game = Game()
+    turns = [
+        {"FRANCE": ["A PAR - BUR"], "GERMANY": ["A MUN - RUH", "A BER - MUN"]},
+        {"FRANCE": ["F BRE - MAO"], "GERMANY": ["A MUN - BUR", "A RUH S A MUN - BUR"]},
+        {"FRANCE": ["A BUR R PIC"]},
+    ]
+    for orders in turns:
+        before, before_phase = BoardState.from_game(game), game.get_current_phase()
+        for power, power_orders in orders.items():
+            game.set_orders(power, power_orders)
+        game.process()
+        after, after_phase = BoardState.from_game(game), game.get_current_phase()
+
+        previous = position_hash(before, before_phase)
+        assert update_position_hash(previous, before, before_phase, after, after_phase) == position_hash(
+            after, after_phase
+        )
+    assert game.get_current_phase() == "S1902M"
+
+
+@pytest.mark.unit
+def test_phase_key_hash_is_stable_and_hashable():
+    game = Game()
+    try:
+        first = game_to_phase(game)
+        game.set_orders("FRANCE", ["A PAR - BUR"])
+        SNAPSHOT_CACHE.invalidate(game)
+        game.process()
+        second = game_to_phase(game)  # derived from `first` incrementally
+
+        assert second.key.position_hash == position_hash(second.board, "F1901M")
+        assert first.key == game_to_phase(Game()).key
+        assert len({first.key, second.key, game_to_phase(Game()).key}) == 2
+        assert (second.key.season, second.key.year) == ("FALL", 1901)
+    finally:
+        SNAPSHOT_CACHE.clear()
+
+
+@pytest.mark.unit
+def test_tables_for_ad_hoc_indexes_are_not_kept_alive():
+    board = BoardState({"FRANCE": ["A PAR"]}, {"FRANCE": ["PAR"]})
+    assert position_hash(board, "S1901M") == position_hash(BoardState(board.units, board.supply_centers), "S1901M")
+    assert board.index in zobrist._AD_HOC_TABLES
+
+    tables = len(zobrist._AD_HOC_TABLES)
+    del board
+    gc.collect()
+    assert len(zobrist._AD_HOC_TABLES) < tables
+
+    named = zobrist.zobrist_table_for(BoardState.from_game(Game()).index)
+    assert zobrist.zobrist_table_for(BoardState.from_game(Game()).index) is named
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_diplomacy.runtime.fanout import gather_until
+
+
+async def _answer(value, delay, log):
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        log.append(value)
+        raise
+    if isinstance(value, Exception):
+        raise value
+    return value
+
+
+@pytest.mark.unit
+async def test_one_timeout_covers_the_whole_batch_and_cancels_stragglers():
+    cancelled_jobs = []
+    started = time.perf_counter()
+    results, cancelled = await gather_until(
+        {
+            "TURKEY": _answer("t", 0.06, cancelled_jobs),
+            "AUSTRIA": _answer("a", 0.0, cancelled_jobs),
+            "FRANCE": _answer("f", 5.0, cancelled_jobs),
+            "GERMANY": _answer("g", 5.0, cancelled_jobs),
+            "ENGLAND": _answer(ValueError("boom"), 0.0, cancelled_jobs),
+        },
+        timeout=0.1,
+    )
+
+    assert time.perf_counter() - started < 0.19  # not one 0.1 s timeout per slow job
+    assert list(results) == ["TURKEY", "AUSTRIA", "ENGLAND"]  # input order, not completion order
+    assert results["TURKEY"] == "t" and isinstance(results["ENGLAND"], ValueError)
+    assert cancelled == ["FRANCE", "GERMANY"] and sorted(cancelled_jobs) == ["f", "g"]
+
+
+@pytest.mark.unit
+async def test_a_job_that_cancels_itself_is_left_out():
+    async def gives_up():
+        raise asyncio.CancelledError()
+
+    results, cancelled = await gather_until(
+        {"ITALY": gives_up(), "RUSSIA": _answer("r", 0.0, [])}, timeout=1.0
+    )
+
+    assert results == {"RUSSIA": "r"} and cancelled == []
+
+
+@pytest.mark.unit
+async def test_empty_batch():
+    assert await gather_until({}, timeout=0.1) == ({}, [])
@@ -0,0 +1,61 @@
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.runtime.game_manager import GameManager
+
+
+def _counting_set_orders(monkeypatch):
+    calls = []
+    original = Game.set_orders
+
+    def set_orders(self, power, orders, *args, **kwargs):
+        calls.append((power, list(orders)))
+        return original(self, power, orders, *args, **kwargs)
+
+    monkeypatch.setattr(Game, "set_orders", set_orders)
+    return calls
+
+
+@pytest.mark.unit
+def test_phase_submission_reports_a_verdict_per_order(monkeypatch):
+    game = Game()
+    calls = _counting_set_orders(monkeypatch)
+    report = GameManager(game).submit_phase_orders(
+        {
+            "FRANCE": ["A PAR - BUR", "a mar-spa", "A MAR - MUN"],
+            "ENGLAND": ["F LON - NTH"],
+            "NARNIA": ["A XYZ H"],
+        }
+    )
+
+    verdicts = {(v.power, v.order): (v.accepted, v.reason) for v in report.verdicts}
+    assert verdicts == {
+        ("FRANCE", "A PAR - BUR"): (True, None),
+        ("FRANCE", "A MAR - SPA"): (True, None),
+        ("FRANCE", "A MAR - MUN"): (False, "illegal"),
+        ("ENGLAND", "F LON - NTH"): (True, None),
+        ("NARNIA", "A XYZ H"): (False, "inactive_power"),
+    }
+    assert calls == [("FRANCE", ["A PAR - BUR", "A MAR - SPA"]), ("ENGLAND", ["F LON - NTH"])]
+    assert set(report.errors) == {"NARNIA"} and not report.all_accepted
+    assert report.accepted == {"FRANCE": ["A PAR - BUR", "A MAR - SPA"], "ENGLAND": ["F LON - NTH"]}
+    assert sorted(game.get_orders("FRANCE")) == ["A MAR - SPA", "A PAR - BUR"]
+
+
+@pytest.mark.unit
+def test_submit_orders_fails_for_powers_not_in_the_game():
+    manager = GameManager(Game())
+    assert manager.submit_orders("FRANCE", ["A PAR - BUR"]) is True
+    assert manager.submit_orders("NARNIA", ["A PAR - BUR"]) is False
+
+
+@pytest.mark.unit
+def test_validation_accepts_orders_in_the_engines_loose_spelling():
+    valid, invalid = GameManager(Game()).validate_orders(
+        "FRANCE", ["A PAR-BUR", " f bre  -  mao", "A PAR - MUN"]
+    )
+    assert valid == ["A PAR - BUR", "F BRE - MAO"]
+    assert invalid == ["A PAR - MUN"]
+
+    manager = GameManager(Game())
+    assert manager._is_order_valid("FRANCE", "a par-bur") and not manager._is_order_valid("FRANCE", "A PAR-MUN")
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ai_diplomacy.domain.history import GameHistory
+from ai_diplomacy.runtime.movement import MovementPhaseStrategy
+
+POWERS = ["AUSTRIA", "ENGLAND", "FRANCE", "GERMANY", "ITALY", "RUSSIA", "TURKEY"]
+
+
+class StubOrchestrator:
+    """Just enough of PhaseOrchestrator for MovementPhaseStrategy.collect_orders."""
+
+    def __init__(self, latencies, max_concurrency=None, failing=()):
+        self.active_powers = list(latencies)
+        self.latencies = latencies
+        self.failing = set(failing)
+        self.config = SimpleNamespace(power_to_agent_id_map={}, max_concurrent_order_requests=max_concurrency)
+        agents = {p: SimpleNamespace(agent_id=p.lower(), country=p) for p in latencies}
+        self.agent_manager = SimpleNamespace(get_agent=agents.get)
+        self.in_flight = self.max_in_flight = 0
+
+    async def _get_orders_for_power(self, game, power_name, agent, game_history):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latencies[power_name])
+            if power_name in self.failing:
+                raise RuntimeError(f"Timeout getting orders for {power_name}")
+            return [f"A {power_name[:3]} H"]
+        finally:
+            self.in_flight -= 1
+
+
+async def _collect(orchestrator):
+    history = GameHistory()
+    history.add_phase("S1901M")
+    events = []
+    history.add_observer(lambda event, payload: events.append(payload.get("power")))
+    game = SimpleNamespace(powers={p: None for p in orchestrator.active_powers})
+    phase = SimpleNamespace(name="S1901M", board=SimpleNamespace(get_units=lambda power: []))
+    started = time.perf_counter()
+    orders = await MovementPhaseStrategy().collect_orders(game, phase, orchestrator, history)
+    return orders, events, time.perf_counter() - started
+
+
+@pytest.mark.unit
+async def test_agents_are_asked_concurrently_and_merged_in_power_order():
+    # Later powers answer first; the merge must not follow completion order.
+    latencies = {p: 0.1 - 0.01 * i for i, p in enumerate(POWERS)}
+    orders, events, elapsed = await _collect(StubOrchestrator(latencies))
+
+    assert elapsed < 0.3
+    assert list(orders) == POWERS and events == POWERS
+    assert orders["FRANCE"] == ["A FRA H"]
+
+
+@pytest.mark.unit
+async def test_max_concurrent_order_requests_bounds_the_fan_out():
+    orchestrator = StubOrchestrator({p: 0.02 for p in POWERS}, max_concurrency=2)
+    orders, _, _ = await _collect(orchestrator)
+
+    assert orchestrator.max_in_flight == 2
+    assert all(orders[p] == [f"A {p[:3]} H"] for p in POWERS)
+
+
+@pytest.mark.unit
+async def test_a_failing_agent_only_empties_its_own_orders():
+    orchestrator = StubOrchestrator({p: 0.01 for p in POWERS}, failing={"GERMANY"})
+    orders, events, _ = await _collect(orchestrator)
+
+    assert orders["GERMANY"] == []
+    assert all(orders[p] == [f"A {p[:3]} H"] for p in POWERS if p != "GERMANY")
+    assert events == POWERS
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Needs the full runtime (ai_diplomacy.constants and friends); skipped where they are absent.
+negotiation = pytest.importorskip("ai_diplomacy.runtime.negotiation", exc_type=ImportError)
+
+from ai_diplomacy.agents.llm_agent import LLMAgent  # noqa: E402
+from ai_diplomacy.domain import DiploMessage  # noqa: E402
+from ai_diplomacy.domain.history import GameHistory  # noqa: E402
+
+POWERS = ["AUSTRIA", "ENGLAND", "FRANCE", "GERMANY"]
+
+
+class ScriptedNegotiator(LLMAgent):
+    def __init__(self, country, delay=0.0):
+        super().__init__(country.lower(), country)
+        self.delay = delay
+        self.rounds = 0
+
+    async def negotiate(self, phase):
+        self.rounds += 1
+        await asyncio.sleep(self.delay)
+        target = POWERS[(POWERS.index(self.country) + 1) % len(POWERS)]
+        return [
+            DiploMessage(recipient=target, content=f"{self.country} round {self.rounds}"),
+            DiploMessage(recipient="GLOBAL", content=f"{self.country} says hello", message_type="global"),
+        ]
+
+
+async def _negotiate(style, delays, round_timeout=1.0):
+    agents = {p: ScriptedNegotiator(p, delays.get(p, 0.0)) for p in POWERS}
+    config = SimpleNamespace(
+        num_negotiation_rounds=2, negotiation_style=style, negotiation_round_timeout_seconds=round_timeout
+    )
+    history = GameHistory()
+    phase = SimpleNamespace(name="S1901M")
+    started = time.perf_counter()
+    await negotiation.perform_negotiation_rounds(
+        None, phase, history, SimpleNamespace(get_agent=agents.get), POWERS, config
+    )
+    messages = [(m.sender, m.recipient, m.content) for m in history.get_phase_by_name("S1901M").messages]
+    return messages, time.perf_counter() - started
+
+
+@pytest.mark.unit
+async def test_simultaneous_rounds_record_the_same_history_as_serial_rounds():
+    # Later powers answer first, so completion order differs from active-power order.
+    delays = {p: 0.04 - 0.01 * i for i, p in enumerate(POWERS)}
+    serial, _ = await _negotiate("serial", delays)
+    simultaneous, _ = await _negotiate(negotiation.NEGOTIATION_STYLE_SIMULTANEOUS, delays)
+
+    assert simultaneous == serial
+    assert [sender for sender, _, _ in serial[:8]] == [p for p in POWERS for _ in range(2)]
+
+
+@pytest.mark.unit
+async def test_a_slow_power_is_cancelled_at_the_round_timeout_and_sends_nothing():
+    messages, elapsed = await _negotiate(
+        negotiation.NEGOTIATION_STYLE_SIMULTANEOUS, {"FRANCE": 5.0, "GERMANY": 5.0}, round_timeout=0.1
+    )
+
+    assert elapsed < 0.5  # one timeout per round, not one per slow power
+    assert {sender for sender, _, _ in messages} == {"AUSTRIA", "ENGLAND"}
+    assert len(messages) == 2 * 2 * 2  # two powers, two messages, two rounds
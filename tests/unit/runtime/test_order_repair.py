@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+import pytest
+from diplomacy import Game
+
+from ai_diplomacy.agents.base import BaseAgent
+from ai_diplomacy.agents.llm.client import BACKEND_OLLAMA, LLMClient, ModelEndpoint
+from ai_diplomacy.agents.llm.stub_server import StubLLMServer
+from ai_diplomacy.agents.llm_agent import LLMAgent
+from ai_diplomacy.domain import game_to_phase
+from ai_diplomacy.domain.order import Order
+from ai_diplomacy.runtime.game_manager import GameManager
+from ai_diplomacy.runtime.order_repair import repair_orders
+
+ORDERS = ["A PAR - MUN", "A MAR - SPA", "F BRE - MAO"]
+
+
+class ScriptedRepairAgent(BaseAgent):
+    def __init__(self, replies, delay=0.0):
+        super().__init__("scripted", "FRANCE")
+        self.replies = list(replies)
+        self.delay = delay
+        self.asked = []
+
+    async def decide_orders(self, phase):
+        return [Order(value=o) for o in ORDERS]
+
+    async def negotiate(self, phase):
+        return []
+
+    async def update_state(self, phase, events):
+        return None
+
+    async def repair_orders(self, phase, rejected):
+        self.asked.append(dict(rejected))
+        await asyncio.sleep(self.delay)
+        return [Order(value=o) for o in self.replies.pop(0)]
+
+
+def _reply(body):
+    prompt = body["messages"][-1]["content"]
+    if "still have no order" in prompt:
+        return '{"orders": ["A PAR - BUR"]}'
+    return json.dumps({"orders": ORDERS})
+
+
+@pytest.mark.unit
+async def test_only_the_rejected_units_are_asked_for_again():
+    game = Game()
+    phase = game_to_phase(game)
+    async with StubLLMServer(reply=_reply) as server:
+        client = LLMClient()
+        client.register_model("stub", ModelEndpoint(BACKEND_OLLAMA, server.base_url, "m"))
+        agent = LLMAgent(
+            "france", "FRANCE", "stub", llm_client=client, streaming=False, constrained_orders=False
+        )
+        orders = [o.value for o in await agent.decide_orders(phase)]
+        report = await repair_orders(GameManager(game), "FRANCE", agent, phase, orders)
+        await client.aclose()
+
+    assert report.orders == ["A MAR - SPA", "F BRE - MAO", "A PAR - BUR"]
+    assert report.rejected == ["A PAR - MUN"] and report.repaired == ["A PAR - BUR"] and report.held == []
+    repair_prompt = server.requests[1].body["messages"][-1]["content"]
+    assert '- PAR (you ordered "A PAR - MUN"): ' in repair_prompt and "; A PAR H;" in repair_prompt
+    assert "- MAR" not in repair_prompt.split("still have no order")[1]
+
+    (attempt,) = report.rounds
+    full = agent.token_ledger.entries[0]
+    assert attempt.locations == ["PAR"] and attempt.completion_tokens > 0
+    assert 0 < attempt.prompt_tokens < full.prompt_tokens  # the order prompt's prefix is reused
+    assert [e.purpose for e in agent.token_ledger.entries] == ["orders", "repair"]
+
+
+@pytest.mark.unit
+async def test_units_still_unresolved_after_the_last_round_hold():
+    game = Game()
+    agent = ScriptedRepairAgent([["A PAR - MUN"], ["A PAR - KIE"]])
+    report = await repair_orders(GameManager(game), "FRANCE", agent, game_to_phase(game), ORDERS)
+
+    assert len(report.rounds) == 2 and report.repaired == []
+    assert agent.asked == [{"PAR": "A PAR - MUN"}] * 2
+    assert report.held == ["A PAR H"]
+    assert sorted(report.orders) == ["A MAR - SPA", "A PAR H", "F BRE - MAO"]
+
+
+@pytest.mark.unit
+async def test_repair_stops_at_the_phase_deadline():
+    game = Game()
+    agent = ScriptedRepairAgent([["A PAR - BUR"]], delay=1.0)
+    deadline = asyncio.get_running_loop().time() + 0.05
+    report = await repair_orders(
+        GameManager(game), "FRANCE", agent, game_to_phase(game), ORDERS, deadline=deadline
+    )
+
+    assert report.rounds[0].timed_out and report.rounds[0].seconds < 0.5
+    assert report.held == ["A PAR H"]
+
+    expired = await repair_orders(
+        GameManager(game), "FRANCE", agent, game_to_phase(game), ["A PAR - MUN"], deadline=deadline
+    )
+    assert expired.rounds == [] and expired.orders == ["A PAR H"]
+
+
+@pytest.mark.unit
+async def test_orders_that_name_no_unit_reopen_every_unordered_unit():
+    game = Game()
+    agent = ScriptedRepairAgent([["A PAR - BUR", "A MAR H"]])
+    report = await repair_orders(
+        GameManager(game), "FRANCE", agent, game_to_phase(game), ["F BRE - MAO", "attack Germany"]
+    )
+
+    assert agent.asked == [{"MAR": None, "PAR": None}]
+    assert report.orders == ["F BRE - MAO", "A PAR - BUR", "A MAR H"] and report.held == []
+
+
+@pytest.mark.unit
+async def test_rejected_orders_are_attributed_in_any_spelling():
+    game = Game()
+    agent = ScriptedRepairAgent([["A PAR - BUR"]])
+    report = await repair_orders(
+        GameManager(game), "FRANCE", agent, game_to_phase(game), ["a mar-spa", "f bre-mao", "a par-mun"]
+    )
+
+    assert agent.asked == [{"PAR": "a par-mun"}]
+    assert report.orders == ["A MAR - SPA", "F BRE - MAO", "A PAR - BUR"]
+
+
+@pytest.mark.unit
+async def test_adjustment_orders_are_kept_as_given_and_not_repaired():
+    game = Game()
+    game.set_orders("FRANCE", ["A PAR - BUR", "A MAR - SPA", "F BRE - MAO"])
+    game.process()
+    game.set_orders("FRANCE", ["A BUR - BEL", "F MAO - POR"])
+    game.process()
+    assert game.phase_type == "A"
+
+    agent = ScriptedRepairAgent([])
+    report = await repair_orders(
+        GameManager(game), "FRANCE", agent, game_to_phase(game), ["WAIVE", "WAIVE", "A PAR - MUN"]
+    )
+
+    assert report.orders == ["WAIVE", "WAIVE"] and report.rejected == ["A PAR - MUN"]
+    assert report.rounds == [] and agent.asked == []